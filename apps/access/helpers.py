@@ -1,6 +1,8 @@
 from django.contrib.auth.hashers import make_password
+from django.db.models import prefetch_related_objects
 
 from apps.access.tasks import UserOnboardEmailTask
+from apps.common.fan_out import fan_out
 from apps.common.idp_service import idp_admin_auth_token, idp_post_request
 from apps.learning.communicator import chat_post_request
 from apps.tenant_service.middlewares import get_current_db_name, get_current_tenant_details
@@ -15,7 +17,61 @@ def idp_user_onboard(user, tenant_data=None, auth_token=None):
     if not auth_token:
         auth_token = idp_admin_auth_token()
     user_data = user.get_user_init_data_idp()
-    payload = {
+    payload = get_idp_user_onboard_payload(user_data, tenant_data)
+    success, data = idp_post_request(
+        url_path=IDP_CONFIG["get_or_onboard_user_url"], data=payload, auth_token=auth_token
+    )
+    message = None
+    if not success:
+        message = "User IDP Registration Failed!"
+    user.idp_id = data["userId"]
+    user.password = make_password(user_data["password"])
+    user.save()
+    chat_user_onboard(user, tenant_data, auth_token)
+    UserOnboardEmailTask().run_task(user_id=user.id, password=user_data["password"], db_name=get_current_db_name())
+    return True, message
+
+
+def idp_bulk_user_onboard(users, tenant_data, auth_token):
+    """
+    Onboard the given batch of newly created users on IDP. The IDP calls are fanned out, the admin token & tenant
+    data are shared for the batch and the IDP ids & passwords are saved with a single update. Returns the ids of
+    the users failed on IDP.
+    """
+
+    from apps.access.models import User
+
+    prefetch_related_objects(users, "user_detail")
+    users_data = {user.id: user.get_user_init_data_idp() for user in users}
+    onboarded_users, failed_user_ids = [], set()
+    for user, result, error in fan_out(
+        lambda user: idp_post_request(
+            url_path=IDP_CONFIG["get_or_onboard_user_url"],
+            data=get_idp_user_onboard_payload(users_data[user.id], tenant_data),
+            auth_token=auth_token,
+        ),
+        users,
+    ):
+        success, data = result or (False, None)
+        if error or not success or not data or not data.get("userId"):
+            failed_user_ids.add(user.id)
+            continue
+        user.idp_id = data["userId"]
+        user.password = make_password(users_data[user.id]["password"])
+        onboarded_users.append(user)
+
+    User.objects.bulk_update(onboarded_users, ["idp_id", "password"])
+    db_name = get_current_db_name()
+    for user in onboarded_users:
+        chat_user_onboard(user, tenant_data, auth_token)
+        UserOnboardEmailTask().run_task(user_id=user.id, password=users_data[user.id]["password"], db_name=db_name)
+    return failed_user_ids
+
+
+def get_idp_user_onboard_payload(user_data, tenant_data):
+    """Returns the IDP onboard payload for the given user init data."""
+
+    return {
         "userId": 0,
         "tenantId": tenant_data["idp_id"],
         "tenantDisplayName": tenant_data["name"],
@@ -35,15 +91,11 @@ def idp_user_onboard(user, tenant_data=None, auth_token=None):
         "managerId": 0,
         "organizationUnitId": 0,
     }
-    success, data = idp_post_request(
-        url_path=IDP_CONFIG["get_or_onboard_user_url"], data=payload, auth_token=auth_token
-    )
-    message = None
-    if not success:
-        message = "User IDP Registration Failed!"
-    user.idp_id = data["userId"]
-    user.password = make_password(user_data["password"])
-    user.save()
+
+
+def chat_user_onboard(user, tenant_data, auth_token):
+    """Onboard the IDP registered user on chat, failures are ignored."""
+
     try:
         chat_user_data = {
             "first_name": user.first_name,
@@ -56,5 +108,3 @@ def idp_user_onboard(user, tenant_data=None, auth_token=None):
         chat_post_request(url_path=CHAT_CONFIG["user_onboard_url"], data=chat_user_data, headers=chat_request_headers)
     except Exception:
         pass
-    UserOnboardEmailTask().run_task(user_id=user.id, password=user_data["password"], db_name=get_current_db_name())
-    return True, message
@@ -86,25 +86,30 @@ class User(ArchivableModel, AbstractUser):
         return detail
 
     def get_active_role(self, is_reset=False):
-        """get currently active role the user is in."""
+        """
+        get currently active role the user is in. The roles are read with a single query & the result is
+        memoized on the instance, i.e. once per request.
+        """
 
-        if not self.roles.exists():
+        if not is_reset and hasattr(self, "_active_role_type"):
+            return self._active_role_type
+
+        roles = list(self.roles.all())
+        if not roles:
+            self._active_role_type = None
             return None
 
-        if is_reset or not self.current_role:
-            if self.roles.filter(role_type__in=[RoleTypeChoices.admin, RoleTypeChoices.manager]).exists():
-                admin_role = self.roles.filter(role_type=RoleTypeChoices.admin).first()
-                if admin_role:
-                    self.current_role = admin_role
-                else:
-                    manager_role = self.roles.filter(role_type=RoleTypeChoices.manager).first()
-                    self.current_role = manager_role
-                self.save()
-            else:
-                any_role = self.roles.all().first()
-                self.current_role = any_role
-                self.save()
-        return self.current_role.role_type
+        if is_reset or not self.current_role_id:
+            roles_by_type = {}
+            for role in roles:
+                roles_by_type.setdefault(role.role_type, role)
+            self.current_role = (
+                roles_by_type.get(RoleTypeChoices.admin) or roles_by_type.get(RoleTypeChoices.manager) or roles[0]
+            )
+            self.save()
+        current_role = next((role for role in roles if role.id == self.current_role_id), None) or self.current_role
+        self._active_role_type = current_role.role_type
+        return self._active_role_type
 
     def get_user_init_data_idp(self):
         """Used one time when user is getting onboarded."""
@@ -185,8 +185,7 @@ class UserCreateModelSerializer(AppCreateModelSerializer):
         success, message = idp_user_onboard(user, tenant_data, auth_token)
         if not success:
             raise serializers.ValidationError({"email": message})
-        if tenant_details["idp_id"] == 482:
-            AutoAssignLearningTask().run_task(user_id=user.id, db_name=get_current_db_name())
+        AutoAssignLearningTask().run_task(user_ids=[user.id], db_name=get_current_db_name())
         return user
 
     def get_meta(self) -> dict:
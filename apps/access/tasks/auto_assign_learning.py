@@ -1,58 +1,150 @@
+from django.db import transaction
 from django.utils import timezone
 
 from apps.common.tasks import BaseAppTask
-from apps.my_learning.config import AllBaseLearningTypeChoices, ApprovalTypeChoices
+from apps.my_learning.config import AUTO_ASSIGNMENT_BATCH_SIZE, ActionChoices, ApprovalTypeChoices
 
 
 class AutoAssignLearningTask(BaseAppTask):
-    """Task to Auto  the Users"""
+    """
+    Task to auto assign the catalogues & learnings of the active `AutoAssignmentRule` to the matching users.
 
-    def auto_assign_course_and_catalog(self, user):
-        """Function to add catalog and assign mandatory courses to user."""
+    The rules are evaluated set-wise. The matched users are resolved with a single query per rule & assigned in
+    batches, the missing catalogue relations & enrollments of a batch are computed with one query per learning
+    type & inserted with `bulk_create`. Like the previous hardcoded assignment, no notification or email is
+    sent for the new enrollments. The assignments are additive, nothing is removed when a user no longer
+    matches a rule.
+    """
 
-        from apps.learning.models import CatalogueRelation, Course
-        from apps.my_learning.models import Enrollment
+    batch_size = AUTO_ASSIGNMENT_BATCH_SIZE
+
+    @staticmethod
+    def assign_catalogues(rule, user_ids):
+        """Adds the users to the catalogue relations of the rule. Returns the count of the new relations."""
+
+        from apps.learning.models import CatalogueRelation
+
+        catalogue_ids = [catalogue.id for catalogue in rule.catalogue.all()]
+        if not catalogue_ids:
+            return 0
+
+        # a catalogue can have several relations, the users are added to all of them
+        relation_ids = {}
+        for catalogue_id, relation_id in CatalogueRelation.objects.filter(
+            catalogue_id__in=catalogue_ids
+        ).values_list("catalogue_id", "id"):
+            relation_ids.setdefault(catalogue_id, []).append(relation_id)
+        missing_relations = [
+            CatalogueRelation(catalogue_id=catalogue_id)
+            for catalogue_id in catalogue_ids
+            if catalogue_id not in relation_ids
+        ]
+        for relation in CatalogueRelation.objects.bulk_create(missing_relations):
+            relation_ids[relation.catalogue_id] = [relation.id]
+        relation_ids = [relation_id for ids in relation_ids.values() for relation_id in ids]
 
-        catalogs_relations = CatalogueRelation.objects.filter(catalogue__id__in=[8868, 8870])
-        for catalogs_relation in catalogs_relations:
-            catalogs_relation.user.add(user)
-        user_groups = user.related_user_groups.all()
-        courses = (
-            Course.objects.unarchived()
-            .filter(id__in=[14079, 15635, 15636, 15663, 15664])
-            .exclude(related_enrollments__user_group__in=user_groups)
+        through_model = CatalogueRelation.user.through
+        existing = set(
+            through_model.objects.filter(cataloguerelation_id__in=relation_ids, user_id__in=user_ids).values_list(
+                "cataloguerelation_id", "user_id"
+            )
         )
-        enrollment_objs = []
-        for course in courses:
-            enrollment_objs.append(
-                Enrollment(
-                    **{
-                        "user_id": user.id,
-                        "course_id": course.id,
-                        "learning_type": AllBaseLearningTypeChoices.course,
-                        "created_by_id": user.id,
-                        "action": "approved",
-                        "action_date": timezone.now().date(),
-                        "actionee_id": user.id,
-                        "approval_type": ApprovalTypeChoices.tenant_admin,
-                        "reason": "Auto Assign Courses - Prolifics",
-                        "is_enrolled": True,
-                        "end_date": None,
-                    }
-                )
+        relations = [
+            through_model(cataloguerelation_id=relation_id, user_id=user_id)
+            for relation_id in relation_ids
+            for user_id in user_ids
+            if (relation_id, user_id) not in existing
+        ]
+        through_model.objects.bulk_create(relations, ignore_conflicts=True)
+        return len(relations)
+
+    @staticmethod
+    def get_learning_ids(rule):
+        """Returns the ids of the unarchived learnings of the rule, per learning type."""
+
+        return {
+            learning_type: list(getattr(rule, learning_type).unarchived().values_list("id", flat=True))
+            for learning_type in rule.learning_types
+        }
+
+    @staticmethod
+    def assign_learnings(rule, user_ids, rule_learning_ids):
+        """
+        Enrolls the users to the given learnings of the rule, skips the learnings already enrolled by the user or
+        by one of the user's groups. Returns the count of the new enrollments per learning type.
+        """
+
+        from apps.my_learning.models import Enrollment
+
+        counts = {}
+        for learning_type, learning_ids in rule_learning_ids.items():
+            if not learning_ids:
+                continue
+            lookup = f"{learning_type}_id"
+            enrollments = Enrollment.objects.filter(**{f"{lookup}__in": learning_ids})
+            existing = set(enrollments.filter(user_id__in=user_ids).values_list("user_id", lookup))
+            existing.update(
+                enrollments.filter(user_group__members__id__in=user_ids).values_list("user_group__members__id", lookup)
+            )
+            created = Enrollment.objects.bulk_create(
+                [
+                    Enrollment(
+                        user_id=user_id,
+                        learning_type=learning_type,
+                        created_by_id=rule.created_by_id,
+                        actionee_id=rule.created_by_id,
+                        action=ActionChoices.approved,
+                        action_date=timezone.now().date(),
+                        approval_type=ApprovalTypeChoices.tenant_admin,
+                        reason=f"Auto Assignment - {rule.name}",
+                        is_enrolled=True,
+                        end_date=rule.end_date,
+                        **{lookup: learning_id},
+                    )
+                    for user_id in user_ids
+                    for learning_id in learning_ids
+                    if (user_id, learning_id) not in existing
+                ]
             )
-        Enrollment.objects.bulk_create(enrollment_objs)
-        return True
+            counts[learning_type] = len(created)
+        return counts
 
-    def run(self, user_id, db_name, **kwargs):
-        """Run handler."""
+    def evaluate_rule(self, rule, user_ids):
+        """Assigns the rule to the matching users in batches. Returns the diff of the evaluation."""
 
-        from apps.access.models import User
+        from apps.my_learning.models import AutoAssignmentRule, Enrollment
+
+        matched_user_ids = list(rule.get_users(user_ids).order_by("id").values_list("id", flat=True))
+        rule_learning_ids = self.get_learning_ids(rule) if matched_user_ids else {}
+        evaluation = {"matched_users": len(matched_user_ids), "catalogue_relations": 0, "enrollments": {}}
+        for start in range(0, len(matched_user_ids), self.batch_size):
+            batch_user_ids = matched_user_ids[start : start + self.batch_size]
+            with transaction.atomic(using=Enrollment.objects.db):
+                evaluation["catalogue_relations"] += self.assign_catalogues(rule, batch_user_ids)
+                counts = self.assign_learnings(rule, batch_user_ids, rule_learning_ids)
+            for learning_type, count in counts.items():
+                evaluation["enrollments"][learning_type] = evaluation["enrollments"].get(learning_type, 0) + count
+
+        AutoAssignmentRule.objects.filter(id=rule.id).update(
+            last_evaluated_at=timezone.now(), last_evaluation=evaluation
+        )
+        self.logger.info(f"AutoAssignmentRule {rule.id} evaluated: {evaluation}")
+        return evaluation
+
+    def run(self, db_name, user_ids=None, rule_ids=None, user_id=None, **kwargs):
+        """
+        Run handler. Evaluates the given rules(all the active rules by default) for the given users(all the
+        users by default). `user_id` is kept for the tasks queued before the rules.
+        """
+
+        from apps.my_learning.models import AutoAssignmentRule
 
         self.switch_db(db_name)
         self.logger.info("Executing AutoAssignLearningTask.")
 
-        user = User.objects.get(id=user_id)
-        self.auto_assign_course_and_catalog(user)
-
-        return True
+        if user_id:
+            user_ids = [user_id]
+        rules = AutoAssignmentRule.objects.filter(is_active=True).prefetch_related(*AutoAssignmentRule.prefetch_fields)
+        if rule_ids is not None:
+            rules = rules.filter(id__in=rule_ids)
+        return {rule.id: self.evaluate_rule(rule, user_ids) for rule in rules}
@@ -1,152 +1,213 @@
+import os
+import time
 from datetime import datetime
 
-from apps.access.helpers import idp_user_onboard
+import openpyxl
+from django.db import transaction
+from django.utils import timezone
+
+from apps.access.helpers import idp_bulk_user_onboard
 from apps.access.tasks import AutoAssignLearningTask
+from apps.common.helpers import save_xlsx_to_storage
 from apps.common.idp_service import idp_admin_auth_token
 from apps.common.tasks import BaseAppTask
 from apps.tenant_service.middlewares import get_current_tenant_details
 
+# Sheet column -> meta model name, for the unique named meta tables referenced by `UserDetail`.
+USER_BULK_UPLOAD_META_COLUMNS = {
+    "Employment Status": "EmploymentStatus",
+    "Job Description": "JobDescription",
+    "Job Title": "JobTitle",
+    "Department Code": "DepartmentCode",
+    "Department Title": "DepartmentTitle",
+}
+
 
 class UserBulkUploadTask(BaseAppTask):
-    """Task to Bulk Upload the Users"""
+    """
+    Task to Bulk Upload the Users.
 
-    def run(self, list_of_users, db_name, **kwargs):
-        """Run handler."""
+    The upload is processed as a staged pipeline instead of row by row:
+        1. Stream & validate the rows of the sheet (read-only mode).
+        2. Preload the existing users, roles, groups & meta values referenced by the sheet.
+        3. Create the missing meta rows in bulk.
+        4. Create/Update the users, details, roles, skills & groups in bulk, chunk wise.
+        5. Onboard the newly created users on IDP in batches.
+    Rows that could not be processed are written to an error report file.
+    """
+
+    chunk_size = 1000
+    idp_batch_size = 100
+    error_report_header = ["Row", "Email", "Error"]
+
+    def __init__(self, *args, **kwargs):
+        """Overridden to set up the per-run state."""
+
+        super().__init__(*args, **kwargs)
+        self.errors = []
+
+    def add_error(self, row_number, user_data, message):
+        """Track the error of the given row, used to create the error report."""
+
+        self.errors.append([row_number, user_data.get("Email"), message])
+
+    @staticmethod
+    def read_excel_file(file_path):
+        """Streams the rows of the sheet as dictionaries, along with the row number."""
+
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None) or []
+        for row_number, row in enumerate(rows, start=2):
+            if any(row):
+                yield row_number, dict(zip(header, row))
+        workbook.close()
+
+    @staticmethod
+    def clean_value(value):
+        """Strips the string values of the sheet, empty values are considered as None."""
+
+        if isinstance(value, str):
+            value = value.strip()
+        return value or None
+
+    def get_valid_rows(self, rows):
+        """Validates & normalizes the rows. Invalid & duplicate rows are tracked as errors."""
+
+        valid_rows, emails = [], set()
+        for row_number, user_data in rows:
+            user_data = {key: self.clean_value(value) for key, value in user_data.items() if key}
+            missing = [
+                column for column in ["Email", "Tenant Name", "Role", "First Name"] if not user_data.get(column)
+            ]
+            if missing:
+                self.add_error(row_number, user_data, f"Missing required values: {', '.join(missing)}")
+                continue
+            email = str(user_data["Email"])
+            if email.lower() in emails:
+                self.add_error(row_number, user_data, "Duplicate email in the uploaded file.")
+                continue
+            if user_data.get("Start Date") and not isinstance(user_data["Start Date"], datetime):
+                try:
+                    user_data["Start Date"] = datetime.strptime(str(user_data["Start Date"]), "%m/%d/%Y")
+                except ValueError:
+                    self.add_error(row_number, user_data, "Invalid Start Date, expected format is mm/dd/yyyy.")
+                    continue
+            emails.add(email.lower())
+            user_data["Email"] = email
+            valid_rows.append((row_number, user_data))
+        return valid_rows
+
+    @staticmethod
+    def get_or_create_named_objects(model, names):
+        """Returns a `name -> instance` map for the given names, creating the missing ones in one statement."""
+
+        if not names:
+            return {}
+        model.objects.bulk_create([model(name=name) for name in names], ignore_conflicts=True)
+        return {instance.name: instance for instance in model.objects.filter(name__in=names)}
+
+    @staticmethod
+    def get_or_create_scoped_objects(model, keys, scope_field=None):
+        """
+        Returns a `key -> instance` map for the given keys, where the key is the name or the (name, scope_id) pair
+        when `scope_field` is given. Used for the non-unique models like `Country`, `State`, `City` & `CategorySkill`,
+        so the missing keys are computed in memory & created in one statement.
+        """
+
+        if not keys:
+            return {}
+
+        def get_key(_instance):
+            """Returns the lookup key of the given instance."""
+
+            if scope_field:
+                return _instance.name, getattr(_instance, f"{scope_field}_id")
+            return _instance.name
+
+        def build(_key):
+            """Returns an unsaved instance for the given key."""
+
+            if scope_field:
+                return model(name=_key[0], **{f"{scope_field}_id": _key[1]})
+            return model(name=_key)
+
+        lookup = {"name__in": {key[0] for key in keys} if scope_field else keys}
+        if scope_field:
+            lookup[f"{scope_field}_id__in"] = {key[1] for key in keys}
+        existing = {}
+        for instance in model.objects.filter(**lookup).order_by("id"):
+            existing.setdefault(get_key(instance), instance)
+        for instance in model.objects.bulk_create([build(key) for key in keys if key not in existing]):
+            existing[get_key(instance)] = instance
+        return existing
+
+    def preload_meta(self, rows):
+        """Preloads all the meta values referenced in the rows, creating the missing ones in bulk."""
 
-        from apps.access.models import User, UserDetail, UserSkillDetail
         from apps.access_control.models import UserGroup, UserRole
-        from apps.learning.config import ProficiencyChoices
         from apps.learning.models import CategorySkill
-        from apps.meta.models import (
-            City,
-            Country,
-            DepartmentCode,
-            DepartmentTitle,
-            EmploymentStatus,
-            JobDescription,
-            JobTitle,
-            State,
-        )
+        from apps.meta import models as meta_models
 
-        self.switch_db(db_name)
-        self.logger.info("Executing UserBulkUploadTask.")
-        auth_token = idp_admin_auth_token()
-        tenant_details = get_current_tenant_details()
-        tenant_data = {
-            "idp_id": tenant_details["idp_id"],
-            "name": tenant_details["name"],
-            "tenancy_name": tenant_details["tenancy_name"],
-            "issuer_url": tenant_details.get("issuer_url"),
+        meta = {}
+        for column, model_name in USER_BULK_UPLOAD_META_COLUMNS.items():
+            names = {user_data[column] for _, user_data in rows if user_data.get(column)}
+            meta[column] = self.get_or_create_named_objects(getattr(meta_models, model_name), names)
+
+        # location hierarchy, country -> state -> city
+        countries = {user_data["Country"] for _, user_data in rows if user_data.get("Country")}
+        meta["Country"] = self.get_or_create_scoped_objects(meta_models.Country, countries)
+        states = {
+            (user_data["State"], meta["Country"][user_data["Country"]].id)
+            for _, user_data in rows
+            if user_data.get("Country") and user_data.get("State")
         }
-        if not tenant_details["is_unlimited_users_allowed"]:
-            limit = tenant_details["allowed_user_count"] - User.objects.all().count()
-            list_of_users = list_of_users[:limit]
-        for user_data in list_of_users:
-            if (
-                not user_data["Email"]
-                or not user_data["Tenant Name"]
-                or not user_data["Role"]
-                or not user_data["First Name"]
-            ):
-                continue
-            if user_data.get("Employee Id"):
-                unique_id = UserDetail.objects.filter(employee_id=user_data["Employee Id"]).exists()
-                if unique_id:
-                    user_data["Employee Id"] = None
-            if user_data.get("User Id Number"):
-                unique_id = UserDetail.objects.filter(user_id_number=user_data["User Id Number"]).exists()
-                if unique_id:
-                    user_data["User Id Number"] = None
-            role_list = user_data.get("Role").split(",")
-            roles = []
-            for role in role_list:
-                user_role = UserRole.objects.filter(name__icontains=role.strip()).first()
-                if user_role:
-                    roles.append(user_role.id)
-            user = {
-                "first_name": user_data["First Name"],
-                "last_name": user_data["Last Name"],
-                "email": user_data["Email"],
-                "is_active": user_data.get("Active") or True,
-            }
-            user_instance, created = User.objects.update_or_create(username=user_data["Email"], defaults=user)
-            if created:
-                user_instance.roles.set(roles)
-                employment_status = (
-                    EmploymentStatus.objects.get_or_create(name=user_data["Employment Status"])[0]
-                    if user_data.get("Employment Status")
-                    else None
-                )
-                job_description = (
-                    JobDescription.objects.get_or_create(name=user_data["Job Description"])[0]
-                    if user_data.get("Job Description")
-                    else None
-                )
-                job_title = (
-                    JobTitle.objects.get_or_create(name=user_data["Job Title"])[0]
-                    if user_data.get("Job Title")
-                    else None
-                )
-                department_code = (
-                    DepartmentCode.objects.get_or_create(name=user_data["Department Code"])[0]
-                    if user_data.get("Department Code")
-                    else None
-                )
-                department_title = (
-                    DepartmentTitle.objects.get_or_create(name=user_data["Department Title"])[0]
-                    if user_data.get("Department Title")
-                    else None
-                )
-                country = state = city = None
-                if user_data.get("Country"):
-                    country = Country.objects.get_or_create(name=user_data["Country"])[0]
-                if country and user_data.get("State"):
-                    state = State.objects.get_or_create(name=user_data["State"], country=country)[0]
-                if state and user_data.get("City"):
-                    city = City.objects.get_or_create(name=user_data["City"], state=state)[0]
-                user_details = self.get_user_details_data(
-                    user_data=user_data,
-                    job_description=job_description,
-                    job_title=job_title,
-                    department_code=department_code,
-                    department_title=department_title,
-                    employment_status=employment_status,
-                    city=city,
-                    state=state,
-                    country=country,
-                )
-                user_detail, created = UserDetail.objects.update_or_create(user=user_instance, defaults=user_details)
-                if user_data.get("Skill"):
-                    skill_list = user_data.get("Skill").split(",")
-                    skills = []
-                    for skill in skill_list:
-                        category_skill, created = CategorySkill.objects.get_or_create(name=skill.strip())
-                        if category_skill:
-                            user_skill, created = UserSkillDetail.objects.get_or_create(
-                                skill=category_skill, proficiency=ProficiencyChoices.basic
-                            )
-                            skills.append(user_skill.id)
-                    user_detail.skill_detail.set(skills)
-                if user_data.get("Business Unit/User Group"):
-                    user_group = UserGroup.objects.filter(name=user_data["Business Unit/User Group"].strip()).first()
-                    if user_group:
-                        user_group.members.add(user_instance)
-                success, message = idp_user_onboard(user_instance, tenant_data, auth_token)
-                if not success:
-                    user_instance.is_active = False
-                    user_instance.save()
-                    continue
-                if tenant_details["idp_id"] == 482:
-                    AutoAssignLearningTask().run_task(user_id=user_instance.id, db_name=db_name)
-        return True
+        meta["State"] = self.get_or_create_scoped_objects(meta_models.State, states, "country")
+        cities = {
+            (user_data["City"], meta["State"][(user_data["State"], meta["Country"][user_data["Country"]].id)].id)
+            for _, user_data in rows
+            if user_data.get("Country") and user_data.get("State") and user_data.get("City")
+        }
+        meta["City"] = self.get_or_create_scoped_objects(meta_models.City, cities, "state")
+
+        skills = {
+            skill.strip()
+            for _, user_data in rows
+            if user_data.get("Skill")
+            for skill in str(user_data["Skill"]).split(",")
+            if skill.strip()
+        }
+        meta["Skill"] = self.get_or_create_scoped_objects(CategorySkill, skills)
+
+        # roles & user groups are never created from the upload
+        meta["Role"] = list(UserRole.objects.all().values_list("id", "name"))
+        group_names = {
+            user_data["Business Unit/User Group"] for _, user_data in rows if user_data.get("Business Unit/User Group")
+        }
+        meta["Business Unit/User Group"] = {}
+        for group in UserGroup.objects.filter(name__in=group_names):
+            meta["Business Unit/User Group"].setdefault(group.name, group.id)
+        return meta
 
     @staticmethod
-    def get_user_details_data(**kwargs):
+    def get_role_ids(role_names, roles):
+        """Returns the role ids matching the given comma separated roles, same as `name__icontains`."""
+
+        role_ids = []
+        for role_name in str(role_names).split(","):
+            role_name = role_name.strip().lower()
+            if not role_name:
+                continue
+            if role_id := next((_id for _id, name in roles if role_name in name.lower()), None):
+                role_ids.append(role_id)
+        return role_ids
+
+    def get_user_details_data(self, user_data, meta):
         """Initial User Detail Data."""
 
-        user_data = kwargs["user_data"]
-        if user_data.get("Start Date") and not isinstance(user_data["Start Date"], datetime):
-            user_data["Start Date"] = datetime.strptime(user_data["Start Date"], "%m/%d/%Y")
+        country = meta["Country"].get(user_data.get("Country"))
+        state = country and meta["State"].get((user_data.get("State"), country.id))
+        city = state and meta["City"].get((user_data.get("City"), state.id))
         return {
             "user_id_number": user_data.get("User Id Number"),
             "user_grade": user_data.get("User Grade"),
@@ -159,13 +220,207 @@ class UserBulkUploadTask(BaseAppTask):
             "employee_id": user_data.get("Employee Id"),
             "manager_two_email": user_data.get("Manager 2 Email"),
             "manager_three_email": user_data.get("Manager 3 Email"),
-            "job_description": kwargs["job_description"],
-            "job_title": kwargs["job_title"],
-            "department_code": kwargs["department_code"],
-            "department_title": kwargs["department_title"],
-            "employment_status": kwargs["employment_status"],
-            "current_city": kwargs["city"],
-            "current_state": kwargs["state"],
-            "current_country": kwargs["country"],
+            **{
+                field: meta[column].get(user_data.get(column))
+                for field, column in [
+                    ("job_description", "Job Description"),
+                    ("job_title", "Job Title"),
+                    ("department_code", "Department Code"),
+                    ("department_title", "Department Title"),
+                    ("employment_status", "Employment Status"),
+                ]
+            },
+            "current_city": city or None,
+            "current_state": state or None,
+            "current_country": country,
             "is_onsite_user": user_data.get("Is Onsite User") or False,
         }
+
+    def process_chunk(self, rows, meta):
+        """Creates/Updates the users of the given chunk in bulk. Returns the newly created users."""
+
+        from apps.access.models import User, UserDetail, UserSkillDetail
+        from apps.access_control.models import UserGroup
+        from apps.learning.config import ProficiencyChoices
+
+        emails = [user_data["Email"] for _, user_data in rows]
+        existing_users = {user.username: user for user in User.objects.filter(username__in=emails)}
+        employee_ids = set(
+            UserDetail.objects.filter(
+                employee_id__in=[user_data["Employee Id"] for _, user_data in rows if user_data.get("Employee Id")]
+            ).values_list("employee_id", flat=True)
+        )
+        user_id_numbers = set(
+            UserDetail.objects.filter(
+                user_id_number__in=[
+                    user_data["User Id Number"] for _, user_data in rows if user_data.get("User Id Number")
+                ]
+            ).values_list("user_id_number", flat=True)
+        )
+
+        users_to_update, new_rows = [], []
+        for row_number, user_data in rows:
+            user_fields = {
+                "first_name": user_data["First Name"],
+                "last_name": user_data.get("Last Name"),
+                "email": user_data["Email"],
+                "is_active": user_data.get("Active") or True,
+            }
+            if user := existing_users.get(user_data["Email"]):
+                for field, value in user_fields.items():
+                    setattr(user, field, value)
+                users_to_update.append(user)
+                continue
+            # unique values already taken are skipped, same as the row wise upload
+            for column, taken in [("Employee Id", employee_ids), ("User Id Number", user_id_numbers)]:
+                if user_data.get(column):
+                    if user_data[column] in taken:
+                        user_data[column] = None
+                    else:
+                        taken.add(user_data[column])
+            new_rows.append((row_number, user_data, User(username=user_data["Email"], **user_fields)))
+
+        with transaction.atomic(using=User.objects.db):
+            for user in users_to_update:
+                user.modified_at = timezone.now()
+            User.objects.bulk_update(users_to_update, ["first_name", "last_name", "email", "is_active", "modified_at"])
+            created_users = User.objects.bulk_create([user for _, _, user in new_rows])
+
+            user_details, role_relations, group_relations, user_skills = [], [], [], {}
+            for (row_number, user_data, _), user in zip(new_rows, created_users):
+                user_details.append(UserDetail(user=user, **self.get_user_details_data(user_data, meta)))
+                role_relations.extend(
+                    User.roles.through(user_id=user.id, userrole_id=role_id)
+                    for role_id in self.get_role_ids(user_data["Role"], meta["Role"])
+                )
+                if group_name := user_data.get("Business Unit/User Group"):
+                    if group_id := meta["Business Unit/User Group"].get(group_name):
+                        group_relations.append(UserGroup.members.through(usergroup_id=group_id, user_id=user.id))
+                    else:
+                        self.add_error(row_number, user_data, f"User group '{group_name}' not found.")
+                if user_data.get("Skill"):
+                    skill_names = [skill.strip() for skill in str(user_data["Skill"]).split(",") if skill.strip()]
+                    user_skills[user.id] = {meta["Skill"][skill_name].id for skill_name in skill_names}
+            UserDetail.objects.bulk_create(user_details)
+            User.roles.through.objects.bulk_create(role_relations, ignore_conflicts=True)
+            UserGroup.members.through.objects.bulk_create(group_relations, ignore_conflicts=True)
+
+            if user_skills:
+                skill_ids = set().union(*user_skills.values())
+                skill_details = {}
+                for skill_detail in UserSkillDetail.objects.filter(
+                    skill_id__in=skill_ids, proficiency=ProficiencyChoices.basic
+                ).order_by("created_at"):
+                    skill_details.setdefault(skill_detail.skill_id, skill_detail.id)
+                for skill_detail in UserSkillDetail.objects.bulk_create(
+                    [
+                        UserSkillDetail(skill_id=skill_id, proficiency=ProficiencyChoices.basic)
+                        for skill_id in skill_ids
+                        if skill_id not in skill_details
+                    ]
+                ):
+                    skill_details[skill_detail.skill_id] = skill_detail.id
+                detail_ids = dict(
+                    UserDetail.objects.filter(user_id__in=user_skills.keys()).values_list("user_id", "id")
+                )
+                UserDetail.skill_detail.through.objects.bulk_create(
+                    [
+                        UserDetail.skill_detail.through(
+                            userdetail_id=detail_ids[user_id], userskilldetail_id=skill_details[skill_id]
+                        )
+                        for user_id, skill_ids in user_skills.items()
+                        for skill_id in skill_ids
+                    ],
+                    ignore_conflicts=True,
+                )
+        return [(row_number, user_data, user) for (row_number, user_data, _), user in zip(new_rows, created_users)]
+
+    def onboard_users(self, created_users, tenant_data, auth_token, db_name):
+        """
+        Onboards the newly created users on IDP in batches. Failed users are deactivated, the onboarded users
+        are auto assigned as a batch.
+        """
+
+        from apps.access.models import User
+
+        for start in range(0, len(created_users), self.idp_batch_size):
+            users_batch = created_users[start : start + self.idp_batch_size]
+            failed_user_ids = idp_bulk_user_onboard(
+                users=[user for _, _, user in users_batch],
+                tenant_data=tenant_data,
+                auth_token=auth_token,
+            )
+            User.objects.filter(id__in=failed_user_ids).update(is_active=False)
+            for row_number, user_data, user in users_batch:
+                if user.id in failed_user_ids:
+                    self.add_error(row_number, user_data, "User IDP Registration Failed!")
+            if onboarded_user_ids := [user.id for _, _, user in users_batch if user.id not in failed_user_ids]:
+                AutoAssignLearningTask().run_task(user_ids=onboarded_user_ids, db_name=db_name)
+
+    def save_error_report(self, db_name):
+        """Writes the tracked errors to an xlsx file & returns the file url."""
+
+        if not self.errors:
+            return None
+        return save_xlsx_to_storage(
+            file_name=f"files/{db_name}/user_bulk_upload/errors_{timezone.now().strftime('%Y%m%d%H%M%S')}.xlsx",
+            header=self.error_report_header,
+            rows=sorted(self.errors, key=lambda _: _[0]),
+        )
+
+    def run(self, db_name, file_path=None, list_of_users=None, **kwargs):
+        """Run handler."""
+
+        from apps.access.models import User
+
+        self.switch_db(db_name)
+        self.logger.info("Executing UserBulkUploadTask.")
+        self.errors, started_at = [], time.perf_counter()
+        auth_token = idp_admin_auth_token()
+        tenant_details = get_current_tenant_details()
+        tenant_data = {
+            "idp_id": tenant_details["idp_id"],
+            "name": tenant_details["name"],
+            "tenancy_name": tenant_details["tenancy_name"],
+            "issuer_url": tenant_details.get("issuer_url"),
+        }
+
+        if file_path:
+            rows = self.read_excel_file(file_path)
+        else:
+            rows = enumerate(list_of_users or [], start=2)
+        rows = self.get_valid_rows(rows)
+        if not tenant_details["is_unlimited_users_allowed"]:
+            limit = max(tenant_details["allowed_user_count"] - User.objects.all().count(), 0)
+            for row_number, user_data in rows[limit:]:
+                self.add_error(row_number, user_data, "Tenant user limit exceeded.")
+            rows = rows[:limit]
+
+        meta = self.preload_meta(rows)
+        created_users = []
+        for start in range(0, len(rows), self.chunk_size):
+            chunk = rows[start : start + self.chunk_size]
+            try:
+                created_users.extend(self.process_chunk(chunk, meta))
+            except Exception as e:
+                self.logger.error(f"UserBulkUploadTask chunk failed: {e}")
+                for row_number, user_data in chunk:
+                    self.add_error(row_number, user_data, str(e))
+        self.onboard_users(created_users, tenant_data, auth_token, db_name)
+
+        error_report_url = self.save_error_report(db_name)
+        if file_path:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+        self.logger.info(
+            f"UserBulkUploadTask completed in {time.perf_counter() - started_at:.2f}s. Rows: {len(rows)}, "
+            f"Created: {len(created_users)}, Errors: {len(self.errors)}, Error Report: {error_report_url}"
+        )
+        return {
+            "total": len(rows),
+            "created": len(created_users),
+            "failed": len(self.errors),
+            "error_report_url": error_report_url,
+        }
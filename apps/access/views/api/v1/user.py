@@ -2,6 +2,7 @@ import json
 from io import BytesIO
 
 import openpyxl
+from django.db import transaction
 from django.db.models import Q, Sum
 from django.db.models.functions import Coalesce
 from django.utils import timezone
@@ -29,6 +30,7 @@ from apps.common.views.api import AppAPIView, AppCreateAPIView, AppModelCreateAP
 from apps.leaderboard.config import MilestoneChoices
 from apps.leaderboard.tasks import CommonLeaderboardTask
 from apps.learning.config import SubModuleTypeChoices
+from apps.learning.helpers import process_and_save_uploaded_file
 from apps.learning.models import Assignment, AssignmentGroup, CatalogueRelation, Course, Expert, LearningPath
 from apps.my_learning.config import EnrollmentTypeChoices, LearningStatusChoices
 from apps.my_learning.models import (
@@ -40,6 +42,7 @@ from apps.my_learning.models import (
     UserLearningPathTracker,
 )
 from apps.my_learning.serializers.v1 import UserEnrollmentListModelSerializer
+from apps.my_learning.tasks import UserFeedConnectionTask
 from apps.tenant_service.middlewares import get_current_db_name, get_current_tenant_details
 
 
@@ -423,9 +426,11 @@ class UserConnectAPIView(AppAPIView):
         target_instance = UserConnection.objects.get_or_create(user=user_obj)[0]
         if action == UserConnectActionChoices.follow:
             target_instance.followers.add(user)
+            self.sync_user_feed([(user.id, user_obj.id)], is_connected=True)
             response_data = {"message": "Successfully followed the user."}
         elif action == UserConnectActionChoices.unfollow:
             target_instance.followers.remove(user)
+            self.sync_user_feed([(user.id, user_obj.id)], is_connected=False)
             response_data = {"message": "Successfully unfollowed the user."}
         elif action == UserConnectActionChoices.accept:
             friend_req = UserFriendRequest.objects.get(from_user=user_obj, to_user=user)
@@ -433,6 +438,7 @@ class UserConnectAPIView(AppAPIView):
             requester_instance = UserConnection.objects.get_or_create(user=user)[0]
             requester_instance.friends.add(user_obj)
             target_instance.friends.add(user)
+            self.sync_user_feed([(user.id, user_obj.id), (user_obj.id, user.id)], is_connected=True)
             response_data = {"message": "Friend request accepted successfully."}
         elif action == UserConnectActionChoices.reject:
             if friend_req := UserFriendRequest.objects.filter(from_user=user, to_user=user_obj).first():
@@ -450,6 +456,20 @@ class UserConnectAPIView(AppAPIView):
 
         return self.send_response(data=response_data)
 
+    @staticmethod
+    def sync_user_feed(connections, is_connected):
+        """Backfills or removes the actor's activities in the user's feed, for the `(user_id, actor_id)` pairs."""
+
+        db_name = get_current_db_name()
+        for user_id, actor_id in connections:
+            # dispatched once committed, the worker reads the connections
+            transaction.on_commit(
+                lambda user_id=user_id, actor_id=actor_id: UserFeedConnectionTask().run_task(
+                    user_id=user_id, actor_id=actor_id, is_connected=is_connected, db_name=db_name
+                ),
+                using=UserConnection.objects.db,
+            )
+
 
 class UserConnectionListAPIViewSet(AppModelListAPIViewSet):
     """View to list down all the `User`."""
@@ -538,13 +558,11 @@ class UserBulkUploadAPIView(AppAPIView):
             return self.send_error_response(data="File not found")
         if not uploaded_file.name.endswith(".xlsx"):
             return self.send_error_response(data="Unsupported file format. Please upload a .xlsx file.")
-        # Opening active sheet of the uploaded file
-        sheet = openpyxl.load_workbook(uploaded_file).active
-        # Creating a list header with Column values of active sheet [1st row]
-        header = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True))
-        # Creating a List with dictionary values [{ header : row }]
-        list_of_users = [dict(zip(header, row)) for row in sheet.iter_rows(min_row=2, values_only=True)]
-        UserBulkUploadTask().run_task(list_of_users=list_of_users, db_name=get_current_db_name())
+        # The sheet is streamed in the task, so the file is stored locally instead of being loaded here.
+        db_name = get_current_db_name()
+        folder_path = f"apps/media/temp/{db_name}/user_bulk_upload"
+        file_path = process_and_save_uploaded_file(uploaded_file, folder_path)
+        UserBulkUploadTask().run_task(file_path=file_path, db_name=db_name)
         return self.send_response(data={"message": "User Bulk Upload Successfull"})
 
 
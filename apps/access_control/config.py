@@ -8,3 +8,8 @@ class RoleTypeChoices(DjangoChoices):
     manager = ChoiceItem("manager", "Manager")
     learner = ChoiceItem("learner", "Learner")
     author = ChoiceItem("author", "Author")
+
+
+# compiled `policy slug -> (create, view, edit, delete)` maps of the roles are cached per tenant for a day,
+# the cache is invalidated on every save of a role, role permission or policy.
+ROLE_PERMISSIONS_CACHE_TIMEOUT = 60 * 60 * 24
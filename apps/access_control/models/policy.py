@@ -1,6 +1,8 @@
 from django.conf import settings
-from django.db import DEFAULT_DB_ALIAS, models
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, models, router, transaction
 
+from apps.access_control.config import ROLE_PERMISSIONS_CACHE_TIMEOUT
 from apps.access_control.fixtures import SHARED_POLICY_FIXTURE, SUPER_TENANT_POLICY_FIXTURE
 from apps.common.models import (
     COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG,
@@ -23,37 +25,54 @@ class PolicyCategory(NameModel):
 
     @classmethod
     def populate_policies(cls, db_name=None):
-        """Just a helper method to populate the policy categories and policies."""
+        """
+        Syncs the hardcoded policy categories and policies to the given database. The desired & existing rows
+        are diffed in memory, the missing ones are bulk created & the changed ones bulk updated.
+        """
 
-        # TODO: Move this to task once celery is setup. Change according to per tenant db arch.
-
-        fixtures = SHARED_POLICY_FIXTURE
+        fixtures = dict(SHARED_POLICY_FIXTURE)
         if not db_name or db_name == settings.DATABASES[DEFAULT_DB_ALIAS]["NAME"]:
             fixtures.update(SUPER_TENANT_POLICY_FIXTURE)
             set_db_for_router()
         else:
             set_db_for_router(db_name)
 
-        for policy_category, values in fixtures.items():
-            policies = values.pop("policies")
-            category = cls.objects.filter(slug=policy_category).first()
-            if not category:
-                category = cls.objects.create(slug=policy_category, name=values["name"])
-            else:
+        categories = {category.slug: category for category in cls.objects.filter(slug__in=fixtures.keys())}
+        changed_categories = []
+        for slug, values in fixtures.items():
+            if (category := categories.get(slug)) and category.name != values["name"]:
                 category.name = values["name"]
-                category.save()
-            values["policies"] = policies
-            for policy in policies:
-                if existing_policy := category.related_policies.filter(slug=policy["slug"]).first():
-                    existing_policy.name = policy["name"]
-                    existing_policy.description = policy.get("description") or policy["name"]
-                    existing_policy.save()
-                else:
-                    category.related_policies.create(
-                        name=policy["name"],
-                        slug=policy["slug"],
-                        description=policy.get("description") or policy["name"],
+                changed_categories.append(category)
+        cls.objects.bulk_update(changed_categories, ["name"])
+        for category in cls.objects.bulk_create(
+            [cls(slug=slug, name=values["name"]) for slug, values in fixtures.items() if slug not in categories]
+        ):
+            categories[category.slug] = category
+
+        policies = {
+            (policy.policy_category_id, policy.slug): policy
+            for policy in Policy.objects.filter(policy_category__in=categories.values())
+        }
+        missing_policies, changed_policies = [], []
+        for slug, values in fixtures.items():
+            category = categories[slug]
+            for policy_fixture in values["policies"]:
+                name = policy_fixture["name"]
+                description = policy_fixture.get("description") or name
+                if not (policy := policies.get((category.id, policy_fixture["slug"]))):
+                    missing_policies.append(
+                        Policy(
+                            policy_category=category, slug=policy_fixture["slug"], name=name, description=description
+                        )
                     )
+                elif (policy.name, policy.description) != (name, description):
+                    policy.name, policy.description = name, description
+                    changed_policies.append(policy)
+        Policy.objects.bulk_update(changed_policies, ["name", "description"])
+        Policy.objects.bulk_create(missing_policies)
+        if missing_policies or changed_policies:
+            RolePermission.invalidate_compiled_permissions()
+        return {"created": len(missing_policies), "updated": len(changed_policies)}
 
 
 class Policy(NameModel):
@@ -69,6 +88,12 @@ class Policy(NameModel):
     slug = models.SlugField(max_length=COMMON_CHAR_FIELD_MAX_LENGTH, **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
     description = models.TextField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
 
+    def save(self, *args, **kwargs):
+        """Overridden to invalidate the compiled role permissions, the policy slug is part of it."""
+
+        super().save(*args, **kwargs)
+        RolePermission.invalidate_compiled_permissions()
+
 
 class RolePermission(CUDSoftDeleteModel):
     """
@@ -97,3 +122,47 @@ class RolePermission(CUDSoftDeleteModel):
     is_viewable = models.BooleanField(default=False)
     is_editable = models.BooleanField(default=False)
     is_deletable = models.BooleanField(default=False)
+
+    def save(self, *args, **kwargs):
+        """Overridden to invalidate the compiled role permissions."""
+
+        super().save(*args, **kwargs)
+        self.invalidate_compiled_permissions()
+
+    @staticmethod
+    def get_compiled_permissions_cache_key():
+        """Returns the cache key of the compiled role permissions of the current tenant."""
+
+        from apps.common.cache_management import cache_manager
+
+        return f"{cache_manager.db_name}-compiled-role-permissions"
+
+    @classmethod
+    def get_compiled_permissions(cls):
+        """
+        Returns the compiled permissions of all the roles of the current tenant, as
+        `{role_id: {policy slug: (create, view, edit, delete)}}`. Built with one query & cached per tenant.
+        """
+
+        cache_key = cls.get_compiled_permissions_cache_key()
+        compiled_permissions = cache.get(cache_key)
+        if compiled_permissions is None:
+            compiled_permissions = {}
+            for role_id, policy_slug, *flags in (
+                cls.objects.alive()
+                .filter(policy__slug__isnull=False)
+                .values_list("role_id", "policy__slug", "is_creatable", "is_viewable", "is_editable", "is_deletable")
+            ):
+                compiled_permissions.setdefault(role_id, {})[policy_slug] = tuple(flags)
+            cache.set(cache_key, compiled_permissions, timeout=ROLE_PERMISSIONS_CACHE_TIMEOUT)
+        return compiled_permissions
+
+    @classmethod
+    def invalidate_compiled_permissions(cls):
+        """
+        Invalidates the compiled role permissions of the current tenant, once the current transaction is
+        committed. Otherwise a concurrent request could cache the old permissions again before the commit.
+        """
+
+        cache_key = cls.get_compiled_permissions_cache_key()
+        transaction.on_commit(lambda: cache.delete(cache_key), using=router.db_for_write(cls))
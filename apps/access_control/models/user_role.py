@@ -36,16 +36,29 @@ class UserRole(CUDSoftDeleteModel, NameModel):
     )
     description = models.TextField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
 
+    def save(self, *args, **kwargs):
+        """Overridden to invalidate the compiled role permissions."""
+
+        from apps.access_control.models import RolePermission
+
+        super().save(*args, **kwargs)
+        RolePermission.invalidate_compiled_permissions()
+
     @classmethod
     def populate_default_user_roles(cls, db_name=None):
-        """Populate the default user roles for the given database."""
+        """Populate the default user roles for the given database. The missing roles are bulk created."""
 
         if not db_name or db_name == settings.DATABASES[DEFAULT_DB_ALIAS]["NAME"]:
             set_db_for_router()
         else:
             set_db_for_router(db_name)
 
-        for role_value, role_label in RoleTypeChoices.values.items():
-            if not UserRole.objects.filter(role_type=role_value).exists():
-                UserRole.objects.create(name=role_label, role_type=role_value)
+        existing_role_types = set(UserRole.objects.values_list("role_type", flat=True))
+        UserRole.objects.bulk_create(
+            [
+                UserRole(name=role_label, role_type=role_value)
+                for role_value, role_label in RoleTypeChoices.values.items()
+                if role_value not in existing_role_types
+            ]
+        )
         return True
@@ -44,6 +44,7 @@ class UserRoleModelSerializer(AppWriteOnlyModelSerializer):
         instance = super().create(validated_data)
         role_permissions_list = [RolePermission(role=instance, **item) for item in role_permissions]
         instance.related_role_permissions.bulk_create(role_permissions_list)
+        RolePermission.invalidate_compiled_permissions()
         return instance
 
     def update(self, instance, validated_data):
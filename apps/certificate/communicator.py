@@ -1,3 +1,4 @@
+from apps.common.async_communicator import AsyncBaseCommunicator
 from apps.common.base_communicator import BaseCommunicator
 from config.settings import CERT_CONFIG
 
@@ -24,3 +25,7 @@ class CertificateCommunicator(BaseCommunicator):
             headers["Authorization"] = f"CERT_ACCESS_KEY {token}"
 
         return headers
+
+
+class AsyncCertificateCommunicator(AsyncBaseCommunicator, CertificateCommunicator):
+    """Async variant of the `CertificateCommunicator`, used by the async gateway views."""
@@ -1,55 +1,62 @@
 from rest_framework.response import Response
 
-from apps.certificate.communicator import CertificateCommunicator
+from apps.certificate.communicator import AsyncCertificateCommunicator
 from apps.common.helpers import process_request_headers
-from apps.common.views.api import AppAPIView
+from apps.common.views.api import AsyncAppAPIView
 from apps.tenant_service.middlewares import get_current_tenant_idp_id
 from config.settings import CERT_ACCESS_KEY
 
 
-class CertificateAPIView(AppAPIView):
-    """API View for certificate CRUD."""
+class CertificateAPIView(AsyncAppAPIView):
+    """API View for certificate CRUD. Async, proxies the requests to the certificate microservices."""
 
     def get_url_path(self):
         """Returns the URL path of the current HTTP request."""
 
         return self.request.path
 
-    def get(self, request, *args, **kwargs):
+    async def get_headers(self):
+        """Returns the headers of the microservice request, resolved from the tenant of the request."""
+
+        return await self.run_sync(process_request_headers, {"headers": dict(self.request.headers)})
+
+    async def get(self, request, *args, **kwargs):
         """Overridden to make GET request to certificate microservices to retrieve and list the certificate."""
 
         url_path = self.get_url_path()
-        headers = process_request_headers({"headers": dict(request.headers)})
-        response = CertificateCommunicator().get(
+        headers = await self.get_headers()
+        response = await AsyncCertificateCommunicator().get(
             url_path=url_path,
             token=CERT_ACCESS_KEY,
-            params={"tenant_id": get_current_tenant_idp_id()},
+            params={"tenant_id": await self.run_sync(get_current_tenant_idp_id)},
             headers=headers,
         )
         return Response(response["data"], status=response.get("status_code"))
 
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         """Overridden to make POST request to certificate microservices to create a certificate."""
 
         url_path = self.get_url_path()
-        files = request.FILES
+        files = await self.run_sync(lambda: request.FILES)
         data = None if files else request.data
-        headers = process_request_headers({"headers": dict(request.headers)})
-        response = CertificateCommunicator().post(
+        headers = await self.get_headers()
+        response = await AsyncCertificateCommunicator().post(
             url_path=url_path, token=CERT_ACCESS_KEY, data=data, headers=headers, files=files
         )
         return Response(response["data"], status=response.get("status_code"))
 
-    def put(self, request, *args, **kwargs):
+    async def put(self, request, *args, **kwargs):
         """Overridden to make PUT request to certificate microservices to update the certificate."""
 
         url_path = self.get_url_path()
         data = request.data
-        headers = process_request_headers({"headers": dict(request.headers)})
-        response = CertificateCommunicator().put(url_path=url_path, token=CERT_ACCESS_KEY, data=data, headers=headers)
+        headers = await self.get_headers()
+        response = await AsyncCertificateCommunicator().put(
+            url_path=url_path, token=CERT_ACCESS_KEY, data=data, headers=headers
+        )
         return Response(response["data"], status=response.get("status_code"))
 
-    def delete(self, request, *args, **kwargs):
+    async def delete(self, request, *args, **kwargs):
         """
         Overridden to make DELETE request to certificate microservices and
         soft-delete the certificate by updating `is_deleted` and `is_active`
@@ -57,6 +64,8 @@ class CertificateAPIView(AppAPIView):
         """
 
         url_path = self.get_url_path()
-        headers = process_request_headers({"headers": dict(request.headers)})
-        response = CertificateCommunicator().delete(url_path=url_path, token=CERT_ACCESS_KEY, headers=headers)
+        headers = await self.get_headers()
+        response = await AsyncCertificateCommunicator().delete(
+            url_path=url_path, token=CERT_ACCESS_KEY, headers=headers
+        )
         return Response(response["data"], status=response.get("status_code"))
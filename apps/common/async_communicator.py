@@ -0,0 +1,199 @@
+import asyncio
+import json
+import logging
+import weakref
+from contextlib import asynccontextmanager
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from apps.common.base_communicator import BaseCommunicator
+from apps.common.communicator import Communicator
+from apps.common.helpers import stringify
+
+logger = logging.getLogger(__name__)
+
+# pooled http clients of the lifespan managed event loops | opened on the asgi lifespan startup & closed on its
+# shutdown. Weakly keyed, a loop & its client are not kept alive by the registry.
+ASYNC_HTTP_CLIENTS = weakref.WeakKeyDictionary()
+
+
+def build_async_http_client():
+    """Returns a new `httpx.AsyncClient`, bounded by `ASYNC_GATEWAY`."""
+
+    config = settings.ASYNC_GATEWAY
+    return httpx.AsyncClient(
+        timeout=config["timeout"],
+        limits=httpx.Limits(
+            max_connections=config["max_connections"],
+            max_keepalive_connections=config["max_keepalive_connections"],
+        ),
+    )
+
+
+async def open_async_http_clients():
+    """Opens the pooled client of the running event loop, called on the asgi lifespan startup."""
+
+    ASYNC_HTTP_CLIENTS[asyncio.get_running_loop()] = build_async_http_client()
+
+
+async def close_async_http_clients():
+    """Closes the pooled clients of the process, called on the asgi lifespan shutdown."""
+
+    for loop in list(ASYNC_HTTP_CLIENTS):
+        await ASYNC_HTTP_CLIENTS.pop(loop).aclose()
+
+
+@asynccontextmanager
+async def async_http_client():
+    """
+    Yields the pooled `httpx.AsyncClient` of the running event loop, the connections to the microservices are
+    kept alive & shared by all the in-flight requests of the loop.
+
+    The loops without a lifespan, like the per request loops of the async views served through the `config.wsgi`,
+    get a client of their own which is closed on exit.
+    """
+
+    if (client := ASYNC_HTTP_CLIENTS.get(asyncio.get_running_loop())) is not None and not client.is_closed:
+        yield client
+    else:
+        async with build_async_http_client() as client:
+            yield client
+
+
+async def async_make_http_request(url: str, method="GET", headers=None, data=None, params=None, files=None):
+    """
+    Async variant of `make_http_request`, on the `async_http_client`. Returns the same output, so the
+    callers handle the sync & async responses alike.
+    """
+
+    async with async_http_client() as client:
+        response = await client.request(
+            method=method,
+            url=url,
+            headers=headers or {},
+            content=stringify(data) if data and not files else None,
+            data=data if files else None,
+            files=dict(files.items()) if files else None,
+            params=params or {},
+        )
+    try:
+        response_data = response.json()
+    except json.decoder.JSONDecodeError:
+        response_data = None
+
+    _output = {
+        "data": response_data,
+        "status_code": response.status_code,
+        "reason": None if response_data else response.text,  # fallback for the data
+    }
+    if settings.LOG_DEBUG:
+        logger.debug(f"async_make_http_request: {method} {url} {_output}")
+    return _output
+
+
+class AsyncBaseCommunicator(BaseCommunicator):
+    """
+    Async variant of the `BaseCommunicator`, the requests are awaited on the `async_http_client`.
+    The host & headers are resolved by the concrete communicator, same as the sync one.
+    """
+
+    async def get(self, url_path, token=None, params=None, idp_token=None, host=None, headers=None):
+        """Make get request."""
+
+        return await async_make_http_request(
+            url=f"{self.get_host()}{url_path}",
+            method="GET",
+            params=params,
+            headers=self.get_headers(token=token, idp_token=idp_token, headers=headers, host=host),
+        )
+
+    async def post(
+        self, url_path, data=None, token=None, params=None, idp_token=None, files=None, host=None, headers=None
+    ):
+        """Make post request."""
+
+        headers = self.get_headers(token=token, idp_token=idp_token, headers=headers, host=host)
+        if files:
+            headers.pop("Content-Type", None)
+        return await async_make_http_request(
+            url=f"{self.get_host()}{url_path}",
+            method="POST",
+            data=data,
+            files=files,
+            params=params,
+            headers=headers,
+        )
+
+    async def put(self, url_path, data=None, token=None, params=None, idp_token=None, headers=None, host=None):
+        """Make put request."""
+
+        return await async_make_http_request(
+            url=f"{host or self.get_host()}{url_path}",
+            method="PUT",
+            data=data,
+            params=params,
+            headers=self.get_headers(token=token, idp_token=idp_token, headers=headers, host=host),
+        )
+
+    async def delete(self, url_path, data=None, token=None, params=None, idp_token=None, headers=None, host=None):
+        """Make delete request."""
+
+        return await async_make_http_request(
+            url=f"{host or self.get_host()}{url_path}",
+            method="DELETE",
+            data=data,
+            params=params,
+            headers=self.get_headers(token=token, idp_token=idp_token, headers=headers, host=host),
+        )
+
+
+class AsyncCommunicator(Communicator):
+    """
+    Async variant of the `Communicator`. The service host depends on the current tenant's details, it is
+    resolved in a worker thread as it hits the database.
+    """
+
+    async def get(self, service, url_path, host=None, auth_token=None, params=None, headers=None):
+        """Make get request."""
+
+        return await async_make_http_request(
+            url=f"{await sync_to_async(self.get_host)(service, host)}{url_path}",
+            method="GET",
+            params=params,
+            headers=self.get_headers(auth_token=auth_token, service=service, headers=headers or {}),
+        )
+
+    async def post(self, service, url_path, host=None, data=None, auth_token=None, params=None, headers=None):
+        """Make post request."""
+
+        return await async_make_http_request(
+            url=f"{await sync_to_async(self.get_host)(service, host)}{url_path}",
+            method="POST",
+            data=data,
+            params=params,
+            headers=self.get_headers(auth_token, service=service, headers=headers or {}),
+        )
+
+
+async def async_get_request(service, url_path, host=None, auth_token=None, params=None, headers=None):
+    """Async variant of `get_request`."""
+
+    response = await AsyncCommunicator().get(
+        service=service, host=host, url_path=url_path, auth_token=auth_token, params=params, headers=headers
+    )
+    if response.get("status_code") == 200:
+        return True, response["data"]
+    return False, response["data"]
+
+
+async def async_post_request(service, url_path, host=None, data=None, auth_token=None, params=None):
+    """Async variant of `post_request`."""
+
+    response = await AsyncCommunicator().post(
+        service=service, host=host, url_path=url_path, data=data, auth_token=auth_token, params=params
+    )
+    if response.get("status_code") == 200:
+        return True, response["data"]
+    return False, response
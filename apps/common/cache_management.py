@@ -19,6 +19,11 @@ class CacheManager:
 
         get_redis_connection("default").flushall()
 
+    def clear_tenant_cache(self):
+        """Clears all the cached items of the current tenant."""
+
+        cache.delete(self.db_name)
+
     def set_item_in_cache(self, item, value, timeout=None):
         """
         Set the `value` in cache for the given `item` along with the timeout. If
@@ -1,4 +1,5 @@
 import datetime
+import io
 import json
 import logging
 import random
@@ -6,18 +7,32 @@ import secrets
 import string
 import time
 import typing
+from contextvars import ContextVar
 from datetime import datetime as dt
+from http.cookiejar import DefaultCookiePolicy
 
+import openpyxl
 from dateutil import tz
 from django.conf import settings
+from django.core.files.storage import default_storage
 from django.db import DEFAULT_DB_ALIAS
-from requests import request
+from requests import Session
+from requests.adapters import HTTPAdapter
 
 from apps.tenant_service.middlewares import get_current_db_name, get_current_tenant_details, set_db_for_router
 from config.settings import IDP_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# pooled http session of the process, the connections to the microservices are kept alive & shared by the
+# threads. No cookies are stored, the requests of the users & tenants do not share any state.
+HTTP_SESSION = Session()
+HTTP_SESSION.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+HTTP_SESSION.mount("http://", HTTPAdapter(pool_maxsize=settings.FAN_OUT["pool_size"]))
+HTTP_SESSION.mount("https://", HTTPAdapter(pool_maxsize=settings.FAN_OUT["pool_size"]))
+# timeout in seconds of the outbound http requests of the context, set per call by the `fan_out`
+HTTP_TIMEOUT = ContextVar("http_timeout", default=None)
+
 
 def create_log(data: typing.Any, category: str):
     """
@@ -83,7 +98,8 @@ def make_http_request(url: str, method="GET", headers={}, data={}, params={}, au
     This is similar to triggerSimpleAjax/Axios function. This is defined here just to make things DRY.
     """
 
-    response = request(
+    kwargs.setdefault("timeout", HTTP_TIMEOUT.get())
+    response = HTTP_SESSION.request(
         method=method,
         url=url,
         headers=headers,
@@ -198,6 +214,23 @@ def file_upload_path(instance, filename):
     return f"files/{db_name}/{instance.__class__.__name__}/{filename}".lower()
 
 
+def save_xlsx_to_storage(file_name, header, rows):
+    """
+    Writes the given header & rows to a xlsx file in the default storage & returns the file url. Used for the
+    downloadable error sheets of the bulk upload tasks. The workbook is written in write-only mode.
+    """
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    with io.BytesIO() as excel_file:
+        workbook.save(excel_file)
+        excel_file.seek(0)
+        return default_storage.url(default_storage.save(file_name, excel_file))
+
+
 def custom_capitalize(s):
     """Split and convert values to capitalize case and create the dictionary"""
 
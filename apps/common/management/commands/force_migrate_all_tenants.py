@@ -1,5 +1,6 @@
 from django.apps import apps
 from django.conf import settings
+from django.core.management import call_command
 from django.db import close_old_connections
 
 from apps.common.management.commands.base import AppBaseCommand
@@ -20,3 +21,4 @@ class Command(AppBaseCommand):
             if tracker.tenant.tenancy_name != settings.APP_DEFAULT_TENANT_NAME:
                 close_old_connections()
         self.print_styled_message("** Successfully migrated all the Tenant databases. **", "SUCCESS")
+        call_command("refresh_tenant_template")
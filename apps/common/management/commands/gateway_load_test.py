@@ -0,0 +1,94 @@
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from apps.common.management.commands.base import AppBaseCommand
+
+
+async def load_test(url, headers, requests, concurrency, timeout):
+    """
+    Fires `requests` GET requests at the url, `concurrency` in-flight at a time. Returns the throughput, the
+    latency percentiles in ms & the failures.
+    """
+
+    semaphore, latencies, failures = asyncio.Semaphore(concurrency), [], 0
+
+    async with httpx.AsyncClient(
+        headers=headers, timeout=timeout, limits=httpx.Limits(max_connections=concurrency)
+    ) as client:
+
+        async def send():
+            """Sends a single request & records its latency."""
+
+            nonlocal failures
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.is_error:
+                        failures += 1
+                except httpx.HTTPError:
+                    failures += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(send() for _ in range(requests)))
+        duration = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "throughput": requests / duration,
+        "p50": percentiles[49],
+        "p95": percentiles[94],
+        "p99": percentiles[98],
+        "failures": failures,
+    }
+
+
+class Command(AppBaseCommand):
+    help = (
+        "Load tests a gateway endpoint on the sync(gunicorn `config.wsgi`) & the async(uvicorn `config.asgi`)"
+        " deployments, reporting the throughput & the latencies of both."
+    )
+
+    def add_arguments(self, parser):
+        """Runner options."""
+
+        parser.add_argument("path", type=str, help="Path of the endpoint, like `/api/v1/certificate/list/`.")
+        parser.add_argument("--sync-host", type=str, default="http://localhost:8000", help="Sync deployment.")
+        parser.add_argument("--async-host", type=str, default="http://localhost:8001", help="Async deployment.")
+        parser.add_argument("--requests", type=int, default=1000, help="Requests sent per deployment.")
+        parser.add_argument("--concurrency", type=int, default=200, help="Requests in-flight at a time.")
+        parser.add_argument("--timeout", type=float, default=60, help="Timeout of a request in seconds.")
+        parser.add_argument(
+            "--header", action="append", default=[], help="Request header as `Name: value`, like the auth tokens."
+        )
+
+    def handle(self, *args, **kwargs):
+        """Call all the necessary commands."""
+
+        headers = dict(header.split(":", 1) for header in kwargs["header"])
+        headers = {name.strip(): value.strip() for name, value in headers.items()}
+        results = {}
+        for label, host in (("Sync", kwargs["sync_host"]), ("Async", kwargs["async_host"])):
+            self.print_styled_message(f"\n** Load testing the {label.lower()} deployment {host} **", "SUCCESS")
+            results[label] = result = asyncio.run(
+                load_test(
+                    f"{host.rstrip('/')}{kwargs['path']}",
+                    headers,
+                    kwargs["requests"],
+                    kwargs["concurrency"],
+                    kwargs["timeout"],
+                )
+            )
+            self.print_styled_message(
+                f"   {result['throughput']:.2f} req/s | p50 {result['p50']:.0f}ms | p95 {result['p95']:.0f}ms"
+                f" | p99 {result['p99']:.0f}ms | {result['failures']} failed"
+            )
+        self.print_styled_message(
+            f"\n** Async throughput is {results['Async']['throughput'] / results['Sync']['throughput']:.2f}x of the"
+            f" sync, at {kwargs['concurrency']} concurrent requests. **\n",
+            "SUCCESS",
+        )
@@ -0,0 +1,93 @@
+import time
+
+from django.apps import apps
+from django.db import connections
+
+from apps.common.management.commands.base import AppBaseCommand
+from apps.tenant_service.helpers import run_for_tenants
+
+# non unique indexes never scanned since the statistics reset, the primary keys & unique constraints are excluded.
+UNUSED_INDEXES_SQL = """
+    SELECT stat.relname, stat.indexrelname, pg_relation_size(stat.indexrelid)
+    FROM pg_stat_user_indexes stat
+    JOIN pg_index idx ON idx.indexrelid = stat.indexrelid
+    WHERE stat.idx_scan = 0 AND NOT idx.indisunique AND NOT idx.indisprimary
+    ORDER BY pg_relation_size(stat.indexrelid) DESC
+"""
+# indexes of the tenant along with their validity, a failed `CONCURRENTLY` build leaves an invalid index behind.
+TENANT_INDEXES_SQL = """
+    SELECT cls.relname, idx.indisvalid
+    FROM pg_index idx
+    JOIN pg_class cls ON cls.oid = idx.indexrelid
+    JOIN pg_namespace ns ON ns.oid = cls.relnamespace
+    WHERE ns.nspname = current_schema()
+"""
+
+
+def get_declared_indexes():
+    """Returns the indexes declared on the models' Meta, keyed by the index name."""
+
+    return {
+        index.name: model._meta.db_table
+        for model in apps.get_models()
+        if not model._meta.proxy
+        for index in model._meta.indexes
+    }
+
+
+def get_index_report(database_name, declared_indexes):
+    """
+    Returns the unused, missing & invalid indexes of the tenant database. Missing are the declared indexes not
+    present in the database, invalid are the declared indexes whose `CONCURRENTLY` build failed.
+    """
+
+    with connections[database_name].cursor() as cursor:
+        cursor.execute(UNUSED_INDEXES_SQL)
+        unused = [{"table": table, "index": index, "size": size} for table, index, size in cursor.fetchall()]
+        cursor.execute(TENANT_INDEXES_SQL)
+        existing = dict(cursor.fetchall())
+    return {
+        "unused": unused,
+        "missing": sorted(name for name in declared_indexes if name not in existing),
+        "invalid": sorted(name for name in declared_indexes if existing.get(name) is False),
+    }
+
+
+class Command(AppBaseCommand):
+    help = "Reports the unused, missing & invalid indexes of all the tenants from `pg_stat_user_indexes`."
+
+    def add_arguments(self, parser):
+        """Runner options."""
+
+        parser.add_argument("--concurrency", type=int, default=8, help="Number of tenants inspected at a time.")
+
+    def handle(self, *args, **kwargs):
+        """Call all the necessary commands."""
+
+        DatabaseRouter = apps.get_model("tenant_service", "DatabaseRouter")
+
+        declared_indexes = get_declared_indexes()
+        start = time.monotonic()
+        results = run_for_tenants(
+            DatabaseRouter.objects.all(),
+            lambda router: get_index_report(router.database_name, declared_indexes),
+            concurrency=kwargs["concurrency"],
+        )
+        for router, report, error in results:
+            if error:
+                self.print_styled_message(f"** Failed to inspect the indexes of {router.database_name}: {error} **")
+                continue
+            self.print_styled_message(f"\n** {router.database_name} **", "SUCCESS")
+            for name in report["missing"]:
+                self.print_styled_message(f"   Missing: {name} on {declared_indexes[name]}")
+            for name in report["invalid"]:
+                self.print_styled_message(f"   Invalid: {name} on {declared_indexes[name]}, drop & re-create it.")
+            for index in report["unused"]:
+                self.print_styled_message(
+                    f"   Unused: {index['index']} on {index['table']} ({index['size'] / 1024 / 1024:.2f} MB)",
+                    "WARNING",
+                )
+        self.print_styled_message(
+            f"\n** Finished Inspecting Indexes of {len(results)} DBs in {time.monotonic() - start:.2f}s. **\n",
+            "SUCCESS",
+        )
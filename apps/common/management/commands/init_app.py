@@ -58,6 +58,7 @@ class Command(AppBaseCommand):
                 if tracker.tenant.tenancy_name != settings.APP_DEFAULT_TENANT_NAME:
                     close_old_connections()
             self.print_styled_message("** Successfully migrated all the Tenant databases. **", "SUCCESS")
+            call_command("refresh_tenant_template")
         else:
             self.print_styled_message("** No Migrations Found. Skipping Migrations for Tenants. **", "SUCCESS")
 
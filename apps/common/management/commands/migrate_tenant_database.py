@@ -0,0 +1,31 @@
+from django.apps import apps
+from django.core.management import call_command
+
+from apps.common.management.commands.base import AppBaseCommand
+
+
+class Command(AppBaseCommand):
+    help = "Run migrations on a single `Tenant` database. Used by `migrate_tenants` to migrate in parallel."
+
+    def add_arguments(self, parser):
+        """Tenant database name & the optional target migration."""
+
+        parser.add_argument("database_name", type=str)
+        parser.add_argument("app_label", nargs="?", type=str, default=None)
+        parser.add_argument("migration_name", nargs="?", type=str, default=None)
+
+    def handle(self, *args, **kwargs):
+        """Call all the necessary commands."""
+
+        DatabaseRouter = apps.get_model("tenant_service", "DatabaseRouter")
+
+        tracker = DatabaseRouter.objects.get(database_name=kwargs["database_name"])
+        if kwargs["app_label"]:
+            target = [label for label in (kwargs["app_label"], kwargs["migration_name"]) if label]
+            self.print_styled_message(f"\n** Migrating {' '.join(target)} for {tracker.database_name}. **")
+            tracker.add_db_connection()
+            call_command("migrate", *target, database=tracker.database_name, verbosity=0)
+        else:
+            self.print_styled_message(f"\n** Running migrations for {tracker.database_name}. **")
+            tracker.auto_setup_database()
+        self.print_styled_message(f"** Successfully migrated {tracker.database_name}. **", "SUCCESS")
@@ -0,0 +1,156 @@
+import subprocess
+import sys
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+
+from apps.common.management.commands.base import AppBaseCommand
+from apps.learning.config import BaseUploadStatusChoices
+from apps.tenant_service.helpers import run_for_tenants
+
+
+class Command(AppBaseCommand):
+    """
+    Parallel & resumable version of `force_migrate_all_tenants`. Every tenant is migrated in its own
+    `migrate_tenant_database` subprocess, `concurrency` of them at a time. The per tenant state is recorded in
+    `TenantMigrationLog`, so a failed run can be resumed with `--resume`.
+
+    Usage -
+        python manage.py migrate_tenants --concurrency 8 --canary 2
+        python manage.py migrate_tenants --app learning --migration 0042_xxx
+        python manage.py migrate_tenants --resume
+    """
+
+    help = "Run migrations on all `Tenants` in parallel."
+
+    def add_arguments(self, parser):
+        """Runner options."""
+
+        parser.add_argument("--concurrency", type=int, default=4, help="Number of tenants migrated at a time.")
+        parser.add_argument("--canary", type=int, default=0, help="Number of tenants migrated before the rest.")
+        parser.add_argument("--resume", action="store_true", help="Resume the failed & pending tenants of last run.")
+        parser.add_argument("--app", type=str, default=None, help="App label of the target migration.")
+        parser.add_argument("--migration", type=str, default=None, help="Name of the target migration.")
+
+    def get_run(self, **kwargs):
+        """Returns the run to be processed, the last run when resuming or a new one along with its logs."""
+
+        TenantMigrationRun = apps.get_model("tenant_service", "TenantMigrationRun")
+        TenantMigrationLog = apps.get_model("tenant_service", "TenantMigrationLog")
+        DatabaseRouter = apps.get_model("tenant_service", "DatabaseRouter")
+
+        if kwargs["resume"]:
+            run = TenantMigrationRun.objects.exclude(status=BaseUploadStatusChoices.completed).first()
+            if run:
+                run.concurrency = kwargs["concurrency"]
+                run.save()
+            return run
+
+        run = TenantMigrationRun.objects.create(
+            app_label=kwargs["app"],
+            migration_name=kwargs["migration"],
+            concurrency=kwargs["concurrency"],
+            canary_count=kwargs["canary"],
+        )
+        TenantMigrationLog.objects.bulk_create(
+            [
+                TenantMigrationLog(run=run, router_id=router_id, database_name=database_name)
+                for router_id, database_name in DatabaseRouter.objects.order_by("-is_default", "id").values_list(
+                    "id", "database_name"
+                )
+            ]
+        )
+        return run
+
+    def report(self, log):
+        """Prints the state of the migrated tenant."""
+
+        if log.status == BaseUploadStatusChoices.completed:
+            self.print_styled_message(f"** Migrated {log.database_name} in {log.duration:.2f}s. **", "SUCCESS")
+        else:
+            self.print_styled_message(f"** Failed to migrate {log.database_name}. **\n{log.error}")
+
+    def migrate_tenant(self, run, log):
+        """
+        Migrates the tenant database of the log in a subprocess & records its state. Runs in a worker thread of
+        the `run_for_tenants`, the log is saved on the default database.
+        """
+
+        command = [sys.executable, str(settings.BASE_DIR / "manage.py"), "migrate_tenant_database", log.database_name]
+        if run.app_label:
+            command += [run.app_label, run.migration_name] if run.migration_name else [run.app_label]
+
+        log.status, log.started_at, log.error = BaseUploadStatusChoices.in_progress, timezone.now(), None
+        log.save(using=DEFAULT_DB_ALIAS)
+        start = time.monotonic()
+        result = subprocess.run(command, capture_output=True, text=True)
+        log.duration = time.monotonic() - start
+        log.finished_at = timezone.now()
+        if result.returncode == 0:
+            log.status = BaseUploadStatusChoices.completed
+        else:
+            log.status = BaseUploadStatusChoices.failed
+            log.error = result.stderr or result.stdout
+        log.save(using=DEFAULT_DB_ALIAS)
+        self.report(log)
+        return log
+
+    def migrate_tenants(self, run, logs):
+        """Migrates the given tenants in parallel through the `run_for_tenants`. Returns the failed logs."""
+
+        logs_by_router = {log.router_id: log for log in logs}
+        for router, _, error in run_for_tenants(
+            [log.router for log in logs],
+            lambda router: self.migrate_tenant(run, logs_by_router[router.id]),
+            concurrency=run.concurrency,
+        ):
+            if error:
+                log = logs_by_router[router.id]
+                log.status, log.error, log.finished_at = BaseUploadStatusChoices.failed, str(error), timezone.now()
+                log.save(using=DEFAULT_DB_ALIAS)
+                self.report(log)
+        return [log for log in logs if log.status == BaseUploadStatusChoices.failed]
+
+    def handle(self, *args, **kwargs):
+        """Call all the necessary commands."""
+
+        run = self.get_run(**kwargs)
+        if not run:
+            self.print_styled_message("\n** No failed or pending run to resume. **", "SUCCESS")
+            return
+
+        logs = run.related_tenant_migration_logs.exclude(status=BaseUploadStatusChoices.completed)
+        logs = list(logs.select_related("router"))
+        self.print_styled_message(f"\n** Running migrations for {len(logs)} Tenants, {run.concurrency} at a time. **")
+        run.status, run.started_at = BaseUploadStatusChoices.in_progress, run.started_at or timezone.now()
+        run.save()
+
+        start = time.monotonic()
+        canary_logs, logs = logs[: run.canary_count], logs[run.canary_count :]
+        failed_logs = self.migrate_tenants(run, canary_logs)
+        if failed_logs:
+            self.print_styled_message("\n** Canary tenants failed, the rest of the tenants are not migrated. **")
+        else:
+            failed_logs = self.migrate_tenants(run, logs)
+
+        run.duration += time.monotonic() - start
+        run.sequential_duration = sum(run.related_tenant_migration_logs.values_list("duration", flat=True))
+        run.finished_at = timezone.now()
+        run.status = BaseUploadStatusChoices.failed if failed_logs else BaseUploadStatusChoices.completed
+        run.save()
+
+        self.print_styled_message(
+            f"\n** Wall time {run.duration:.2f}s against {run.sequential_duration:.2f}s sequentially "
+            f"({run.sequential_duration / run.duration if run.duration else 0:.1f}x). **",
+            "SUCCESS",
+        )
+        if failed_logs:
+            self.print_styled_message(f"** {len(failed_logs)} Tenants failed, run with `--resume` to retry. **")
+        else:
+            self.print_styled_message("** Successfully migrated all the Tenant databases. **", "SUCCESS")
+            if not run.app_label:
+                call_command("refresh_tenant_template")
@@ -1,11 +1,19 @@
+import time
+
 from django.apps import apps
 
 from apps.common.management.commands.base import AppBaseCommand
+from apps.tenant_service.helpers import run_for_tenants
 
 
 class Command(AppBaseCommand):
     help = "Populates the hardcoded policies to all the tenants."
 
+    def add_arguments(self, parser):
+        """Runner options."""
+
+        parser.add_argument("--concurrency", type=int, default=8, help="Number of tenants populated at a time.")
+
     def handle(self, *args, **kwargs):
         """Call all the necessary commands."""
 
@@ -16,18 +24,23 @@ class Command(AppBaseCommand):
 
         if tenant_idp_id:
             self.print_styled_message(f"\n** Got Tenant IDP ID {tenant_idp_id}. **")
-            tracker = DatabaseRouter.objects.get(tenant__idp_id=tenant_idp_id)
-            self.populate_policies_to_tenant(tracker, PolicyCategory)
+            trackers = DatabaseRouter.objects.filter(tenant__idp_id=tenant_idp_id)
         else:
             self.print_styled_message("\n** Executing for all DBs. **")
-            for tracker in DatabaseRouter.objects.all():
-                self.populate_policies_to_tenant(tracker, PolicyCategory)
-        self.print_styled_message("** Finished Populating Policies. **\n", "SUCCESS")
-
-    def populate_policies_to_tenant(self, tracker, PolicyCategory):
-        """Populate the policies to the given tenant's db name."""
-
-        self.print_styled_message(f"\n** Populating policies for {tracker.database_name}. **")
-        tracker.add_db_connection()
-        PolicyCategory.populate_policies(tracker.database_name)
-        self.print_styled_message(f"\n** Finished Populating Policies for {tracker.database_name}. **\n", "SUCCESS")
+            trackers = DatabaseRouter.objects.all()
+
+        start = time.monotonic()
+        results = run_for_tenants(
+            trackers,
+            lambda tracker: PolicyCategory.populate_policies(tracker.database_name),
+            concurrency=kwargs["concurrency"],
+        )
+        for tracker, result, error in results:
+            if error:
+                self.print_styled_message(f"** Failed to populate policies for {tracker.database_name}: {error} **")
+            else:
+                self.print_styled_message(f"** Populated policies for {tracker.database_name}: {result} **", "SUCCESS")
+        self.print_styled_message(
+            f"** Finished Populating Policies for {len(results)} DBs in {time.monotonic() - start:.2f}s. **\n",
+            "SUCCESS",
+        )
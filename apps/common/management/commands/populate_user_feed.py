@@ -0,0 +1,78 @@
+from django.apps import apps
+from django.db.models import OuterRef, Subquery
+
+from apps.common.management.commands.base import AppBaseCommand
+
+
+class Command(AppBaseCommand):
+    help = "Backfill the materialized user feed from the existing enrollments & post likes of the tenants."
+
+    def add_arguments(self, parser):
+        """Optional tenant database name, all the tenants are backfilled when not given."""
+
+        parser.add_argument("--db-name", type=str, default=None)
+
+    def handle(self, *args, **kwargs):
+        """Call all the necessary commands."""
+
+        DatabaseRouter = apps.get_model("tenant_service", "DatabaseRouter")
+
+        routers = DatabaseRouter.objects.all()
+        if kwargs["db_name"]:
+            routers = routers.filter(database_name=kwargs["db_name"])
+        for router in routers:
+            self.print_styled_message(f"\n** Populating User Feed for {router.database_name}. **")
+            count = self.populate_user_feed(router.database_name)
+            self.print_styled_message(f"\n** Populated {count} feed activities for {router.database_name}. **")
+
+    @staticmethod
+    def populate_user_feed(db_name):
+        """Fan out the existing activities of the tenant, the feed of the tenant is rebuilt from scratch."""
+
+        from apps.forum.models import PostLike
+        from apps.my_learning.config import FeedActivityTypeChoices, LearningStatusChoices
+        from apps.my_learning.models import Enrollment, UserFeedActivity
+        from apps.my_learning.tasks import UserFeedFanOutTask
+
+        task = UserFeedFanOutTask()
+        task.switch_db(db_name)
+        UserFeedActivity.objects.all().delete()
+        activities = []
+        for enrollment_id, user_id, learning_status in Enrollment.objects.filter(
+            user__isnull=False, is_enrolled=True
+        ).values_list("id", "user_id", "learning_status"):
+            activities.append(
+                {
+                    "actor_id": user_id,
+                    "activity_type": FeedActivityTypeChoices.enrolled,
+                    "enrollment_id": enrollment_id,
+                }
+            )
+            if learning_status == LearningStatusChoices.completed:
+                activities.append(
+                    {
+                        "actor_id": user_id,
+                        "activity_type": FeedActivityTypeChoices.completed,
+                        "enrollment_id": enrollment_id,
+                    }
+                )
+        for post_like_id, user_id in PostLike.objects.filter(is_liked=True).values_list("id", "created_by_id"):
+            activities.append(
+                {
+                    "actor_id": user_id,
+                    "activity_type": FeedActivityTypeChoices.post_liked,
+                    "post_like_id": post_like_id,
+                }
+            )
+        count = task.run(activities=activities, db_name=db_name)
+
+        # keep the original datetime of the activities, used to order & paginate the feed
+        for activity_type, model, field, datetime_field in [
+            (FeedActivityTypeChoices.enrolled, Enrollment, "enrollment_id", "created_at"),
+            (FeedActivityTypeChoices.completed, Enrollment, "enrollment_id", "modified_at"),
+            (FeedActivityTypeChoices.post_liked, PostLike, "post_like_id", "created_at"),
+        ]:
+            UserFeedActivity.objects.filter(activity_type=activity_type).update(
+                created_at=Subquery(model.objects.filter(id=OuterRef(field)).values(datetime_field)[:1])
+            )
+        return count
@@ -1,11 +1,19 @@
+import time
+
 from django.apps import apps
 
 from apps.common.management.commands.base import AppBaseCommand
+from apps.tenant_service.helpers import run_for_tenants
 
 
 class Command(AppBaseCommand):
     help = "Populates the default UserRoles to all the tenants."
 
+    def add_arguments(self, parser):
+        """Runner options."""
+
+        parser.add_argument("--concurrency", type=int, default=8, help="Number of tenants populated at a time.")
+
     def handle(self, *args, **kwargs):
         """Call all the necessary commands."""
 
@@ -16,17 +24,23 @@ class Command(AppBaseCommand):
 
         if tenant_idp_id:
             self.print_styled_message(f"\n** Got Tenant IDP ID {tenant_idp_id}. **\n")
-            tracker = DatabaseRouter.objects.get(tenant__idp_id=tenant_idp_id)
-            self.populate_user_roles_to_tenant(tracker, UserRole)
+            trackers = DatabaseRouter.objects.filter(tenant__idp_id=tenant_idp_id)
         else:
             self.print_styled_message("\n** Executing for all DBs. **\n")
-            for tracker in DatabaseRouter.objects.all():
-                self.populate_user_roles_to_tenant(tracker, UserRole)
-        self.print_styled_message("\n** Finished Populating UserRoles. **\n", "SUCCESS")
-
-    def populate_user_roles_to_tenant(self, tracker, UserRole):
-        """Populate the User Roles to the given tenant's db name."""
-
-        self.print_styled_message(f"\n** Populating UserRole for {tracker.database_name}. **")
-        tracker.add_db_connection()
-        UserRole.populate_default_user_roles(tracker.database_name)
+            trackers = DatabaseRouter.objects.all()
+
+        start = time.monotonic()
+        results = run_for_tenants(
+            trackers,
+            lambda tracker: UserRole.populate_default_user_roles(tracker.database_name),
+            concurrency=kwargs["concurrency"],
+        )
+        for tracker, _, error in results:
+            if error:
+                self.print_styled_message(f"** Failed to populate UserRole for {tracker.database_name}: {error} **")
+            else:
+                self.print_styled_message(f"** Populated UserRole for {tracker.database_name}. **", "SUCCESS")
+        self.print_styled_message(
+            f"\n** Finished Populating UserRoles for {len(results)} DBs in {time.monotonic() - start:.2f}s. **\n",
+            "SUCCESS",
+        )
@@ -0,0 +1,18 @@
+from django.apps import apps
+
+from apps.common.management.commands.base import AppBaseCommand
+
+
+class Command(AppBaseCommand):
+    help = "Migrates & seeds the template database, the new `Tenant` databases are copied from it."
+
+    def handle(self, *args, **kwargs):
+        """Call all the necessary commands."""
+
+        DatabaseRouter = apps.get_model("tenant_service", "DatabaseRouter")
+
+        self.print_styled_message("\n** Refreshing the Tenant template database... **")
+        if template := DatabaseRouter.refresh_template_database():
+            self.print_styled_message(f"** Successfully refreshed {template.database_name}. **", "SUCCESS")
+        else:
+            self.print_styled_message("** Tenant template database is disabled. Skipping... **", "SUCCESS")
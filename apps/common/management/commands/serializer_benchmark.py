@@ -0,0 +1,69 @@
+import time
+
+from django.utils.module_loading import import_string
+
+from apps.common.management.commands.base import AppBaseCommand
+from apps.tenant_service.middlewares import tenant_context
+
+
+def clear_serializer_caches(serializer_class):
+    """Clears the per class metadata of the serializer, the next instance builds it again."""
+
+    serializer_class._custom_error_messages = {}
+    if hasattr(serializer_class, "_meta_initial_config"):
+        serializer_class._dynamic_render_config = None
+        serializer_class._meta_initial_config = {}
+
+
+def benchmark(function, iterations, setup=None):
+    """Returns the mean time in ms of the function over the iterations, `setup` is run untimed before each."""
+
+    duration = 0
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        duration += time.perf_counter() - start
+    return duration * 1000 / iterations
+
+
+class Command(AppBaseCommand):
+    help = (
+        "Micro-benchmarks the instantiation & the list rendering of a serializer, with the per class metadata"
+        " cleared(cold) & cached(warm)."
+    )
+
+    def add_arguments(self, parser):
+        """Runner options."""
+
+        parser.add_argument("serializer", type=str, help="Dotted path, like `apps.learning.serializers.v1....`.")
+        parser.add_argument("db_name", type=str, help="Tenant database of the rendered rows.")
+        parser.add_argument("--rows", type=int, default=100, help="Rows rendered by the list serializer.")
+        parser.add_argument("--iterations", type=int, default=50, help="Runs of every measurement.")
+
+    def handle(self, *args, **kwargs):
+        """Call all the necessary commands."""
+
+        serializer_class, iterations = import_string(kwargs["serializer"]), kwargs["iterations"]
+        with tenant_context(kwargs["db_name"]):
+            rows = list(serializer_class.Meta.model.objects.all()[: kwargs["rows"]])
+            if not rows:
+                self.print_styled_message(f"No {serializer_class.Meta.model.__name__} rows on {kwargs['db_name']}.")
+                return
+
+            measurements = {
+                "Instantiation": lambda: serializer_class(rows[0]).fields,
+                f"List rendering of {len(rows)} rows": lambda: serializer_class(rows, many=True).data,
+            }
+            if hasattr(serializer_class, "get_meta_for_update"):
+                measurements["Meta render config & initial"] = lambda: (
+                    serializer_class(rows[0]).get_dynamic_render_config(),
+                    serializer_class(rows[0]).get_meta_initial(),
+                )
+
+            for label, function in measurements.items():
+                cold = benchmark(function, iterations, setup=lambda: clear_serializer_caches(serializer_class))
+                warm = benchmark(function, iterations)
+                self.print_styled_message(f"\n** {label} **", "SUCCESS")
+                self.print_styled_message(f"   Cold: {cold:.3f}ms | Warm: {warm:.3f}ms | {cold / warm:.2f}x")
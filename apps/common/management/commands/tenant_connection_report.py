@@ -0,0 +1,58 @@
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apps.common.management.commands.base import AppBaseCommand
+from apps.tenant_service.registry import TENANT_CONNECTIONS
+
+# client connections open on the database server, grouped by the database.
+SERVER_CONNECTIONS_SQL = """
+    SELECT datname, count(*)
+    FROM pg_stat_activity
+    WHERE backend_type = 'client backend' AND datname IS NOT NULL
+    GROUP BY datname
+    ORDER BY count(*) DESC
+"""
+
+
+class Command(AppBaseCommand):
+    help = (
+        "Reports the tenant aliases registered by the lazy `TENANT_CONNECTIONS` registry, the connections upper"
+        " bound of the workers & the connections open on the database server."
+    )
+
+    def add_arguments(self, parser):
+        """Runner options."""
+
+        parser.add_argument("--workers", type=int, default=1, help="Worker threads across the gunicorn & celery.")
+        parser.add_argument("--top", type=int, default=10, help="Databases listed with the most connections.")
+
+    def handle(self, *args, **kwargs):
+        """Call all the necessary commands."""
+
+        DatabaseRouter = apps.get_model("tenant_service", "DatabaseRouter")
+
+        tenants = DatabaseRouter.objects.using(DEFAULT_DB_ALIAS).count()
+        stats, workers = TENANT_CONNECTIONS.get_stats(), kwargs["workers"]
+        self.print_styled_message("\n** Registry **", "SUCCESS")
+        self.print_styled_message(
+            f"   {stats['registered']} aliases registered for {stats['tenants']} of {tenants} tenants on startup,"
+            " the rest are registered on their first use."
+        )
+
+        self.print_styled_message("\n** Connections upper bound **", "SUCCESS")
+        self.print_styled_message(
+            f"   {workers * (min(stats['max_open'], tenants) + 1)} for {workers} worker threads,"
+            f" at most {stats['max_open']} tenant connections each."
+        )
+
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute(SERVER_CONNECTIONS_SQL)
+            server_connections = cursor.fetchall()
+        self.print_styled_message(
+            f"\n** {sum(count for _, count in server_connections)} connections open on the server **", "SUCCESS"
+        )
+        for database_name, count in server_connections[: kwargs["top"]]:
+            self.print_styled_message(f"   {database_name}: {count}")
+        if settings.MULTI_TENANT["APP_TRANSACTION_POOLING"]:
+            self.print_styled_message("\n** Transaction pooling enabled, server side cursors are disabled. **")
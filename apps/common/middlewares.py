@@ -1,15 +1,63 @@
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from apps.common.query_budget import QueryInspector
+
+
 class DisableCSRFMiddleware:
     """
     Disables the applications csrf checking. Used in the MIDDLEWARES in the settings.py.
 
     This is implemented because at some cases when the user takes long time to submit
     forms, it causes errors. So since that use case is necessary in the app
-    CSRF token is removed.
+    CSRF token is removed. Sync & async capable.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
         setattr(request, "_dont_enforce_csrf_checks", True)  # noqa
         return self.get_response(request)
+
+
+class QueryBudgetMiddleware:
+    """
+    Opt-in middleware that counts the queries of a request & flags the N+1 patterns. Appended to the
+    MIDDLEWARES in the settings.py when `QUERY_BUDGET["enabled"]` is set.
+
+    A sample of the requests(`sample_rate`) is inspected, the violations are logged. Every request is inspected
+    & the violations raise `QueryBudgetExceeded` when `raise_on_violation` is set, used in the tests. The budget
+    of the request is the `query_budget` declared on the view class.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = settings.QUERY_BUDGET
+        if not config["raise_on_violation"] and random.random() >= config["sample_rate"]:
+            return self.get_response(request)
+
+        with QueryInspector(config["n_plus_one_threshold"]) as inspector:
+            response = self.get_response(request)
+        inspector.report(
+            f"{request.method} {getattr(request, '_query_budget_view', request.path)}",
+            budget=getattr(request, "_query_budget", None),
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Tracks the budget declared on the view class of the request."""
+
+        if view_class := getattr(view_func, "cls", None):
+            request._query_budget = getattr(view_class, "query_budget", None)  # noqa
+            request._query_budget_view = view_class.__name__  # noqa
+        return None
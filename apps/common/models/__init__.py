@@ -16,5 +16,6 @@ from .base import (
     NameModel,
     SoftDeleteModel,
     StatusModel,
+    get_alive_index,
 )
 from .trackers import Log
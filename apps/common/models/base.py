@@ -28,6 +28,15 @@ COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG = {  # user for Form/app based stuff
 }
 
 
+def get_alive_index(name, fields=("-created_at",)):
+    """
+    Returns a partial index of the given fields over the non soft deleted rows(`WHERE is_deleted = false`).
+    Serves the `.alive()` & `.unarchived()` lookups along with the default `-created_at` ordering.
+    """
+
+    return models.Index(fields=list(fields), condition=models.Q(is_deleted=False), name=name)
+
+
 class BaseModel(models.Model):
     """
     Contains the last modified and the created fields, basically
@@ -1,4 +1,30 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from datetime import datetime
+
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Querysets up to this size are counted exactly, the bigger ones are estimated from the query planner.
+EXACT_COUNT_LIMIT = 1000
+
+
+def get_estimated_count(queryset, exact_count_limit=EXACT_COUNT_LIMIT):
+    """
+    Returns the count of the queryset without a full `COUNT(*)` scan. The count is exact upto `exact_count_limit`,
+    above that the row estimate of the postgres planner(`EXPLAIN`, based on the `pg_class` statistics) is used.
+    """
+
+    queryset = queryset.order_by()
+    count = queryset[: exact_count_limit + 1].count()
+    if count <= exact_count_limit:
+        return count
+    plan = json.loads(queryset.explain(format="json"))
+    return max(int(plan[0]["Plan"]["Plan Rows"]), count)
 
 
 class AppPagination(PageNumberPagination):
@@ -20,3 +46,162 @@ class TempPagination(AppPagination):
     # TODO: Change the class name.
 
     page_size = 50
+
+
+class EstimatedCountPaginator(DjangoPaginator):
+    """
+    Paginator which uses the estimated count of the queryset. The pages before the estimated last page are
+    served on the estimate, the exact count is taken for the estimated last page & beyond. So an existing page
+    is never a 404 nor cut short when the planner under-estimates.
+    """
+
+    @cached_property
+    def count(self):
+        """Overridden to avoid the full `COUNT(*)` scan on the big querysets."""
+
+        return get_estimated_count(self.object_list)
+
+    def validate_number(self, number):
+        """Overridden to fall back to the exact count for the pages at & past the estimated last page."""
+
+        try:
+            is_last_page = int(number) >= self.num_pages
+        except (TypeError, ValueError):
+            is_last_page = False
+        if is_last_page and self.count > EXACT_COUNT_LIMIT:
+            self.count = self.object_list.count()
+            self.__dict__.pop("num_pages", None)
+        return super().validate_number(number)
+
+
+class EstimatedCountPagination(AppPagination):
+    """
+    Page number pagination for the big & heavily joined lists where the exact count is too expensive.
+    The response is same as `AppPagination`, only the `count` is estimated.
+    """
+
+    django_paginator_class = EstimatedCountPaginator
+
+
+class AppCursorPagination(BasePagination):
+    """
+    Keyset pagination on `(created_at, id)` for the deep lists. Every page is an indexed range read, there is
+    no `COUNT(*)` & `OFFSET` scan unlike `AppPagination`. The list is always ordered by `-created_at, -id`.
+
+    The response keeps the `count, next, previous & results` shape of `AppPagination`. The `count` is the
+    estimated count when `estimate_count` is set & `None` otherwise.
+    """
+
+    page_size = 24
+    page_size_query_param = "page-size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    direction_query_param = "direction"
+    estimate_count = False
+
+    def get_page_size(self, request):
+        """Returns the page size from the query params, limited to the `max_page_size`."""
+
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Returns the page of the queryset after the cursor, or before it for the previous page."""
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = decode_cursor(request.query_params.get(self.cursor_query_param))
+        is_reverse = bool(position) and request.query_params.get(self.direction_query_param) == "previous"
+        self.count = get_estimated_count(queryset) if self.estimate_count else None
+
+        if position:
+            created_at, instance_id = position
+            lookup = "gt" if is_reverse else "lt"
+            queryset = queryset.filter(
+                Q(**{f"created_at__{lookup}": created_at}) | Q(created_at=created_at, **{f"id__{lookup}": instance_id})
+            )
+        ordering = ["created_at", "id"] if is_reverse else ["-created_at", "-id"]
+        results = list(queryset.order_by(*ordering)[: page_size + 1])
+        has_more = len(results) > page_size
+        self.page = results[:page_size]
+        if is_reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, bool(position)
+        return self.page
+
+    def get_link(self, instance, direction=None):
+        """Returns the url of the page after the given instance, or before it for the `previous` direction."""
+
+        url = replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            encode_cursor(instance.created_at, instance.id),
+        )
+        if direction:
+            return replace_query_param(url, self.direction_query_param, direction)
+        return remove_query_param(url, self.direction_query_param)
+
+    def get_next_link(self):
+        """Returns the url of the next page."""
+
+        return self.get_link(self.page[-1]) if self.has_next and self.page else None
+
+    def get_previous_link(self):
+        """Returns the url of the previous page."""
+
+        return self.get_link(self.page[0], direction="previous") if self.has_previous and self.page else None
+
+    def get_paginated_response(self, data):
+        """Returns the page in the same shape as `AppPagination`."""
+
+        return Response(
+            {
+                "count": self.count,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+
+def encode_cursor(created_at, instance_id):
+    """Returns the opaque cursor for the given `(created_at, id)` position, used for keyset pagination."""
+
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{instance_id}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Returns the `(created_at, id)` position of the given cursor. Invalid cursors are treated as no cursor."""
+
+    if not cursor:
+        return None
+    try:
+        created_at, instance_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(instance_id)
+    except ValueError:
+        return None
+
+
+def encode_composite_cursor(positions):
+    """
+    Returns the opaque cursor for the given `{source: (created_at, id)}` positions, used for keyset pagination
+    merging several sources(tables). The ids of a source are only compared with the ids of the same source.
+    """
+
+    return ".".join(f"{source}~{encode_cursor(*position)}" for source, position in positions.items() if position)
+
+
+def decode_composite_cursor(cursor):
+    """Returns the `{source: (created_at, id)}` positions of the given cursor. Invalid parts are skipped."""
+
+    positions = {}
+    for part in (cursor or "").split("."):
+        source, _, source_cursor = part.partition("~")
+        if position := decode_cursor(source_cursor):
+            positions[source] = position
+    return positions
@@ -1,37 +1,65 @@
 from rest_framework import permissions
 
-# from apps.access_control.models import RolePermission
+from apps.access_control.config import RoleTypeChoices
+
+# index of the permission in the compiled `(create, view, edit, delete)` flags of a policy.
+CREATE, VIEW, EDIT, DELETE = range(4)
 
 
 class PolicyPermission(permissions.BasePermission):
-    """Custom Policy based permission."""
+    """
+    Custom Policy based permission.
+
+    The permissions of the manager roles are checked against the compiled role permissions of the tenant
+    (`RolePermission.get_compiled_permissions`), cached per tenant & memoized per request. Superusers, users
+    without roles & the non manager roles are not restricted, same for the views without a `policy_slug`.
+    The manager roles without any role permissions, like the default ones of `populate_default_user_roles`,
+    are not restricted either until their permissions are configured.
+    """
+
+    action_permissions = {
+        "create": CREATE,
+        "list": VIEW,
+        "retrieve": VIEW,
+        "update": EDIT,
+        "partial_update": EDIT,
+        "destroy": DELETE,
+    }
+    method_permissions = {
+        "POST": CREATE,
+        "GET": VIEW,
+        "HEAD": VIEW,
+        "PUT": EDIT,
+        "PATCH": EDIT,
+        "DELETE": DELETE,
+    }
+
+    def get_permission_index(self, request, view):
+        """Returns the required permission of the request, from the view action or else the request method."""
+
+        action = getattr(view, "action", None)
+        if action in self.action_permissions:
+            return self.action_permissions[action]
+        return self.method_permissions.get(request.method)
 
     def has_permission(self, request, view):
         """Get the policy slug from the view and validate permissions."""
 
-        # policy_slug = view.policy_slug
+        from apps.access_control.models import RolePermission
+
         user = request.user
         if user.is_anonymous:
             return False
-        return True
-        # if user.is_superuser or not user.roles.exists():
-        #     return True
-        # if not user.current_role or user.current_role.role_type != "manager":
-        #     return True
-        #
-        # try:
-        #     role_permission = user.role.related_role_permissions.get(policy__slug=policy_slug)
-        #     if view.action == "create":
-        #         return role_permission.is_creatable
-        #     elif view.action == "update":
-        #         return role_permission.is_editable
-        #     elif view.action in ["retrieve", "list"]:
-        #         return role_permission.is_viewable
-        #     elif view.action == "destroy":
-        #         return role_permission.is_deletable
-        # except RolePermission.DoesNotExist:
-        #     pass
-        # return False
+        policy_slug = getattr(view, "policy_slug", None)
+        if not policy_slug or user.is_superuser or user.get_active_role() != RoleTypeChoices.manager:
+            return True
+        if (permission_index := self.get_permission_index(request, view)) is None:
+            return True
+
+        role_permissions = RolePermission.get_compiled_permissions().get(user.current_role_id)
+        if role_permissions is None:
+            return True
+        return bool(policy_slug in role_permissions and role_permissions[policy_slug][permission_index])
 
 
 class ExtTenantAPIAccessPermission(permissions.BasePermission):
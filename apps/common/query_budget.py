@@ -0,0 +1,152 @@
+import logging
+import re
+import sys
+import threading
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+# patterns used to reduce a sql to its shape, the repeated shapes of a request are the N+1 candidates.
+SQL_NORMALIZE_PATTERNS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)"), "(?)"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a request exceeds its query budget or runs a N+1, when `raise_on_violation` is enabled."""
+
+
+def normalize_sql(sql):
+    """Returns the shape of the given sql, the literals & the placeholder lists are collapsed."""
+
+    for pattern, replacement in SQL_NORMALIZE_PATTERNS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def get_serializer_field():
+    """
+    Returns the `<Serializer>.<field>` being represented by the current stack, `None` when the query is not
+    run while serializing. Walks the frames of DRF's `Serializer.to_representation`.
+    """
+
+    from rest_framework.serializers import Serializer
+
+    frame = sys._getframe(1)  # noqa
+    while frame:
+        if frame.f_code.co_name == "to_representation" and "field" in frame.f_locals:
+            serializer = frame.f_locals.get("self")
+            if isinstance(serializer, Serializer):
+                return f"{type(serializer).__name__}.{frame.f_locals['field'].field_name}"
+        frame = frame.f_back
+    return None
+
+
+class QueryInspector:
+    """
+    Counts the queries run on all the database connections of the current thread, grouped by the normalized
+    sql. Used as a context manager by the `QueryBudgetMiddleware` & the `assert_query_budget` test helper.
+
+    A shape repeated `n_plus_one_threshold` times is flagged as a N+1, the originating serializer field is
+    resolved from the stack once per flagged shape. The tenant connections registered lazily within the block
+    are instrumented when they connect.
+    """
+
+    def __init__(self, n_plus_one_threshold=None):
+        self.n_plus_one_threshold = n_plus_one_threshold or settings.QUERY_BUDGET["n_plus_one_threshold"]
+        self.count = 0
+        self.shapes = {}
+        self.origins = {}
+        self.exit_stack = None
+        self.wrapped_connections = set()
+        self.thread_ident = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """Execute wrapper, tracks the query before running it."""
+
+        self.count += 1
+        shape = normalize_sql(sql)
+        self.shapes[shape] = self.shapes.get(shape, 0) + 1
+        if self.shapes[shape] == self.n_plus_one_threshold:
+            self.origins[shape] = get_serializer_field()
+        return execute(sql, params, many, context)
+
+    def install(self, connection):
+        """Installs the wrapper on the given connection, once."""
+
+        if connection not in self.wrapped_connections:
+            self.wrapped_connections.add(connection)
+            self.exit_stack.enter_context(connection.execute_wrapper(self))
+
+    def on_connection_created(self, sender, connection, **kwargs):
+        """Installs the wrapper on the connections opened by the current thread, registered after `__enter__`."""
+
+        if threading.get_ident() == self.thread_ident:
+            self.install(connection)
+
+    def __enter__(self):
+        """Installs the wrapper on all the connections & on the ones connected later."""
+
+        self.exit_stack, self.thread_ident = ExitStack(), threading.get_ident()
+        for connection in connections.all():
+            self.install(connection)
+        connection_created.connect(self.on_connection_created)
+        return self
+
+    def __exit__(self, *args):
+        """Removes the wrapper from all the connections."""
+
+        connection_created.disconnect(self.on_connection_created)
+        self.exit_stack.close()
+        self.wrapped_connections.clear()
+        return False
+
+    def get_violations(self, budget=None):
+        """Returns the budget overrun & the N+1 shapes along with their count & origin, empty when none."""
+
+        violations = {}
+        if budget is not None and self.count > budget:
+            violations["budget"] = {"budget": budget, "queries": self.count}
+        if n_plus_one := [
+            {"sql": shape, "count": count, "origin": self.origins.get(shape)}
+            for shape, count in self.shapes.items()
+            if count >= self.n_plus_one_threshold
+        ]:
+            violations["n_plus_one"] = n_plus_one
+        return violations
+
+    def report(self, label, budget=None, raise_on_violation=None):
+        """Raises or logs the violations of the given budget. Returns the violations."""
+
+        if raise_on_violation is None:
+            raise_on_violation = settings.QUERY_BUDGET["raise_on_violation"]
+        if violations := self.get_violations(budget):
+            message = f"Query budget violated by {label}, queries: {self.count}, violations: {violations}"
+            if raise_on_violation:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return violations
+
+
+@contextmanager
+def assert_query_budget(max_queries=None, n_plus_one_threshold=None, label="block"):
+    """
+    Test helper, fails when the block runs more than `max_queries` queries or repeats a query shape
+    `n_plus_one_threshold` times.
+
+    Usage -
+        with assert_query_budget(max_queries=10):
+            client.get(url)
+    """
+
+    with QueryInspector(n_plus_one_threshold) as inspector:
+        yield inspector
+    inspector.report(label, budget=max_queries, raise_on_violation=True)
@@ -1,3 +1,6 @@
+import copy
+
+from django.utils.functional import cached_property
 from rest_framework import serializers
 from rest_framework.fields import SkipField
 from rest_framework.serializers import ModelSerializer, Serializer
@@ -11,33 +14,55 @@ from apps.common.models import BaseUploadModel
 
 class CustomErrorMessagesMixin:
     """
-    Overrides the constructor of the serializer to add meaningful error
+    Overrides the fields of the serializer to add meaningful error
     messages to the serializer output. Also used to hide security
     related messages to the user.
+
+    The messages are built once per serializer class & applied when the
+    fields are built, not on every instantiation.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        """Every serializer class keeps its own custom error messages, by the field name & type."""
+
+        super().__init_subclass__(**kwargs)
+        cls._custom_error_messages = {}
+
     def get_display(self, field_name):
         return field_name.replace("_", " ")
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # adding custom error messages
-        for field_name, field in getattr(self, "fields", {}).items():
+    def get_custom_error_messages(self, field_name, field):
+        """Returns the custom error messages of the field & of its child relation, cached on the class."""
+
+        key = (field_name, field.__class__.__name__)
+        if key not in self._custom_error_messages:
             if field.__class__.__name__ == "ManyRelatedField":
                 # many-to-many | uses foreign key field for children
-                field.error_messages.update(CUSTOM_ERRORS_MESSAGES["ManyRelatedField"])
-                field.child_relation.error_messages.update(CUSTOM_ERRORS_MESSAGES["PrimaryKeyRelatedField"])
+                messages = (
+                    CUSTOM_ERRORS_MESSAGES["ManyRelatedField"],
+                    CUSTOM_ERRORS_MESSAGES["PrimaryKeyRelatedField"],
+                )
             elif field.__class__.__name__ == "PrimaryKeyRelatedField":
                 # foreign-key
-                field.error_messages.update(CUSTOM_ERRORS_MESSAGES["PrimaryKeyRelatedField"])
+                messages = (CUSTOM_ERRORS_MESSAGES["PrimaryKeyRelatedField"], None)
             else:
                 # other input-fields
-                field.error_messages.update(
-                    {
-                        "blank": f"Please enter your {self.get_display(field_name)}",
-                        "null": f"Please enter your {self.get_display(field_name)}",
-                    }
-                )
+                display = self.get_display(field_name)
+                messages = ({"blank": f"Please enter your {display}", "null": f"Please enter your {display}"}, None)
+            self._custom_error_messages[key] = messages
+        return self._custom_error_messages[key]
+
+    @cached_property
+    def fields(self):
+        """Overridden to add the custom error messages to the fields, once they are built."""
+
+        fields = super().fields
+        for field_name, field in fields.items():
+            messages, child_messages = self.get_custom_error_messages(field_name, field)
+            field.error_messages.update(messages)
+            if child_messages:
+                field.child_relation.error_messages.update(child_messages)
+        return fields
 
 
 class AppSerializer(CustomErrorMessagesMixin, Serializer):
@@ -148,13 +173,23 @@ class AppWriteOnlyModelSerializer(AppModelSerializer):
 
         return self.validated_data[key] if key else self.validated_data
 
-    def __init__(self, *args, **kwargs):
-        # all fields are required
-        for field in self.Meta.fields:
-            self.Meta.extra_kwargs.setdefault(field, {})
-            self.Meta.extra_kwargs[field]["required"] = True
+    def __init_subclass__(cls, **kwargs):
+        """Every serializer class keeps its own render config & initial data config, built on first use."""
 
-        super().__init__(*args, **kwargs)
+        super().__init_subclass__(**kwargs)
+        cls._dynamic_render_config = None
+        cls._meta_initial_config = {}
+
+    def get_extra_kwargs(self):
+        """
+        Overridden to make all the fields required. The `Meta.extra_kwargs` is shared by
+        the classes inheriting the `Meta`, it is only read & never mutated.
+        """
+
+        extra_kwargs = super().get_extra_kwargs()
+        for field in self.Meta.fields:
+            extra_kwargs.setdefault(field, {})["required"] = True
+        return extra_kwargs
 
     class Meta(AppModelSerializer.Meta):
         model = None
@@ -198,8 +233,17 @@ class AppWriteOnlyModelSerializer(AppModelSerializer):
         """
         Returns a config that can be used by the front-end to dynamically
         render and handle the form fields. This improves delivery speed.
+
+        Built once per class, a copy is returned as the child classes alter it.
         """
 
+        if self._dynamic_render_config is None:
+            self.__class__._dynamic_render_config = self.build_dynamic_render_config()
+        return copy.deepcopy(self._dynamic_render_config)
+
+    def build_dynamic_render_config(self):
+        """Builds the `get_dynamic_render_config` from the fields & the model fields."""
+
         from django.db import models
 
         from apps.common.models import BaseUploadModel
@@ -302,37 +346,56 @@ class AppWriteOnlyModelSerializer(AppModelSerializer):
                 initial[k] = v.pk
 
             # not a model field
-            if not instance.__class__.get_model_field(k, None):
+            if not (config := self.get_meta_initial_config(instance.__class__, k)):
                 continue
 
-            field = self.Meta.model.get_model_field(k)
-            related_model = field.related_model
-
             field_instance = getattr(self.instance, k)
 
             # file url for fk instance
-            if related_model and issubclass(related_model, BaseUploadModel) and getattr(self.instance, k):
-                file_model_fields = related_model._meta.fields
-                for file_model_field in file_model_fields:
-                    if related_model._meta.get_field(file_model_field.name).__class__ in [AppImageField, AppFileField]:
-                        initial[k] = {
-                            "id": field_instance.id,
-                            file_model_field.name: getattr(field_instance, file_model_field.name).url,
-                        }
+            if config["upload_file_field"] and field_instance:
+                initial[k] = {
+                    "id": field_instance.id,
+                    config["upload_file_field"]: getattr(field_instance, config["upload_file_field"]).url,
+                }
 
             # file or image
-            if instance.__class__.get_model_field(k).__class__ in [AppImageField, AppFileField]:
-                initial[k] = getattr(instance, k).url if getattr(instance, k) else None
+            if config["is_file"]:
+                initial[k] = field_instance.url if field_instance else None
 
             # many-to-many
-            if instance.__class__.get_model_field(k).many_to_many:
-                initial[k] = getattr(instance, k).values_list("pk", flat=True)
+            if config["is_many_to_many"]:
+                initial[k] = field_instance.values_list("pk", flat=True)
 
-            if instance.__class__.get_model_field(k).__class__ == model_fields.AppPhoneNumberField:
-                initial[k] = getattr(instance, k).raw_input if getattr(instance, k) else None
+            if config["is_phone_number"]:
+                initial[k] = field_instance.raw_input if field_instance else None
 
         return initial
 
+    def get_meta_initial_config(self, model, field_name):
+        """
+        Returns how the `get_meta_initial` simplifies the value of the model field, `None` if not
+        a model field. Reflected once per class, model & field.
+        """
+
+        key = (model, field_name)
+        if key not in self._meta_initial_config:
+            config = None
+            if model_field := model.get_model_field(field_name, None):
+                related_model = self.Meta.model.get_model_field(field_name).related_model
+                upload_file_field = None
+                if related_model and issubclass(related_model, BaseUploadModel):
+                    for file_model_field in related_model._meta.fields:
+                        if file_model_field.__class__ in [AppImageField, AppFileField]:
+                            upload_file_field = file_model_field.name
+                config = {
+                    "upload_file_field": upload_file_field,
+                    "is_file": model_field.__class__ in [AppImageField, AppFileField],
+                    "is_many_to_many": model_field.many_to_many,
+                    "is_phone_number": model_field.__class__ == model_fields.AppPhoneNumberField,
+                }
+            self._meta_initial_config[key] = config
+        return self._meta_initial_config[key]
+
 
 class AppCreateModelSerializer(AppWriteOnlyModelSerializer):
     """
@@ -5,7 +5,7 @@ from django.conf import settings
 from kombu.exceptions import OperationalError
 
 from apps.common.helpers import create_log
-from apps.tenant_service.middlewares import set_db_for_router
+from apps.tenant_service.middlewares import get_current_db_name, tenant_context
 
 
 class BaseAppTask(Task):
@@ -26,17 +26,18 @@ class BaseAppTask(Task):
 
         super().__init__(*args, **kwargs)
 
-    def switch_db(self, db_name=None):
-        """Function to switch the database."""
+    def __call__(self, *args, **kwargs):
+        """Runs the task in its own `tenant_context`, the database switched by the task does not leak."""
+
+        with tenant_context():
+            return super().__call__(*args, **kwargs)
 
-        from apps.tenant_service.models import DatabaseRouter
+    def switch_db(self, db_name=None):
+        """Function to switch the database, for the rest of the task."""
 
-        set_db_for_router()
         if db_name:
             self.logger.info(f"Switching database to {db_name}")
-            if router := DatabaseRouter.objects.get_or_none(database_name=db_name):
-                router.add_db_connection()
-            return set_db_for_router(db_name)
+        tenant_context(db_name).activate()
         return True
 
     def run(self, *args, **kwargs):
@@ -53,14 +54,16 @@ class BaseAppTask(Task):
         if self.perform_run_task:
             if settings.APP_SWITCHES["CELERY_WORKER_DEBUG_MODE"]:
                 # use django thread | local debugging | breakpoints might be used
-                self.run(**kwargs)
+                with tenant_context(get_current_db_name()):
+                    self.run(**kwargs)
             else:
                 try:
                     # use celery if available
                     self.delay(**kwargs)
                 except OperationalError:
-                    # use django thread
-                    self.run(**kwargs)
+                    # use django thread | the caller's database is restored after
+                    with tenant_context(get_current_db_name()):
+                        self.run(**kwargs)
 
         self.post_run_task(**kwargs)
 
@@ -2,6 +2,7 @@
 from .base import (
     AppAPIView,
     AppCreateAPIView,
+    AsyncAppAPIView,
     AppViewMixin,
     SortingMixin,
     CatalogueFilterMixin,
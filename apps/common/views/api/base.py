@@ -1,6 +1,8 @@
 import contextlib
-from contextlib import suppress
+from contextlib import ExitStack, suppress
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import transaction
 from django.db.models import Q
 from rest_framework import permissions, status
 from rest_framework.exceptions import MethodNotAllowed, NotFound, ValidationError
@@ -13,6 +15,7 @@ from apps.access_control.config import RoleTypeChoices
 from apps.common.config import API_RESPONSE_ACTION_CODES
 from apps.common.permissions import PolicyPermission
 from apps.learning.models import Catalogue
+from apps.tenant_service.middlewares import get_current_db_name
 
 
 class NonAuthenticatedAPIMixin:
@@ -28,9 +31,29 @@ class AppViewMixin:
     """
     The base view class for all the application view. Contains common methods
     and overrides to main integrity and schema.
+
+    The tenant databases are not in the `ATOMIC_REQUESTS`, the tenant is only known after the authentication.
+    The view is run in a transaction of the request's tenant database once resolved, same as the `ATOMIC_REQUESTS`.
     """
 
     get_object_model = None
+    # transaction of the tenant database opened for the request, closed at the end of the `dispatch`
+    tenant_transaction = None
+    tenant_transaction_db = None
+
+    def dispatch(self, request, *args, **kwargs):
+        """Overridden to close the transaction of the tenant database opened by the `initial`."""
+
+        with ExitStack() as self.tenant_transaction:
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        """Overridden to open the transaction of the tenant database, resolved by the authentication."""
+
+        super().initial(request, *args, **kwargs)
+        if self.tenant_transaction is not None and (db_name := get_current_db_name()):
+            self.tenant_transaction.enter_context(transaction.atomic(using=db_name))
+            self.tenant_transaction_db = db_name
 
     def get_request(self):
         """Returns the request."""
@@ -99,7 +122,11 @@ class AppViewMixin:
         if exc and hasattr(exc, "status_code") and exc.status_code in [401]:
             action_code = "AUTH_TOKEN_NOT_PROVIDED_OR_INVALID"
 
-        return self.get_app_response_schema(super().handle_exception(exc), action_code=action_code)
+        response = super().handle_exception(exc)
+        # handled exception, rolled back like the `ATOMIC_REQUESTS` databases by DRF
+        if self.tenant_transaction_db:
+            transaction.set_rollback(True, using=self.tenant_transaction_db)
+        return self.get_app_response_schema(response, action_code=action_code)
 
     def list(self, request, *args, **kwargs):
         """Overridden to maintain applications response schema."""
@@ -201,6 +228,71 @@ class AppAPIView(AppViewMixin, APIView):
         return super().get_object()
 
 
+class NonAtomicDatabases(set):
+    """
+    Aliases excluded from the `ATOMIC_REQUESTS` of a view, all of them. The tenant aliases are registered
+    lazily, so they cannot be listed upfront.
+    """
+
+    def __contains__(self, alias):
+        return True
+
+
+class AsyncAppAPIView(AppAPIView):
+    """
+    Async variant of the `AppAPIView`, for the proxy-style views that mostly wait on the microservices. Served
+    through the `config.asgi`, the handlers are `async def` & await the `AsyncCommunicator` so that a worker
+    serves many in-flight requests, instead of a sync worker blocked per request.
+
+    The authentication, permissions & the tenant database activation are the same as the sync views, run in a
+    worker thread along with the responses schema & the exception handling. The database access from the
+    handlers goes through `self.run_sync`. Not atomic per request, django does not support it for async views.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """Overridden to serve the view as a coroutine, DRF's `csrf_exempt` wrapper is sync."""
+
+        view = super().as_view(**initkwargs)
+        if cls.view_is_async:
+            view = markcoroutinefunction(view)
+            view._non_atomic_requests = NonAtomicDatabases()
+        return view
+
+    @staticmethod
+    async def run_sync(function, *args, **kwargs):
+        """Runs the sync(database) function in the request's worker thread, in the current tenant context."""
+
+        return await sync_to_async(function)(*args, **kwargs)
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        Overridden to await the handler. `initial` authenticates, activates the tenant database & checks the
+        permissions in the request's worker thread, the context changes are carried back to the handler.
+        """
+
+        self.args, self.kwargs = args, kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.run_sync(self.initial, request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await self.run_sync(handler, request, *args, **kwargs)
+        except Exception as exc:
+            response = await self.run_sync(self.handle_exception, exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
 class AppCreateAPIView(AppViewMixin, CreateAPIView):
     """App's version on the `CreateAPIView`, implements custom handlers."""
 
@@ -17,6 +17,7 @@ from apps.common.pagination import AppPagination
 from apps.common.permissions import PolicyPermission
 from apps.common.serializers import AppModelSerializer
 from apps.common.views.api.base import AppCreateAPIView, AppViewMixin
+from apps.tenant_service.middlewares import using_replica
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +81,13 @@ class AppModelListAPIViewSet(
     search_fields = []  # override
     ordering_fields = "__all__"
     all_table_columns = {}
+    query_budget = None  # override | max queries per request, enforced by the `QueryBudgetMiddleware`
+
+    def list(self, request, *args, **kwargs):
+        """Overridden to route the reads of the listing to the tenant's read replica."""
+
+        with using_replica():
+            return super().list(request, *args, **kwargs)
 
     @action(
         methods=["GET"],
@@ -0,0 +1,88 @@
+# Generated by Django 4.2.3 on 2026-10-19 11:02
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, field):
+    """Returns the count of the `queryset` rows related to the outer row through `field`."""
+
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(count=Count("pk"))
+            .values("count")[:1]
+        ),
+        0,
+    )
+
+
+def populate_counters(apps, schema_editor):
+    """Populates the denormalized counters from the existing data."""
+
+    Forum = apps.get_model("forum", "Forum")
+    ForumTopic = apps.get_model("forum", "ForumTopic")
+    Post = apps.get_model("forum", "Post")
+    PostLike = apps.get_model("forum", "PostLike")
+    PostComment = apps.get_model("forum", "PostComment")
+    PostReply = apps.get_model("forum", "PostReply")
+
+    Forum.objects.update(
+        members_count=count_subquery(Forum.members.through.objects.all(), "forum"),
+        topic_count=count_subquery(ForumTopic.objects.all(), "forum"),
+        posts_count=count_subquery(Post.objects.all(), "forum_topic__forum"),
+    )
+    ForumTopic.objects.update(posts_count=count_subquery(Post.objects.all(), "forum_topic"))
+    Post.objects.update(
+        likes_count=count_subquery(PostLike.objects.filter(is_liked=True), "post"),
+        comments_count=count_subquery(PostComment.objects.all(), "post"),
+    )
+    PostComment.objects.update(replies_count=count_subquery(PostReply.objects.all(), "comment"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("forum", "0005_alter_forumimagemodel_image_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="forum",
+            name="members_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="forum",
+            name="posts_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="forum",
+            name="topic_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="forumtopic",
+            name="posts_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="comments_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="likes_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="postcomment",
+            name="replies_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
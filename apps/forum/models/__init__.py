@@ -10,5 +10,6 @@ from .forum import (
     PostPollOption,
     PostPollOptionClick,
     PostReply,
+    update_counter,
 )
 from .base import ForumCourseRelationModel
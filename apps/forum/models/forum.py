@@ -11,6 +11,14 @@ from apps.forum.config import ForumTypeChoices, PostTypeChoices
 from apps.forum.models.base import ForumBaseModel, PostBaseModel
 
 
+def update_counter(queryset, field, delta=1):
+    """Atomically changes the counter field of the queryset by `delta` with a single update, never below zero."""
+
+    if delta < 0:
+        queryset = queryset.filter(**{f"{field}__gte": -delta})
+    return queryset.update(**{field: models.F(field) + delta})
+
+
 class ForumImageModel(ImageOnlyModel):
     """
     Image model for Forum.
@@ -35,6 +43,7 @@ class Forum(ForumBaseModel):
         PK          - id,
         Fk          - created_by, modified_by, deleted_by, forum_image
         Fields      - uuid, description, hashtags, topics
+        Counters    - members_count, topic_count, posts_count
         Unique      - name
         Datetime    - created_at, modified_at, deleted_at
         Bool        - is_active, is_deleted
@@ -63,6 +72,20 @@ class Forum(ForumBaseModel):
     members = models.ManyToManyField(to="access.User", blank=True)
     hashtag = models.ManyToManyField(to="meta.Hashtag", blank=True)
 
+    # Counters, denormalized for the listing
+    members_count = models.PositiveIntegerField(default=0)
+    topic_count = models.PositiveIntegerField(default=0)
+    posts_count = models.PositiveIntegerField(default=0)
+
+    def refresh_counts(self):
+        """Recomputes the counters of the forum, used after the members & topics are changed."""
+
+        Forum.objects.filter(id=self.id).update(
+            members_count=self.members.count(),
+            topic_count=self.related_forum_topics.count(),
+            posts_count=Post.objects.filter(forum_topic__forum=self).count(),
+        )
+
     @property
     def hashtag_as_name(self):
         """Returns the hashtag names."""
@@ -78,6 +101,7 @@ class ForumTopic(NameModel):
     PK          - id
     Unique      - uuid, ss_id
     Fields      - name
+    Counters    - posts_count
     Datetime    - created_at, modified_at
 
     """
@@ -87,6 +111,19 @@ class ForumTopic(NameModel):
 
     forum = models.ForeignKey("forum.Forum", on_delete=models.CASCADE)
 
+    # Counters
+    posts_count = models.PositiveIntegerField(default=0)
+
+    @staticmethod
+    def update_posts_count(topic_id, delta=1):
+        """Atomically changes the posts count of the topic & its forum by `delta`."""
+
+        if not topic_id:
+            return False
+        update_counter(ForumTopic.objects.filter(id=topic_id), "posts_count", delta)
+        update_counter(Forum.objects.filter(related_forum_topics=topic_id), "posts_count", delta)
+        return True
+
 
 class PostImageModel(ImageOnlyModel):
     """
@@ -118,6 +155,7 @@ class Post(PostBaseModel):
         DateField   - start_date, end_date
         Bool        - enable_end_time, enable_hide_discussion
         Choice      - post_type
+        Counters    - likes_count, comments_count
 
     App QuerySet Manager Methods -
         get_or_none, active, inactive, alive, dead, delete, hard_delete
@@ -156,11 +194,15 @@ class Post(PostBaseModel):
     enable_end_time = models.BooleanField(default=False)
     enable_hide_discussion = models.BooleanField(default=False)
 
+    # Counters
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+
     @property
     def hashtag_as_name(self):
-        """Returns the hashtag names."""
+        """Returns the hashtag names. Iterated over `all()` to make use of the prefetched hashtags."""
 
-        return self.hashtag.values_list("name", flat=True)
+        return [hashtag.name for hashtag in self.hashtag.all()]
 
 
 class PostLike(CreationModel):
@@ -231,7 +273,7 @@ class PostComment(PostBaseModel):
     PK - id
     FK - created_by, post
     Unique - uuid
-    fields - name
+    fields - name, replies_count
     Datetime - created_at, modified_at
     """
 
@@ -240,6 +282,9 @@ class PostComment(PostBaseModel):
 
     post = models.ForeignKey("forum.Post", on_delete=models.CASCADE)
 
+    # Counters
+    replies_count = models.PositiveIntegerField(default=0)
+
 
 class PostReply(PostBaseModel):
     """
@@ -18,6 +18,7 @@ from apps.forum.models import (
     PostPollOption,
     PostPollOptionClick,
     PostReply,
+    update_counter,
 )
 from apps.forum.serializers.v1.base import CommonForumCUDModelSerializer, CommonForumDetailSerializer
 from apps.leaderboard.config import MilestoneChoices
@@ -59,6 +60,7 @@ class ForumCUDModelSerializer(CommonForumCUDModelSerializer):
             )
         if forum_topics:
             ForumTopic.objects.bulk_create(ForumTopic(forum=instance, name=topic) for topic in forum_topics)
+        instance.refresh_counts()
         return instance
 
     def update(self, instance, validated_data):
@@ -79,6 +81,7 @@ class ForumCUDModelSerializer(CommonForumCUDModelSerializer):
                 ForumTopic.objects.update_or_create(forum=instance, name=topic)
         else:
             instance.related_forum_topics.all().delete()
+        instance.refresh_counts()
         return instance
 
     def get_meta_initial(self):
@@ -134,9 +137,7 @@ class ForumListSerializer(AppReadOnlyModelSerializer):
     """Retrieve serializer for forum listing."""
 
     forum_image = read_serializer(ForumImageModel, meta_fields=["id", "uuid", "image"])(ForumImageModel.objects.all())
-    members_count = serializers.SerializerMethodField()
-    topic_count = serializers.SerializerMethodField()
-    no_of_posts = serializers.SerializerMethodField()
+    no_of_posts = serializers.IntegerField(source="posts_count", read_only=True)
 
     class Meta:
         model = Forum
@@ -152,21 +153,6 @@ class ForumListSerializer(AppReadOnlyModelSerializer):
             "no_of_posts",
         ]
 
-    def get_topic_count(self, obj):
-        """Returns the topic count of the forum."""
-
-        return obj.related_forum_topics.count()
-
-    def get_members_count(self, obj):
-        """Returns the members count of the forum."""
-
-        return obj.members.count()
-
-    def get_no_of_posts(self, obj):
-        """Returns the posts count of the forum."""
-
-        return Post.objects.filter(forum_topic__forum=obj).count()
-
 
 class ForumTopicListSerializer(AppReadOnlyModelSerializer):
     """Serializer class for the forum topic list."""
@@ -217,6 +203,7 @@ class PostCUDModelSerializer(CommonForumCUDModelSerializer):
         instance = super().create(validated_data)
         for poll_option in poll_options:
             instance.poll_options.create(**poll_option)
+        ForumTopic.update_posts_count(instance.forum_topic_id)
         CommonLeaderboardTask().run_task(
             milestone_names=MilestoneChoices.forum_post_creation,
             user_id=self.get_user().id,
@@ -229,7 +216,11 @@ class PostCUDModelSerializer(CommonForumCUDModelSerializer):
         """overriden to update poll options"""
 
         poll_options_data = validated_data.pop("poll_options", [])
+        previous_topic_id = instance.forum_topic_id
         instance = super().update(instance, validated_data)
+        if instance.forum_topic_id != previous_topic_id:
+            ForumTopic.update_posts_count(previous_topic_id, delta=-1)
+            ForumTopic.update_posts_count(instance.forum_topic_id)
         # M2M fields
         if poll_options_data:
             instance.poll_options.clear()
@@ -275,8 +266,6 @@ class PostDetailSerializer(CommonForumDetailSerializer):
     poll_options = serializers.SerializerMethodField()
     post_image = read_serializer(PostImageModel, meta_fields=["id", "uuid", "image"])(PostImageModel.objects.all())
     created_by = SimpleUserReadOnlyModelSerializer()
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     is_poll_option_clicked = serializers.SerializerMethodField()
     is_my_post = serializers.SerializerMethodField()
@@ -311,40 +300,35 @@ class PostDetailSerializer(CommonForumDetailSerializer):
     def get_poll_options(self, obj):
         """Overriden to return a list of poll options in order of created time."""
 
-        poll_options = obj.poll_options.all()
+        poll_options = sorted(obj.poll_options.all(), key=lambda poll_option: poll_option.created_at)
         return (
             read_serializer(PostPollOption, meta_fields=["id", "uuid", "name", "clicked_count"])(
-                poll_options.order_by("created_at"), many=True
+                poll_options, many=True
             ).data
             if poll_options
             else None
         )
 
-    def get_likes_count(self, obj):
-        """Returns the likes count of the posts."""
-
-        return obj.related_likes.filter(is_liked=True).count()
-
-    def get_comments_count(self, obj):
-        """Returns the comments count of the posts."""
-
-        return obj.related_comments.count()
-
     def get_is_liked(self, obj):
-        """Returns the post is already liked by a user or not."""
+        """Returns the post is already liked by a user or not. Uses the likes prefetched for the viewer."""
 
+        if hasattr(obj, "viewer_likes"):
+            return bool(obj.viewer_likes)
         return PostLike.objects.filter(is_liked=True, created_by=self.get_user(), post=obj).exists()
 
     def get_is_poll_option_clicked(self, obj):
-        """Returns id of poll_option clicked by a user."""
+        """Returns id of poll_option clicked by a user. Uses the clicks prefetched for the viewer."""
 
-        is_clicked = PostPollOptionClick.objects.filter(created_by=self.get_user(), post=obj).first()
-        return is_clicked.poll_option.id if is_clicked else None
+        if hasattr(obj, "viewer_poll_option_clicks"):
+            is_clicked = next(iter(obj.viewer_poll_option_clicks), None)
+        else:
+            is_clicked = PostPollOptionClick.objects.filter(created_by=self.get_user(), post=obj).first()
+        return is_clicked.poll_option_id if is_clicked else None
 
     def get_is_my_post(self, obj):
         """Returns the post is created by the current user or not."""
 
-        return obj.created_by == self.get_user()
+        return obj.created_by_id == self.get_user().id
 
 
 class PostCommentCUDModelSerializer(AppWriteOnlyModelSerializer):
@@ -361,6 +345,7 @@ class PostCommentCUDModelSerializer(AppWriteOnlyModelSerializer):
         """Overridden to call leaderboard task"""
 
         instance = super().create(validated_data)
+        update_counter(Post.objects.filter(id=instance.post_id), "comments_count")
         CommonLeaderboardTask().run_task(
             milestone_names=MilestoneChoices.forum_post_comments,
             user_id=self.get_user().id,
@@ -373,7 +358,6 @@ class PostCommentCUDModelSerializer(AppWriteOnlyModelSerializer):
 class PostCommentDetailSerializer(AppReadOnlyModelSerializer):
     """This serializer contains configuration for Post-Comments."""
 
-    replies_count = serializers.SerializerMethodField()
     is_my_comment = serializers.SerializerMethodField()
     created_by = SimpleUserReadOnlyModelSerializer()
 
@@ -381,15 +365,10 @@ class PostCommentDetailSerializer(AppReadOnlyModelSerializer):
         fields = ["id", "uuid", "name", "replies_count", "created_by", "created_at", "is_my_comment"]
         model = PostComment
 
-    def get_replies_count(self, obj):
-        """Returns the replies count of the posts."""
-
-        return obj.related_replies.count()
-
     def get_is_my_comment(self, obj):
         """Returns the comment is created by the current user or not."""
 
-        return obj.created_by == self.get_user()
+        return obj.created_by_id == self.get_user().id
 
 
 class PostReplyCUDModelSerializer(AppWriteOnlyModelSerializer):
@@ -406,6 +385,7 @@ class PostReplyCUDModelSerializer(AppWriteOnlyModelSerializer):
         """Overridden to call Leaderboard task."""
 
         instance = super().create(validated_data)
+        update_counter(PostComment.objects.filter(id=instance.comment_id), "replies_count")
         CommonLeaderboardTask().run_task(
             milestone_names=MilestoneChoices.replying_comments,
             user_id=self.get_user().id,
@@ -428,4 +408,4 @@ class PostReplyDetailSerializer(AppReadOnlyModelSerializer):
     def get_is_my_reply(self, obj):
         """Returns the reply is created by the current user or not."""
 
-        return obj.created_by == self.get_user()
+        return obj.created_by_id == self.get_user().id
@@ -1,6 +1,7 @@
 from datetime import date
 
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Prefetch, Q
 from rest_framework.generics import get_object_or_404
 
 from apps.common.views.api import (
@@ -21,6 +22,7 @@ from apps.forum.models import (
     PostPollOption,
     PostPollOptionClick,
     PostReply,
+    update_counter,
 )
 from apps.forum.serializers.v1 import (
     ForumCUDModelSerializer,
@@ -34,6 +36,9 @@ from apps.forum.serializers.v1 import (
     PostReplyCUDModelSerializer,
     PostReplyDetailSerializer,
 )
+from apps.my_learning.config import FeedActivityTypeChoices
+from apps.my_learning.tasks import UserFeedFanOutTask
+from apps.tenant_service.middlewares import get_current_db_name
 
 ForumImageUploadAPIView = get_upload_api_view(meta_model=ForumImageModel, meta_fields=["id", "image"])
 
@@ -57,7 +62,7 @@ class ForumRetrieveApiViewSet(AppModelRetrieveAPIViewSet):
 class ForumListApiViewSet(AppModelListAPIViewSet):
     """Api viewset to list forums."""
 
-    queryset = Forum.objects.alive().order_by("created_at")
+    queryset = Forum.objects.alive().select_related("forum_image").order_by("created_at")
     search_fields = ["name"]
     filterset_fields = [
         "related_forum_course_relations__course",
@@ -89,6 +94,12 @@ class PostCUDApiViewSet(AppModelCUDAPIViewSet):
     serializer_class = PostCUDModelSerializer
     queryset = Post.objects.all()
 
+    def perform_destroy(self, instance):
+        """Overridden to update the posts count of the topic & forum."""
+
+        super().perform_destroy(instance)
+        ForumTopic.update_posts_count(instance.forum_topic_id, delta=-1)
+
 
 class PostListApiViewSet(AppModelListAPIViewSet):
     """Api viewset to list posts."""
@@ -100,10 +111,27 @@ class PostListApiViewSet(AppModelListAPIViewSet):
         """Overridden the queryset to filter the posts based on forum topics."""
 
         topic = get_object_or_404(ForumTopic, id=self.kwargs.get("topic_id", None))
+        user = self.get_user()
 
         return (
             Post.objects.filter(forum_topic=topic)
             .filter(Q(enable_end_time=False) | Q(enable_end_time=True, end_date__gt=date.today()))
+            .select_related("created_by__profile_picture", "post_image")
+            .prefetch_related(
+                "created_by__roles",
+                "hashtag",
+                "poll_options",
+                Prefetch(
+                    "related_likes",
+                    queryset=PostLike.objects.filter(created_by=user, is_liked=True),
+                    to_attr="viewer_likes",
+                ),
+                Prefetch(
+                    "related_poll_options_clicked",
+                    queryset=PostPollOptionClick.objects.filter(created_by=user),
+                    to_attr="viewer_poll_option_clicks",
+                ),
+            )
             .order_by("created_at")
         )
 
@@ -114,6 +142,12 @@ class PostCommentCUDApiViewSet(AppModelCUDAPIViewSet):
     serializer_class = PostCommentCUDModelSerializer
     queryset = PostComment.objects.all()
 
+    def perform_destroy(self, instance):
+        """Overridden to update the comments count of the post."""
+
+        super().perform_destroy(instance)
+        update_counter(Post.objects.filter(id=instance.post_id), "comments_count", delta=-1)
+
 
 class PostCommentListApiViewSet(AppModelListAPIViewSet):
     """Api viewset to list comments."""
@@ -125,7 +159,12 @@ class PostCommentListApiViewSet(AppModelListAPIViewSet):
 
         post = get_object_or_404(Post, id=self.kwargs.get("post_id", None))
 
-        return PostComment.objects.filter(post=post).order_by("created_at")
+        return (
+            PostComment.objects.filter(post=post)
+            .select_related("created_by__profile_picture")
+            .prefetch_related("created_by__roles")
+            .order_by("created_at")
+        )
 
 
 class PostReplyCUDApiViewSet(AppModelCUDAPIViewSet):
@@ -134,6 +173,12 @@ class PostReplyCUDApiViewSet(AppModelCUDAPIViewSet):
     serializer_class = PostReplyCUDModelSerializer
     queryset = PostReply.objects.all()
 
+    def perform_destroy(self, instance):
+        """Overridden to update the replies count of the comment."""
+
+        super().perform_destroy(instance)
+        update_counter(PostComment.objects.filter(id=instance.comment_id), "replies_count", delta=-1)
+
 
 class PostReplyListApiViewSet(AppModelListAPIViewSet):
     """Api viewset to list replies."""
@@ -145,7 +190,12 @@ class PostReplyListApiViewSet(AppModelListAPIViewSet):
 
         comment = get_object_or_404(PostComment, id=self.kwargs.get("comment_id", None))
 
-        return PostReply.objects.filter(comment=comment).order_by("created_at")
+        return (
+            PostReply.objects.filter(comment=comment)
+            .select_related("created_by__profile_picture")
+            .prefetch_related("created_by__roles")
+            .order_by("created_at")
+        )
 
 
 class PostLikeApiView(AppAPIView):
@@ -161,6 +211,23 @@ class PostLikeApiView(AppAPIView):
         else:
             post_like.is_liked = not post_like.is_liked
         post_like.save()
+        update_counter(Post.objects.filter(id=post.id), "likes_count", delta=1 if post_like.is_liked else -1)
+        if post_like.is_liked:
+            activities = [
+                {
+                    "actor_id": user.id,
+                    "activity_type": FeedActivityTypeChoices.post_liked,
+                    "post_like_id": post_like.id,
+                }
+            ]
+            db_name = get_current_db_name()
+            # dispatched once committed, the worker reads the post like
+            transaction.on_commit(
+                lambda: UserFeedFanOutTask().run_task(activities=activities, db_name=db_name),
+                using=PostLike.objects.db,
+            )
+        else:
+            post_like.related_user_feed_activities.all().delete()
 
         return self.send_response()
 
@@ -180,29 +247,22 @@ class PostPollOptionClickApiView(AppAPIView):
         existing_click = PostPollOptionClick.objects.filter(post=post, created_by=user).first()
 
         if existing_click:
-            # different option, update the clicked count
-            if existing_click.poll_option != option:
-                existing_option = existing_click.poll_option
-                existing_option.clicked_count = existing_option.related_poll_options_clicked.exclude(
-                    created_by=user
-                ).count()
-                existing_option.save()
-
+            # different option, move the clicked count
+            if existing_click.poll_option_id != option.id:
+                update_counter(
+                    PostPollOption.objects.filter(id=existing_click.poll_option_id), "clicked_count", delta=-1
+                )
                 existing_click.poll_option = option
                 existing_click.save()
-
-                option.clicked_count = option.related_poll_options_clicked.count()
-                option.save()
+                update_counter(PostPollOption.objects.filter(id=option.id), "clicked_count")
 
             else:
                 # same option again, decrease the clicked count
-                option.clicked_count = option.related_poll_options_clicked.exclude(created_by=user).count()
-                option.save()
                 existing_click.delete()
+                update_counter(PostPollOption.objects.filter(id=option.id), "clicked_count", delta=-1)
         else:
             PostPollOptionClick.objects.create(post=post, poll_option=option, created_by=user)
-            # not clicked any option, update the clicked count
-            option.clicked_count = option.related_poll_options_clicked.count()
-            option.save()
+            # not clicked any option, increase the clicked count
+            update_counter(PostPollOption.objects.filter(id=option.id), "clicked_count")
 
         return self.send_response()
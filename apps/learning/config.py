@@ -224,3 +224,7 @@ class AssignmentGuidanceChoices(DjangoChoices):
 
     guided = ChoiceItem("guided", "Guided")
     unguided = ChoiceItem("unguided", "Unguided")
+
+
+# number of the CCMS details fetched at a time while cloning the learnings.
+CLONE_FETCH_CONCURRENCY = 8
@@ -1,8 +1,10 @@
 import os
 
+from asgiref.sync import sync_to_async
 from django.db import transaction
 from django_filters import rest_framework as filters
 
+from apps.common.async_communicator import async_get_request
 from apps.common.cache_management import cache_manager
 from apps.common.communicator import get_request
 from apps.common.helpers import process_request_headers
@@ -208,6 +210,17 @@ def get_ccms_retrieve_details(request, learning_type, instance_id, params={}, is
     return success, data
 
 
+async def async_get_ccms_retrieve_details(request, learning_type, instance_id, params={}):  # noqa
+    """Async variant of `get_ccms_retrieve_details`, used by the async gateway views."""
+
+    return await async_get_request(
+        service="CCMS",
+        url_path=f"api/v1/{CCMS_URL_RELATED_KEYS.get(learning_type)}/detail/{instance_id}/",
+        params=params,
+        headers=await sync_to_async(process_request_headers)(request),
+    )
+
+
 def convert_hms_to_sec(hms_string):
     """Convert 'HH:MM:SS' format to seconds."""
 
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.3 on 2026-10-19 12:30
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # indexes are built `CONCURRENTLY`, which can not run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("learning", "0048_remove_assignment_author_assignment_author"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="course",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)), fields=["-created_at"], name="course_alive_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="learningpath",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)), fields=["-created_at"], name="learning_path_alive_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="advancedlearningpath",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)), fields=["-created_at"], name="alp_alive_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="skilltraveller",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)), fields=["-created_at"], name="skill_traveller_alive_idx"
+            ),
+        ),
+    ]
@@ -1,7 +1,7 @@
 from django.db import models
 from django.db.models import F, Sum
 
-from apps.common.models import COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG, BaseModel, ImageOnlyModel
+from apps.common.models import COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG, BaseModel, ImageOnlyModel, get_alive_index
 from apps.learning.models import BaseResourceModel, LearningPath, LearningPathCommonModel
 
 
@@ -48,6 +48,7 @@ class AdvancedLearningPath(LearningPathCommonModel):
 
     class Meta(LearningPathCommonModel.Meta):
         default_related_name = "related_advanced_learning_paths"
+        indexes = [get_alive_index("alp_alive_idx")]
 
     # FK
     image = models.ForeignKey(
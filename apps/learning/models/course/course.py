@@ -4,7 +4,12 @@ from django.apps import apps
 from django.db import models
 from django.db.models import F, Sum
 
-from apps.common.models import COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG, COMMON_CHAR_FIELD_MAX_LENGTH, ImageOnlyModel
+from apps.common.models import (
+    COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG,
+    COMMON_CHAR_FIELD_MAX_LENGTH,
+    ImageOnlyModel,
+    get_alive_index,
+)
 from apps.forum.models import Forum, ForumCourseRelationModel
 from apps.learning.communicator import chat_post_request
 from apps.learning.models import BaseRoleSkillLearningModel
@@ -56,6 +61,7 @@ class Course(BaseRoleSkillLearningModel):
 
     class Meta(BaseRoleSkillLearningModel.Meta):
         default_related_name = "related_courses"
+        indexes = [get_alive_index("course_alive_idx")]
 
     # ForeignKey
     image = models.ForeignKey(
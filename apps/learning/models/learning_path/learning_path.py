@@ -6,7 +6,7 @@ from django.db import models
 from django.db.models import F, Sum
 from django.utils import timezone
 
-from apps.common.models import COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG, BaseModel, ImageOnlyModel
+from apps.common.models import COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG, BaseModel, ImageOnlyModel, get_alive_index
 from apps.learning.models import BaseResourceModel, LearningPathCommonModel
 
 
@@ -53,6 +53,7 @@ class LearningPath(LearningPathCommonModel):
 
     class Meta(LearningPathCommonModel.Meta):
         default_related_name = "related_learning_paths"
+        indexes = [get_alive_index("learning_path_alive_idx")]
 
     # FK
     image = models.ForeignKey(
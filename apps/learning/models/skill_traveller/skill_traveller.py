@@ -5,7 +5,12 @@ from django.db import models
 from django.db.models import F, Sum
 from django.utils import timezone
 
-from apps.common.models import COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG, COMMON_CHAR_FIELD_MAX_LENGTH, ImageOnlyModel
+from apps.common.models import (
+    COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG,
+    COMMON_CHAR_FIELD_MAX_LENGTH,
+    ImageOnlyModel,
+    get_alive_index,
+)
 from apps.common.models.base import BaseModel
 from apps.learning.config import JourneyTypeChoices, SkillTravellerLearningTypeChoices
 from apps.learning.models import BaseResourceModel, BaseSkillLearningModel, Course
@@ -54,6 +59,7 @@ class SkillTraveller(BaseSkillLearningModel):
 
     class Meta(BaseSkillLearningModel.Meta):
         default_related_name = "related_skill_travellers"
+        indexes = [get_alive_index("skill_traveller_alive_idx")]
 
     image = models.ForeignKey(
         to=SkillTravellerImageModel, on_delete=models.SET_NULL, **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG
@@ -3,5 +3,5 @@ from .resource import ResourceUploadTask
 from .catalogue import UpdateCatalogueLearningDataTask
 from .course import CourseBulkUploadTask
 from .scorm import ScormUploadTask
-from .learning_retire import handle_learning_retire
+from .learning_retire import LearningRetiredTask, handle_learning_retire
 from .clone import LearningCloneTask
@@ -1,37 +1,165 @@
 import json
 
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+
+from apps.common.fan_out import fan_out
 from apps.common.tasks import BaseAppTask
+from apps.learning.config import CLONE_FETCH_CONCURRENCY
 from apps.my_learning.config import AssignmentLearningTypeChoices
+from apps.tenant_service.middlewares import tenant_context
 
 
-class LearningCloneTask(BaseAppTask):
-    """Task to clone the various learning instance."""
+class LearningClonePlanner:
+    """
+    Clones the CCMS courses & learning paths in bulk.
 
-    request_headers = None
+    The plan is built in phases. The full tree(learning paths, courses, modules & sub modules) is fetched from
+    CCMS first, `concurrency` requests at a time. All the distinct taxonomy names(category, language, skill,
+    role & hashtag) of the tree are resolved with one query per table & the missing ones are inserted with
+    one `bulk_create`. The learnings, modules, sub modules, M2M through rows & learning path courses are then
+    inserted with `bulk_create` in a single transaction.
+
+    Every occurrence of a course is cloned, a course present in two learning paths is cloned twice.
+    """
+
+    def __init__(self, request_headers, db_name, concurrency=CLONE_FETCH_CONCURRENCY):
+        self.request_headers = request_headers
+        self.db_name = db_name
+        self.concurrency = concurrency
+
+    def run_concurrently(self, function, items):
+        """
+        Runs the function for every item through the `fan_out` on the tenant db. Returns the results in order,
+        the first error of the calls is raised once all the calls are done.
+        """
+
+        with tenant_context(self.db_name):
+            results = fan_out(function, items, concurrency=self.concurrency)
+        if errors := [result.error for result in results if result.error]:
+            raise errors[0]
+        return [result.result for result in results]
+
+    def fetch_course(self, course_id):
+        """Returns the CCMS details of the course along with its modules & sub modules. `None` on failure."""
+
+        from apps.learning.helpers import get_ccms_retrieve_details
+        from apps.my_learning.helpers import get_ccms_list_details
+
+        course_success, course_details = get_ccms_retrieve_details(
+            learning_type="course", instance_id=course_id, request=self.request_headers
+        )
+        module_success, module_details = get_ccms_list_details(
+            learning_type="course_module", params={"course": course_id}, request=self.request_headers
+        )
+        sub_module_success, sub_module_details = get_ccms_list_details(
+            learning_type="course_submodule", params={"module__course__uuid": course_id}, request=self.request_headers
+        )
+        if not course_success or not module_success or not sub_module_success:
+            return None
+        return {
+            "detail": course_details["data"],
+            "modules": module_details["data"]["results"],
+            "sub_modules": sub_module_details["data"]["results"],
+        }
+
+    def fetch_learning_path(self, learning_path_id):
+        """Returns the CCMS details of the learning path along with its courses. `None` on failure."""
+
+        from apps.learning.helpers import get_ccms_retrieve_details
+        from apps.my_learning.helpers import get_ccms_list_details
+
+        lp_success, lp_details = get_ccms_retrieve_details(
+            learning_type="learning_path", instance_id=learning_path_id, request=self.request_headers
+        )
+        lp_course_success, lp_course_details = get_ccms_list_details(
+            learning_type="lp_course", params={"learning_path__uuid": learning_path_id}, request=self.request_headers
+        )
+        if not lp_success or not lp_course_success:
+            return None
+        return {"detail": lp_details["data"], "courses": lp_course_details["data"]["results"]}
+
+    def gather(self, course_ids, learning_path_ids):
+        """Fetches the full tree of the given learnings from CCMS. Returns the course & learning path details."""
+
+        learning_paths = dict(
+            zip(learning_path_ids, self.run_concurrently(self.fetch_learning_path, learning_path_ids))
+        )
+        child_course_ids = [
+            lp_course["course"]["uuid"]
+            for learning_path in learning_paths.values()
+            if learning_path
+            for lp_course in learning_path["courses"]
+        ]
+        unique_course_ids = list(dict.fromkeys([*course_ids, *child_course_ids]))
+        courses = dict(zip(unique_course_ids, self.run_concurrently(self.fetch_course, unique_course_ids)))
+        return courses, learning_paths
 
     @staticmethod
-    def get_common_learning_data(data):
-        """Function to return the common learning data."""
+    def resolve_names(model, names, is_case_insensitive=False):
+        """
+        Returns the instances of the given names keyed by the name(lower cased when case insensitive). Resolved
+        with one query, the missing names are inserted with one `bulk_create`.
+        """
 
-        from apps.learning.models import Category
-        from apps.meta.models import Language
+        def get_key(name):
+            """Returns the lookup key of the name."""
+
+            return name.lower() if is_case_insensitive else name
+
+        queryset = model.objects.annotate(lookup_name=Lower("name") if is_case_insensitive else F("name"))
+
+        def get_instances():
+            """Returns the existing instances of the names, the first one for the duplicate names."""
+
+            instances = {}
+            for instance in queryset.filter(lookup_name__in={get_key(name) for name in names}).order_by("id"):
+                instances.setdefault(instance.lookup_name, instance)
+            return instances
+
+        instances = get_instances()
+        missing_names = {get_key(name): name for name in names if get_key(name) not in instances}
+        if missing_names:
+            model.objects.bulk_create([model(name=name) for name in missing_names.values()], ignore_conflicts=True)
+            instances = get_instances()
+        return instances
+
+    def resolve_taxonomy(self, details):
+        """Resolves all the distinct taxonomy names of the given learning details. Returns instances per table."""
+
+        from apps.learning.models import Category, CategoryRole, CategorySkill
+        from apps.meta.models import Hashtag, Language
+
+        return {
+            "category": self.resolve_names(
+                Category, {detail["category"]["name"] for detail in details}, is_case_insensitive=True
+            ),
+            "language": self.resolve_names(
+                Language, {detail["language"]["name"] for detail in details if detail.get("language")}
+            ),
+            "skill": self.resolve_names(
+                CategorySkill, {skill.strip() for detail in details for skill in detail["skill"]}
+            ),
+            "role": self.resolve_names(
+                CategoryRole, {role.strip() for detail in details for role in detail["role"]}
+            ),
+            "hashtag": self.resolve_names(
+                Hashtag, {hashtag for detail in details for hashtag in detail["hashtag"]}
+            ),
+        }
+
+    @staticmethod
+    def get_common_learning_data(data, taxonomy):
+        """Function to return the common learning data."""
 
-        category_name = data["category"]["name"]
-        category, _ = Category.objects.get_or_create(name__iexact=category_name, defaults={"name": category_name})
-        if data.get("language"):
-            language, _ = Language.objects.get_or_create(
-                name=data["language"]["name"],
-            )
-            language_id = language.id
-        else:
-            language_id = None
         return {
             "name": data["name"].strip(),
             "description": data["description"],
-            "category": category,
+            "category": taxonomy["category"][data["category"]["name"].lower()],
             "start_date": data["start_date"],
             "end_date": data["end_date"],
-            "language_id": language_id,
+            "language": taxonomy["language"][data["language"]["name"]] if data.get("language") else None,
             "highlight": json.dumps(data["highlight"]),
             "prerequisite": data["prerequisite"],
             "proficiency": data["proficiency"],
@@ -51,46 +179,6 @@ class LearningCloneTask(BaseAppTask):
             "is_active": True,
         }
 
-    def get_lp_data(self, data):
-        """Function to return the learning path data."""
-
-        from apps.learning.models import LearningPathImageModel
-
-        if data.get("image"):
-            image = LearningPathImageModel.objects.create(image=data["image"]["image"])
-            image_id = image.id
-        else:
-            image_id = None
-        lp_data = self.get_common_learning_data(data)
-        lp_data.update(
-            {
-                "image_id": image_id,
-                "learning_type": data["learning_type"],
-                "no_of_courses": data["no_of_courses"],
-            }
-        )
-        return lp_data
-
-    def get_course_data(self, data):
-        """Function to return the course data."""
-
-        from apps.learning.models import CourseImageModel
-
-        if data.get("image"):
-            image = CourseImageModel.objects.create(image=data["image"]["image"])
-            image_id = image.id
-        else:
-            image_id = None
-        course_data = self.get_common_learning_data(data)
-        course_data.update(
-            {
-                "image_id": image_id,
-                "total_modules": data["total_modules"],
-                "total_sub_modules": data["total_sub_modules"],
-            }
-        )
-        return course_data
-
     @staticmethod
     def get_module_data(data):
         """Function to return the module data."""
@@ -121,128 +209,239 @@ class LearningCloneTask(BaseAppTask):
         }
 
     @staticmethod
-    def set_skill_role_hashtag(instance, skills, roles, category, hashtags):
-        """Function to get or create skills and roles."""
+    def create_learnings(model, image_model, details, taxonomy, code_prefix, extra_data):
+        """
+        Inserts the learnings of the given details along with their images with `bulk_create`, the codes are
+        generated as in `save`. Returns the created learnings in the order of the details.
+        """
+
+        images = image_model.objects.bulk_create(
+            [image_model(image=detail["image"]["image"]) for detail in details if detail.get("image")]
+        )
+        images = iter(images)
+        learnings = model.objects.bulk_create(
+            [
+                model(
+                    **LearningClonePlanner.get_common_learning_data(detail, taxonomy),
+                    image=next(images) if detail.get("image") else None,
+                    **extra_data(detail),
+                )
+                for detail in details
+            ]
+        )
+        for learning in learnings:
+            learning.code = f"{code_prefix}_{learning.pk + 1000}"
+        model.objects.bulk_update(learnings, ["code"])
+        return learnings
+
+    @staticmethod
+    def set_taxonomy(model, learnings, details, taxonomy):
+        """Sets the skill, role & hashtag of the learnings & adds the category to the skills & roles in bulk."""
 
         from apps.learning.models import CategoryRole, CategorySkill
-        from apps.meta.models import Hashtag
-
-        skill_objs, role_objs = [], []
-        for skill in skills:
-            skill, _ = CategorySkill.objects.get_or_create(name=skill.strip())
-            skill.category.add(category)
-            skill_objs.append(skill)
-        for role in roles:
-            role, _ = CategoryRole.objects.get_or_create(name=role.strip())
-            role.category.add(category)
-            role_objs.append(role)
-        instance.skill.set(skill_objs)
-        instance.role.set(role_objs)
-        hashtag_objs = [Hashtag.objects.get_or_create(name=hashtag)[0] for hashtag in hashtags]
-        instance.hashtag.set(hashtag_objs)
-        return True
 
-    def clone_course(self, learning_id, is_ccms_obj, **kwargs):
+        relations = {"skill": [], "role": [], "hashtag": []}
+        for learning, detail in zip(learnings, details):
+            relations["skill"] += [(learning, taxonomy["skill"][skill.strip()]) for skill in detail["skill"]]
+            relations["role"] += [(learning, taxonomy["role"][role.strip()]) for role in detail["role"]]
+            relations["hashtag"] += [(learning, taxonomy["hashtag"][hashtag]) for hashtag in detail["hashtag"]]
+        for field_name, pairs in relations.items():
+            field = model._meta.get_field(field_name)
+            through = field.remote_field.through
+            source, target = f"{field.m2m_field_name()}_id", f"{field.m2m_reverse_field_name()}_id"
+            through.objects.bulk_create(
+                [through(**{source: instance.id, target: related.id}) for instance, related in pairs],
+                ignore_conflicts=True,
+            )
+
+        for taxonomy_model, field_name in [(CategorySkill, "skill"), (CategoryRole, "role")]:
+            through = taxonomy_model.category.through
+            source = f"{taxonomy_model._meta.model_name}_id"
+            through.objects.bulk_create(
+                [
+                    through(**{source: related.id, "category_id": learning.category_id})
+                    for learning, related in relations[field_name]
+                ],
+                ignore_conflicts=True,
+            )
+        return relations
+
+    def clone_courses(self, course_details, taxonomy):
+        """Inserts the courses along with their modules, sub modules & taxonomy. Returns the created courses."""
+
+        from apps.learning.models import (
+            CategoryRole,
+            CategorySkill,
+            Course,
+            CourseImageModel,
+            CourseModule,
+            CourseSubModule,
+        )
+
+        details = [course["detail"] for course in course_details]
+        courses = self.create_learnings(
+            Course,
+            CourseImageModel,
+            details,
+            taxonomy,
+            "COURSE",
+            lambda detail: {
+                "total_modules": detail["total_modules"],
+                "total_sub_modules": detail["total_sub_modules"],
+            },
+        )
+        relations = self.set_taxonomy(Course, courses, details, taxonomy)
+
+        module_keys, modules = [], []
+        for index, (course, course_detail) in enumerate(zip(courses, course_details)):
+            for data in course_detail["modules"]:
+                module_keys.append((index, data["id"]))
+                modules.append(CourseModule(course=course, **self.get_module_data(data)))
+        modules = dict(zip(module_keys, CourseModule.objects.bulk_create(modules)))
+        CourseSubModule.objects.bulk_create(
+            [
+                CourseSubModule(module=modules[(index, data["module"])], **self.get_sub_module_data(data))
+                for index, course_detail in enumerate(course_details)
+                for data in course_detail["sub_modules"]
+            ]
+        )
+
+        CategorySkill.objects.filter(id__in={skill.id for _, skill in relations["skill"]}).skill_course_count_update()
+        CategoryRole.objects.filter(id__in={role.id for _, role in relations["role"]}).role_course_count_update()
+        for category in {course.category for course in courses}:
+            category.category_course_count_update()
+        return courses
+
+    def clone_learning_paths(self, learning_path_details, taxonomy, lp_courses):
+        """Inserts the learning paths along with their taxonomy & courses. Returns the created learning paths."""
+
+        from apps.learning.models import (
+            CategoryRole,
+            CategorySkill,
+            LearningPath,
+            LearningPathCourse,
+            LearningPathImageModel,
+        )
+
+        details = [learning_path["detail"] for learning_path in learning_path_details]
+        learning_paths = self.create_learnings(
+            LearningPath,
+            LearningPathImageModel,
+            details,
+            taxonomy,
+            "LP",
+            lambda detail: {"learning_type": detail["learning_type"], "no_of_courses": detail["no_of_courses"]},
+        )
+        relations = self.set_taxonomy(LearningPath, learning_paths, details, taxonomy)
+        LearningPathCourse.objects.bulk_create(
+            [
+                LearningPathCourse(
+                    learning_path=learning_path,
+                    course=course,
+                    sequence=lp_course_data["sequence"],
+                    course_unlock_date=lp_course_data["course_unlock_date"],
+                    is_mandatory=lp_course_data["is_mandatory"],
+                    is_locked=lp_course_data["is_locked"],
+                )
+                for learning_path, courses in zip(learning_paths, lp_courses)
+                for course, lp_course_data in courses
+            ]
+        )
+
+        CategorySkill.objects.filter(
+            id__in={skill.id for _, skill in relations["skill"]}
+        ).skill_learning_path_count_update()
+        CategoryRole.objects.filter(
+            id__in={role.id for _, role in relations["role"]}
+        ).role_learning_path_count_update()
+        for category in {learning_path.category for learning_path in learning_paths}:
+            category.category_learning_path_count_update()
+        return learning_paths
+
+    def clone(self, course_ids=(), learning_path_ids=()):
+        """
+        Clones the given CCMS courses & learning paths. The learnings which could not be fetched from CCMS are
+        skipped. Returns the ids of the cloned courses & learning paths.
+        """
+
+        from apps.learning.models import Course
+
+        courses, learning_paths = self.gather(course_ids, learning_path_ids)
+        root_courses = [courses[course_id] for course_id in course_ids if courses[course_id]]
+        valid_learning_paths = [
+            learning_path
+            for learning_path in learning_paths.values()
+            if learning_path and all(courses[lp_course["course"]["uuid"]] for lp_course in learning_path["courses"])
+        ]
+        child_courses = [
+            courses[lp_course["course"]["uuid"]]
+            for learning_path in valid_learning_paths
+            for lp_course in learning_path["courses"]
+        ]
+        taxonomy = self.resolve_taxonomy(
+            [course["detail"] for course in [*root_courses, *child_courses]]
+            + [learning_path["detail"] for learning_path in valid_learning_paths]
+        )
+
+        with transaction.atomic(using=Course.objects.db):
+            cloned_courses = self.clone_courses([*root_courses, *child_courses], taxonomy)
+            cloned_child_courses = iter(cloned_courses[len(root_courses) :])
+            lp_courses = [
+                [(next(cloned_child_courses), lp_course_data) for lp_course_data in learning_path["courses"]]
+                for learning_path in valid_learning_paths
+            ]
+            cloned_learning_paths = self.clone_learning_paths(valid_learning_paths, taxonomy, lp_courses)
+
+        self.run_concurrently(
+            lambda course: course.register_course_in_chat_service(request_headers=self.request_headers),
+            cloned_courses,
+        )
+        return {
+            "courses": [course.id for course in cloned_courses[: len(root_courses)]],
+            "learning_paths": [learning_path.id for learning_path in cloned_learning_paths],
+        }
+
+
+class LearningCloneTask(BaseAppTask):
+    """
+    Task to clone the various learning instance. The CCMS courses & learning paths are cloned in bulk
+    through the `LearningClonePlanner`.
+    """
+
+    request_headers = None
+
+    def clone_course(self, learning_id, **kwargs):
         """Function to clone course information."""
 
-        from apps.learning.helpers import get_ccms_retrieve_details
         from apps.learning.models import Course
-        from apps.my_learning.helpers import get_ccms_list_details
 
         self.logger.info("Cloning Course is in progress...")
-        if is_ccms_obj:
-            course_success, course_details = get_ccms_retrieve_details(
-                learning_type="course",
-                instance_id=learning_id,
-                request=self.request_headers,
-            )
-            module_success, module_details = get_ccms_list_details(
-                learning_type="course_module",
-                params={"course": learning_id},
-                request=self.request_headers,
-            )
-            sub_module_success, sub_module_details = get_ccms_list_details(
-                learning_type="course_submodule",
-                params={"module__course__uuid": learning_id},
-                request=self.request_headers,
-            )
-            if not course_success or not module_success or not sub_module_success:
-                return False
-            course_data = self.get_course_data(course_details["data"])
-            cloned_course = Course.objects.create(**course_data)
-            self.set_skill_role_hashtag(
-                cloned_course,
-                course_details["data"]["skill"],
-                course_details["data"]["role"],
-                course_data["category"],
-                course_details["data"]["hashtag"],
-            )
-            cloned_course.skill.all().skill_course_count_update()
-            cloned_course.role.all().role_course_count_update()
-            cloned_course.category.category_course_count_update()
-            module_objs = {}
-            for data in module_details["data"]["results"]:
-                module_data = self.get_module_data(data)
-                module_objs[data["id"]] = cloned_course.related_course_modules.create(**module_data)
-            for data in sub_module_details["data"]["results"]:
-                sub_mod_data = self.get_sub_module_data(data)
-                module_objs[data["module"]].related_course_sub_modules.create(**sub_mod_data)
-            cloned_course.register_course_in_chat_service(request_headers=self.request_headers)
-        else:
-            cloned_course = Course.objects.get(id=learning_id)
-            cloned_course.clone(request_headers=self.request_headers)
+        cloned_course = Course.objects.get(id=learning_id)
+        cloned_course.clone(request_headers=self.request_headers)
         self.logger.info(f"Course cloned successfully - {cloned_course.name}")
         return cloned_course.id
 
-    def clone_learning_path(self, learning_id, is_ccms_obj, **kwargs):
+    def clone_learning_path(self, learning_id, **kwargs):
         """Function to clone learning path."""
 
-        from apps.learning.helpers import get_ccms_retrieve_details
         from apps.learning.models import LearningPath
-        from apps.my_learning.helpers import get_ccms_list_details
 
         self.logger.info("Cloning Learning Path is in progress...")
-        if is_ccms_obj:
-            lp_success, lp_details = get_ccms_retrieve_details(
-                learning_type="learning_path",
-                instance_id=learning_id,
-                request=self.request_headers,
-            )
-            lp_course_success, lp_course_details = get_ccms_list_details(
-                learning_type="lp_course",
-                request=self.request_headers,
-                params={"learning_path__uuid": learning_id},
-            )
-            if not lp_success or not lp_course_success:
-                return False
-            lp_data = self.get_lp_data(lp_details["data"])
-            cloned_lp = LearningPath.objects.create(**lp_data)
-            self.set_skill_role_hashtag(
-                cloned_lp,
-                lp_details["data"]["skill"],
-                lp_details["data"]["role"],
-                lp_data["category"],
-                lp_details["data"]["hashtag"],
-            )
-            cloned_lp.skill.all().skill_learning_path_count_update()
-            cloned_lp.role.all().role_learning_path_count_update()
-            cloned_lp.category.category_learning_path_count_update()
-            for lp_course_data in lp_course_details["data"]["results"]:
-                cloned_course_id = self.clone_course(lp_course_data["course"]["uuid"], True, **kwargs)
-                lp_course = {
-                    "course_id": cloned_course_id,
-                    "sequence": lp_course_data["sequence"],
-                    "course_unlock_date": lp_course_data["course_unlock_date"],
-                    "is_mandatory": lp_course_data["is_mandatory"],
-                    "is_locked": lp_course_data["is_locked"],
-                }
-                cloned_lp.related_learning_path_courses.create(**lp_course)
-        else:
-            cloned_lp = LearningPath.objects.get(id=learning_id)
-            cloned_lp.clone()
+        cloned_lp = LearningPath.objects.get(id=learning_id)
+        cloned_lp.clone()
         self.logger.info(f"Learning Path cloned successfully - {cloned_lp.name}")
         return cloned_lp.id
 
+    def clone_ccms_learnings(self, db_name, course_ids=(), learning_path_ids=()):
+        """Function to clone the CCMS courses & learning paths in bulk."""
+
+        self.logger.info("Cloning CCMS learnings is in progress...")
+        cloned_ids = LearningClonePlanner(request_headers=self.request_headers, db_name=db_name).clone(
+            course_ids=list(course_ids), learning_path_ids=list(learning_path_ids)
+        )
+        self.logger.info(f"CCMS learnings cloned successfully - {cloned_ids}")
+        return cloned_ids
+
     def clone_skill_traveller(self, learning_id):
         """Function to clone skill traveller."""
 
@@ -263,12 +462,16 @@ class LearningCloneTask(BaseAppTask):
 
         try:
             match learning_type:
+                case AssignmentLearningTypeChoices.course if is_ccms_obj:
+                    self.clone_ccms_learnings(db_name, course_ids=learning_id)
                 case AssignmentLearningTypeChoices.course:
                     for course_id in learning_id:
-                        self.clone_course(course_id, is_ccms_obj, **kwargs)
+                        self.clone_course(course_id, **kwargs)
+                case AssignmentLearningTypeChoices.learning_path if is_ccms_obj:
+                    self.clone_ccms_learnings(db_name, learning_path_ids=learning_id)
                 case AssignmentLearningTypeChoices.learning_path:
                     for learning_path_id in learning_id:
-                        self.clone_learning_path(learning_path_id, is_ccms_obj, **kwargs)
+                        self.clone_learning_path(learning_path_id, **kwargs)
                 case AssignmentLearningTypeChoices.skill_traveller:
                     for skill_traveller_id in learning_id:
                         self.clone_skill_traveller(skill_traveller_id)
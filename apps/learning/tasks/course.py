@@ -1,37 +1,166 @@
 import csv
 import json
 import os
+import time
+from datetime import datetime
 
-from apps.common.helpers import convert_date_format
+from django.db import transaction
+from django.utils import timezone
+
+from apps.common.helpers import convert_date_format, save_xlsx_to_storage
 from apps.common.tasks import BaseAppTask
 
 
 class CourseBulkUploadTask(BaseAppTask):
-    """Task to bulk upload the courses."""
+    """
+    Task to bulk upload the courses.
+
+    The CSV is streamed & processed in chunks. The rows of a chunk are validated & grouped by the course code,
+    the categories, authors, languages, images, skills, roles, hashtags, feedback templates & assignments of the
+    chunk are resolved with one query per table & the missing ones are inserted with `bulk_create`. Each course
+    is then upserted in its own transaction, the module & sub module sequences are assigned in memory & the new
+    modules & sub modules are inserted with `bulk_create`. The invalid rows & the rows of the failed courses are
+    reported per row without aborting the upload.
+    """
+
+    chunk_size = 500
+    required_fields = ["course_category", "course_code", "course_name"]
+    date_fields = ["course_start_date", "course_end_date", "course_module_start_date", "course_module_end_date"]
+    position_fields = ["course_module_position", "course_sub_module_position"]
+    error_report_header = ["Row", "CourseCode", "CourseName", "Error"]
+
+    def __init__(self, *args, **kwargs):
+        """Overridden to set up the per-run state."""
+
+        super().__init__(*args, **kwargs)
+        self.errors = []
+
+    def add_error(self, row_number, course_detail, message):
+        """Track the error of the given row, used to create the error sheet."""
+
+        self.errors.append([row_number, course_detail.get("course_code"), course_detail.get("course_name"), message])
 
     @staticmethod
     def read_csv_file(file_path):
-        """Read CSV file and return list_of_course_details"""
+        """Streams the rows of the CSV file as dictionaries, along with the row number."""
 
         with open(file_path, encoding="utf-8", errors="ignore") as file:
-            csv_reader = csv.DictReader(file)
-            return list(csv_reader)
+            for row_number, course_detail in enumerate(csv.DictReader(file), start=2):
+                if any(course_detail.values()):
+                    yield row_number, course_detail
+
+    def iter_chunks(self, rows):
+        """Yields the streamed rows as chunks of `chunk_size`."""
+
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def split_names(names):
+        """Returns the stripped, non empty names of the given comma separated value."""
+
+        return [name.strip() for name in (names or "").split(",") if name.strip()]
+
+    @staticmethod
+    def get_position(position):
+        """Returns the given position as a number, `None` when it is empty."""
+
+        return int(str(position).strip()) if position else None
+
+    def get_valid_rows(self, chunk):
+        """
+        Validates the rows of the chunk & groups the valid ones by the course code, in the order of the file.
+        Invalid rows are tracked as errors.
+        """
+
+        course_rows = {}
+        for row_number, course_detail in chunk:
+            if missing_fields := [field for field in self.required_fields if not course_detail.get(field)]:
+                self.add_error(row_number, course_detail, f"Missing required values: {'/'.join(missing_fields)}")
+                continue
+            try:
+                for field in self.date_fields:
+                    convert_date_format(course_detail.get(field))
+            except ValueError:
+                self.add_error(row_number, course_detail, f"Invalid {field}, expected format is dd/mm/yyyy.")
+                continue
+            try:
+                for field in self.position_fields:
+                    self.get_position(course_detail.get(field))
+            except ValueError:
+                self.add_error(row_number, course_detail, f"Invalid {field}, expected a number.")
+                continue
+            course_rows.setdefault(course_detail["course_code"].strip(), []).append((row_number, course_detail))
+        return course_rows
+
+    def resolve_related_instances(self, course_details):
+        """
+        Resolves the related instances of all the given rows with one query per table, keyed by the value of the
+        row. The missing categories, authors, languages, images, skills, roles & hashtags are inserted with one
+        `bulk_create` per table.
+        """
+
+        from apps.learning.models import Assignment, Category, CategoryRole, CategorySkill, CourseImageModel
+        from apps.learning.tasks.clone import LearningClonePlanner
+        from apps.meta.config import FacultyTypeChoices
+        from apps.meta.models import Faculty, FeedbackTemplate, Hashtag, Language
+
+        def get_values(field):
+            """Returns the distinct non empty values of the given field."""
+
+            return {course_detail[field] for course_detail in course_details if course_detail.get(field)}
+
+        def get_instances(queryset, lookup, values):
+            """Returns the instances of the values keyed by the lookup value, the first one for the duplicates."""
+
+            instances = {}
+            for instance in queryset.filter(**{f"{lookup}__in": values}).order_by("id"):
+                instances.setdefault(str(getattr(instance, lookup)), instance)
+            return instances
+
+        resolve_names = LearningClonePlanner.resolve_names
+        resolved = {
+            "category": resolve_names(Category, get_values("course_category")),
+            "language": resolve_names(Language, get_values("course_language")),
+            "author": get_instances(
+                Faculty.objects.filter(type=FacultyTypeChoices.author), "name", get_values("course_author")
+            ),
+            "image": get_instances(CourseImageModel.objects.all(), "image", get_values("course_image_url")),
+            "feedback_template": get_instances(
+                FeedbackTemplate.objects.all(), "name", get_values("course_feedback_template")
+            ),
+            "assignment": get_instances(Assignment.objects.all(), "code", get_values("course_assignment_code")),
+        }
+        for author in Faculty.objects.bulk_create(
+            [
+                Faculty(name=name, type=FacultyTypeChoices.author)
+                for name in get_values("course_author")
+                if name not in resolved["author"]
+            ]
+        ):
+            resolved["author"][author.name] = author
+        for image in CourseImageModel.objects.bulk_create(
+            [CourseImageModel(image=url) for url in get_values("course_image_url") if url not in resolved["image"]]
+        ):
+            resolved["image"][str(image.image)] = image
+        taxonomy_models = [(CategorySkill, "course_skill"), (CategoryRole, "course_role"), (Hashtag, "course_hashtag")]
+        for model, field in taxonomy_models:
+            names = {name for course_detail in course_details for name in self.split_names(course_detail.get(field))}
+            resolved[field] = resolve_names(model, names)
+        return resolved
 
     @staticmethod
-    def get_course_data(course_detail, category):
+    def get_course_data(course_detail, resolved):
         """Function to get the course data."""
 
         from apps.learning.config import ProficiencyChoices
-        from apps.learning.models import CourseImageModel
-        from apps.meta.config import FacultyTypeChoices
-        from apps.meta.models import Faculty, Language
-
-        author = Faculty.objects.filter(name=course_detail["course_author"], type=FacultyTypeChoices.author).first()
-        if not author:
-            author = Faculty.objects.create(name=course_detail["course_author"], type=FacultyTypeChoices.author)
-        language = Language.objects.filter(name=course_detail["course_language"]).first()
-        if not language:
-            language = Language.objects.create(name=course_detail["course_language"])
+
         proficiency = course_detail["course_proficiency"].strip().lower()
         if proficiency not in [
             ProficiencyChoices.basic,
@@ -39,11 +168,7 @@ class CourseBulkUploadTask(BaseAppTask):
             ProficiencyChoices.advance,
         ]:
             proficiency = None
-        course_image = course_highlight = None
-        if course_detail["course_image_url"]:
-            course_image = CourseImageModel.objects.filter(image=course_detail["course_image_url"]).first()
-            if not course_image:
-                course_image = CourseImageModel.objects.create(image=course_detail["course_image_url"])
+        course_highlight = None
         if highlight := course_detail["course_highlight"]:
             if highlight.startswith("•"):
                 highlight = highlight[2:]
@@ -54,13 +179,13 @@ class CourseBulkUploadTask(BaseAppTask):
         return {
             "name": course_detail["course_name"].strip(),
             "description": course_detail["course_description"],
-            "category": category,
-            "code": course_detail["course_code"],
-            "image": course_image,
+            "category": resolved["category"][course_detail["course_category"]],
+            "code": course_detail["course_code"].strip(),
+            "image": resolved["image"].get(course_detail["course_image_url"]),
             "start_date": convert_date_format(course_detail["course_start_date"]),
             "end_date": convert_date_format(course_detail["course_end_date"]),
-            "author": author,
-            "language": language,
+            "author": resolved["author"].get(course_detail["course_author"]),
+            "language": resolved["language"].get(course_detail["course_language"]),
             "highlight": course_highlight,
             "prerequisite": course_detail["course_prerequisite"],
             "proficiency": proficiency,
@@ -81,41 +206,27 @@ class CourseBulkUploadTask(BaseAppTask):
         }
 
     @staticmethod
-    def get_course_module_data(course_detail, course):
+    def get_course_module_data(course_detail):
         """Function to get the course module data."""
 
-        if not course_detail["course_module_position"]:
-            max_position = (
-                course.related_course_modules.order_by("-sequence").values_list("sequence", flat=True).first()
-            )
-            course_detail["course_module_position"] = max_position + 1 if max_position else 1
         return {
             "name": course_detail["course_module_name"].strip(),
             "description": course_detail["course_module_description"],
-            "sequence": course_detail["course_module_position"],
             "start_date": convert_date_format(course_detail["course_module_start_date"]),
             "end_date": convert_date_format(course_detail["course_module_end_date"]),
             "is_mandatory": course_detail["course_module_is_mandatory"] or False,
         }
 
     @staticmethod
-    def get_course_sub_module_data(course_detail, course_module):
+    def get_course_sub_module_data(course_detail):
         """Function to get the course sub module data."""
 
         from apps.learning.config import SubModuleTypeChoices
         from apps.learning.helpers import convert_hms_to_sec
 
-        if not course_detail["course_sub_module_position"]:
-            max_position = (
-                course_module.related_course_sub_modules.order_by("-sequence")
-                .values_list("sequence", flat=True)
-                .first()
-            )
-            course_detail["course_sub_module_position"] = max_position + 1 if max_position else 1
         return {
             "name": course_detail["course_sub_module_name"].strip(),
             "description": course_detail["course_sub_module_description"],
-            "sequence": course_detail["course_sub_module_position"],
             "duration": convert_hms_to_sec(course_detail["course_sub_module_duration"]),
             "type": SubModuleTypeChoices.custom_url,
             "custom_url": course_detail["course_sub_module_url"].strip().replace(" ", "%20")
@@ -123,35 +234,40 @@ class CourseBulkUploadTask(BaseAppTask):
             else None,
         }
 
-    @staticmethod
-    def get_skill_role_hashtag_objects(skills, roles, category, hashtags):
-        """Function to get or create skills, roles and hashtags."""
-
-        from apps.learning.models import CategoryRole, CategorySkill
-        from apps.meta.models import Hashtag
-
-        skill_objs, role_objs, hashtag_objs = [], [], []
-        for skill in skills.split(","):
-            if skill:
-                skill_obj = CategorySkill.objects.filter(name=skill.strip()).first()
-                if not skill_obj:
-                    skill_obj = CategorySkill.objects.create(name=skill.strip())
-                skill_obj.category.add(category)
-                skill_objs.append(skill_obj)
-        for role in roles.split(","):
-            if role:
-                role_obj = CategoryRole.objects.filter(name=role.strip()).first()
-                if not role_obj:
-                    role_obj = CategoryRole.objects.create(name=role.strip())
-                role_obj.category.add(category)
-                role_objs.append(role_obj)
-        for hashtag in hashtags.split(","):
-            if hashtag:
-                hashtag_obj = Hashtag.objects.filter(name=hashtag.strip()).first()
-                if not hashtag_obj:
-                    hashtag_obj = Hashtag.objects.create(name=hashtag.strip())
-                hashtag_objs.append(hashtag_obj)
-        return skill_objs, role_objs, hashtag_objs
+    def upsert_children(self, model, instances, rows, get_data, position_field, **parent):
+        """
+        Upserts the modules/sub modules of the given rows under the given parent. The existing `instances` are
+        keyed by the lower cased name, the sequences are assigned in memory(the last sequence + 1 for the new
+        ones without a position) & the new ones are inserted with one `bulk_create`. Returns the upserted
+        instances keyed by the lower cased name.
+        """
+
+        last_sequence = max([instance.sequence or 0 for instance in instances.values()], default=0)
+        upserted, created, updated, update_fields = {}, [], {}, {"sequence", "modified_at"}
+        for _, course_detail in rows:
+            data = get_data(course_detail)
+            key = data["name"].lower()
+            if position := self.get_position(course_detail.get(position_field)):
+                data["sequence"] = position
+            if (instance := instances.get(key)) is None:
+                data.setdefault("sequence", last_sequence + 1)
+                instance = instances[key] = model(**parent, **data)
+                created.append(instance)
+            else:
+                for field, value in data.items():
+                    setattr(instance, field, value)
+                if instance.pk:
+                    updated[instance.pk] = instance
+                    update_fields.update(data)
+            last_sequence = max(last_sequence, instance.sequence or 0)
+            upserted[key] = instance
+
+        model.objects.bulk_create(created)
+        now = timezone.now()
+        for instance in updated.values():
+            instance.modified_at = now
+        model.objects.bulk_update(updated.values(), update_fields)
+        return upserted
 
     @staticmethod
     def process_course_assessment(course_detail, course, course_module=None):
@@ -179,88 +295,175 @@ class CourseBulkUploadTask(BaseAppTask):
                 assessment_qs.create(**course_assessment_data)
 
     @staticmethod
-    def process_course_assignment(course_detail, course, course_module=None):
+    def process_course_assignment(course_detail, assignment_instance, course, course_module=None):
         """Function to create course assignment."""
 
         from apps.learning.config import CommonLearningAssignmentTypeChoices
-        from apps.learning.models import Assignment
 
-        if assignment_instance := Assignment.objects.filter(code=course_detail["course_assignment_code"]).first():
-            assignment_data = {
-                "type": course_detail["course_assignment_type"].strip().lower(),
+        assignment_data = {
+            "type": course_detail["course_assignment_type"].strip().lower(),
+        }
+        assignment_qs = None
+        if course_module and assignment_data["type"] == CommonLearningAssignmentTypeChoices.dependent_assignment:
+            assignment_qs = getattr(course_module, "related_course_assignments")
+        elif assignment_data["type"] == CommonLearningAssignmentTypeChoices.final_assignment:
+            assignment_qs = getattr(course, "related_course_assignments")
+        if assignment_qs:
+            last_assignment_instance = assignment_qs.order_by("-sequence").first()
+            assignment_data["sequence"] = last_assignment_instance.sequence + 1 if last_assignment_instance else 1
+            assignment_obj = assignment_qs.filter(assignment=assignment_instance).first()
+            if not assignment_obj:
+                assignment_qs.create(assignment=assignment_instance, **assignment_data)
+
+    def process_course(self, course_code, rows, resolved):
+        """
+        Upserts the course of the given rows along with its modules, sub modules, taxonomy & dependencies. The
+        course data & taxonomy are taken from the last row of the course. Returns the upserted course.
+        """
+
+        from apps.learning.models import CategoryRole, CategorySkill, Course, CourseModule, CourseSubModule
+
+        course_detail = rows[-1][1]
+        course_data = self.get_course_data(course_detail, resolved)
+        course, _ = Course.objects.update_or_create(code=course_code, defaults=course_data)
+        course.skill.set([resolved["course_skill"][name] for name in self.split_names(course_detail["course_skill"])])
+        course.role.set([resolved["course_role"][name] for name in self.split_names(course_detail["course_role"])])
+        course.hashtag.set(
+            [resolved["course_hashtag"][name] for name in self.split_names(course_detail["course_hashtag"])]
+        )
+        for taxonomy_model, field in [(CategorySkill, "course_skill"), (CategoryRole, "course_role")]:
+            through = taxonomy_model.category.through
+            source = f"{taxonomy_model._meta.model_name}_id"
+            through.objects.bulk_create(
+                [
+                    through(
+                        **{
+                            source: resolved[field][name].id,
+                            "category_id": resolved["category"][detail["course_category"]].id,
+                        }
+                    )
+                    for _, detail in rows
+                    for name in self.split_names(detail[field])
+                ],
+                ignore_conflicts=True,
+            )
+        course.feedback_template.add(
+            *{
+                resolved["feedback_template"][detail["course_feedback_template"]]
+                for _, detail in rows
+                if detail["course_is_feedback_enabled"]
+                and detail["course_feedback_template"] in resolved["feedback_template"]
             }
-            assignment_qs = None
-            if course_module and assignment_data["type"] == CommonLearningAssignmentTypeChoices.dependent_assignment:
-                assignment_qs = getattr(course_module, "related_course_assignments")
-            elif assignment_data["type"] == CommonLearningAssignmentTypeChoices.final_assignment:
-                assignment_qs = getattr(course, "related_course_assignments")
-            if assignment_qs:
-                last_assignment_instance = assignment_qs.order_by("-sequence").first()
-                assignment_data["sequence"] = last_assignment_instance.sequence + 1 if last_assignment_instance else 1
-                assignment_obj = assignment_qs.filter(assignment=assignment_instance).first()
-                if not assignment_obj:
-                    assignment_qs.create(assignment=assignment_instance, **assignment_data)
+        )
+
+        module_rows = [row for row in rows if row[1].get("course_module_name")]
+        modules = {}
+        for module in course.related_course_modules.order_by("id"):
+            modules.setdefault(module.name.lower(), module)
+        modules = self.upsert_children(
+            CourseModule,
+            modules,
+            module_rows,
+            self.get_course_module_data,
+            "course_module_position",
+            course=course,
+        )
+        sub_module_rows = {}
+        for row in module_rows:
+            if row[1].get("course_sub_module_name"):
+                sub_module_rows.setdefault(row[1]["course_module_name"].strip().lower(), []).append(row)
+        sub_modules = {}
+        for sub_module in CourseSubModule.objects.filter(
+            module__in=[modules[key] for key in sub_module_rows]
+        ).order_by("id"):
+            sub_modules.setdefault(sub_module.module_id, {}).setdefault(sub_module.name.lower(), sub_module)
+        for key, module_sub_module_rows in sub_module_rows.items():
+            module = modules[key]
+            self.upsert_children(
+                CourseSubModule,
+                sub_modules.get(module.id, {}),
+                module_sub_module_rows,
+                self.get_course_sub_module_data,
+                "course_sub_module_position",
+                module=module,
+            )
+            module.module_duration_update()
+        if sub_module_rows:
+            course.course_duration_count_update()
+
+        for _, detail in rows:
+            course_module = modules.get((detail.get("course_module_name") or "").strip().lower())
+            if detail.get("course_assessment_name"):
+                self.process_course_assessment(detail, course, course_module)
+            if assignment := resolved["assignment"].get(detail.get("course_assignment_code")):
+                self.process_course_assignment(detail, assignment, course, course_module)
+        return course
+
+    def process_chunk(self, chunk):
+        """
+        Resolves the related instances of the chunk in bulk & upserts its courses, one transaction per course.
+        The rows of a failed course are tracked as errors. Returns the count of the upserted courses.
+        """
+
+        from apps.learning.models import Category, CategoryRole, CategorySkill, Course
+
+        course_rows = self.get_valid_rows(chunk)
+        resolved = self.resolve_related_instances([detail for rows in course_rows.values() for _, detail in rows])
+        courses = []
+        for course_code, rows in course_rows.items():
+            try:
+                with transaction.atomic(using=Course.objects.db):
+                    courses.append(self.process_course(course_code, rows, resolved))
+            except Exception as e:
+                self.logger.info(f"Error while processing the course {course_code}: {e}")
+                for row_number, course_detail in rows:
+                    self.add_error(row_number, course_detail, str(e))
+
+        course_ids = [course.id for course in courses]
+        CategoryRole.objects.filter(related_courses__in=course_ids).distinct().role_course_count_update()
+        CategorySkill.objects.filter(related_courses__in=course_ids).distinct().skill_course_count_update()
+        for category in Category.objects.filter(id__in={course.category_id for course in courses}):
+            category.category_course_count_update()
+        return len(courses)
 
     def run(self, file_path, db_name, **kwargs):
         """Run handler."""
 
-        from apps.learning.models import Category, Course
-        from apps.meta.models import FeedbackTemplate
-
         self.switch_db(db_name)
         self.logger.info("Executing CourseBulkUploadTask.")
-        list_of_course_details = self.read_csv_file(file_path)
+        self.errors, started_at, processed_count, rows_count = [], time.perf_counter(), 0, 0
 
-        for course_detail in list_of_course_details:
-            category_name = course_detail.get("course_category")
-            if not category_name:
-                continue
+        for chunk in self.iter_chunks(self.read_csv_file(file_path)):
+            rows_count += len(chunk)
             try:
-                category = Category.objects.filter(name=category_name).first()
-                if not category:
-                    category = Category.objects.create(name=category_name)
-                course_data = self.get_course_data(course_detail, category)
-                course, _ = Course.objects.update_or_create(code=course_data["code"], defaults=course_data)
-                skill_objs, role_objs, hashtag_objs = self.get_skill_role_hashtag_objects(
-                    course_detail["course_skill"],
-                    course_detail["course_role"],
-                    category,
-                    course_detail["course_hashtag"],
-                )
-                if course_data["is_feedback_enabled"] and course_detail["course_feedback_template"]:
-                    feedback_template = FeedbackTemplate.objects.filter(name=course_detail["course_feedback_template"])
-                    if feedback_template.exists():
-                        course.feedback_template.add(feedback_template.first())
-                course.skill.set(skill_objs)
-                course.role.set(role_objs)
-                course.hashtag.set(hashtag_objs)
-                course.role.all().role_course_count_update()
-                course.skill.all().skill_course_count_update()
-                course.category.category_course_count_update()
-                course_module = None
-                if course_detail.get("course_module_name"):
-                    course_module_data = self.get_course_module_data(course_detail, course)
-                    course_module, _ = course.related_course_modules.update_or_create(
-                        name__iexact=course_module_data["name"],
-                        defaults=course_module_data,
-                    )
-                    if course_detail.get("course_sub_module_name"):
-                        course_sub_module_data = self.get_course_sub_module_data(course_detail, course_module)
-                        course_sub_module, _ = course_module.related_course_sub_modules.update_or_create(
-                            name__iexact=course_sub_module_data["name"],
-                            defaults=course_sub_module_data,
-                        )
-                        course_sub_module.module.module_duration_update()
-                        course_sub_module.module.course.course_duration_count_update()
-                if course_detail.get("course_assessment_name"):
-                    self.process_course_assessment(course_detail, course, course_module)
-                if course_detail.get("course_assignment_code"):
-                    self.process_course_assignment(course_detail, course, course_module)
+                processed_count += self.process_chunk(chunk)
             except Exception as e:
-                self.logger.info(f"Error while processing {course_detail['course_name']}: {e}")
+                self.logger.info(f"Error while processing the chunk: {e}")
+                for row_number, course_detail in chunk:
+                    self.add_error(row_number, course_detail, str(e))
+
+        error_sheet_url = None
+        if self.errors:
+            file_name = f"errors_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx"
+            error_sheet_url = save_xlsx_to_storage(
+                file_name=f"files/{db_name}/course_bulk_upload/{file_name}",
+                header=self.error_report_header,
+                rows=sorted(self.errors, key=lambda _: _[0]),
+            )
         try:
             os.remove(file_path)
         except FileNotFoundError:
             pass
-
-        return True
+        duration = time.perf_counter() - started_at
+        self.logger.info(
+            f"CourseBulkUploadTask completed. Rows: {rows_count}, Courses: {processed_count}, "
+            f"Errors: {len(self.errors)}, Rows/Sec: {rows_count / duration if duration else rows_count:.2f}, "
+            f"Error Sheet: {error_sheet_url}"
+        )
+        return {
+            "total": rows_count,
+            "processed": processed_count,
+            "failed": len(self.errors),
+            "rows_per_second": round(rows_count / duration, 2) if duration else rows_count,
+            "error_sheet_url": error_sheet_url,
+        }
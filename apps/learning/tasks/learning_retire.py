@@ -1,40 +1,151 @@
 from datetime import datetime
 
+from django.db import connections, router
+
+from apps.common.tasks import BaseAppTask
+from apps.my_learning.config import AllBaseLearningTypeChoices
 from apps.tenant_service.middlewares import set_db_for_router
 from config.celery_app import app as celery_app
 
+# learning types which can be retired along with the model name in the `learning` app.
+RETIRABLE_LEARNING_MODELS = {
+    AllBaseLearningTypeChoices.course: "Course",
+    AllBaseLearningTypeChoices.learning_path: "LearningPath",
+    AllBaseLearningTypeChoices.advanced_learning_path: "AdvancedLearningPath",
+    AllBaseLearningTypeChoices.skill_traveller: "SkillTraveller",
+    AllBaseLearningTypeChoices.assignment: "Assignment",
+    AllBaseLearningTypeChoices.assignment_group: "AssignmentGroup",
+}
+
+
+def retire_learnings(retirement_date):
+    """
+    Retires the learnings of the current tenant whose retirement date is before the given date. Every model
+    is retired with a single `UPDATE ... RETURNING` statement. Returns the retired `{learning_type: {id: name}}`.
+    """
+
+    from django.apps import apps
+
+    retired_learnings = {}
+    for learning_type, model_name in RETIRABLE_LEARNING_MODELS.items():
+        model = apps.get_model("learning", model_name)
+        column = {field: model._meta.get_field(field).column for field in ["is_retired", "is_active", "name"]}
+        column["retirement_date"] = model._meta.get_field("retirement_date").column
+        with connections[router.db_for_write(model)].cursor() as cursor:
+            cursor.execute(
+                f'UPDATE "{model._meta.db_table}" '
+                f'SET "{column["is_retired"]}" = true, "{column["is_active"]}" = false '
+                f'WHERE "{column["is_retired"]}" = false AND "{column["retirement_date"]}" < %s '
+                f'RETURNING "{model._meta.pk.column}", "{column["name"]}"',
+                [retirement_date],
+            )
+            if rows := cursor.fetchall():
+                retired_learnings[learning_type] = dict(rows)
+    return retired_learnings
+
+
+class LearningRetiredTask(BaseAppTask):
+    """
+    Handles the `learnings retired` event of a tenant. Refreshes the aggregates of the catalogues holding
+    the retired learnings, invalidates the tenant's cached listings & optionally notifies the enrolled
+    learners in bulk.
+    """
+
+    @staticmethod
+    def notify_learners(retired_learnings):
+        """Notifies the learners enrolled, directly or via their groups, to the retired learnings in bulk."""
+
+        from apps.access_control.models import UserGroup
+        from apps.my_learning.models import Enrollment
+        from apps.notification.config import NotifyActionChoices
+        from apps.notification.models import Notification
+
+        notifications = []
+        for learning_type, learnings in retired_learnings.items():
+            lookup = f"{learning_type}_id"
+            enrollments = Enrollment.objects.filter(is_enrolled=True, **{f"{lookup}__in": learnings.keys()})
+            learning_users = set(enrollments.filter(user__isnull=False).values_list(lookup, "user_id"))
+            group_learnings = {}
+            for group_id, learning_id in enrollments.filter(user_group__isnull=False).values_list(
+                "user_group_id", lookup
+            ):
+                group_learnings.setdefault(group_id, set()).add(learning_id)
+            for group_id, user_id in UserGroup.members.through.objects.filter(
+                usergroup_id__in=group_learnings.keys()
+            ).values_list("usergroup_id", "user_id"):
+                learning_users.update((learning_id, user_id) for learning_id in group_learnings[group_id])
+            for learning_id, user_id in learning_users:
+                message, data = Notification.notify_details(
+                    NotifyActionChoices.learning_retired,
+                    obj_name=learnings[learning_id],
+                    learning_type=learning_type,
+                    **{lookup: learning_id},
+                )
+                notifications.append(Notification(user_id=user_id, message=message, data=data))
+        Notification.objects.bulk_create(notifications)
+        return len(notifications)
+
+    def run(self, db_name, retired_learnings, notify_learners=False, **kwargs):
+        """Run handler."""
+
+        from apps.common.cache_management import cache_manager
+        from apps.learning.models import Catalogue
+        from apps.learning.tasks import UpdateCatalogueLearningDataTask
+
+        self.switch_db(db_name)
+        self.logger.info("Executing LearningRetiredTask")
+
+        # the ids are serialized as the json keys
+        retired_learnings = {
+            learning_type: {int(learning_id): name for learning_id, name in learnings.items()}
+            for learning_type, learnings in retired_learnings.items()
+        }
+        catalogue_ids = set()
+        for learning_type, learnings in retired_learnings.items():
+            catalogue_ids.update(
+                Catalogue.objects.filter(**{f"{learning_type}__in": learnings.keys()}).values_list("id", flat=True)
+            )
+        if catalogue_ids:
+            UpdateCatalogueLearningDataTask().run_task(catalogue_ids=list(catalogue_ids), db_name=db_name)
+        cache_manager.clear_tenant_cache()
+        if notify_learners:
+            self.logger.info(f"{self.notify_learners(retired_learnings)} learners notified of the retired learnings.")
+        return True
+
+
+def retire_tenant_learnings(db_name, retirement_date, notify_learners=False):
+    """
+    Retires the learnings of the given tenant, activated by the caller, & publishes the `learnings retired`
+    event when any retired.
+    """
+
+    retired_learnings = retire_learnings(retirement_date)
+    if retired_learnings:
+        LearningRetiredTask().run_task(
+            db_name=db_name, retired_learnings=retired_learnings, notify_learners=notify_learners
+        )
+    return {learning_type: len(learnings) for learning_type, learnings in retired_learnings.items()}
+
 
 @celery_app.task
-def handle_learning_retire():
-    """Cron job to retire the learnings."""
+def handle_learning_retire(notify_learners=False, concurrency=4):
+    """Cron job to retire the learnings, runs for the tenants in parallel."""
 
     print("Learning Retirement Task - working")
     from apps.learning.config import BaseUploadStatusChoices
-    from apps.learning.models import (
-        AdvancedLearningPath,
-        Assignment,
-        AssignmentGroup,
-        Course,
-        LearningPath,
-        SkillTraveller,
-    )
+    from apps.tenant_service.helpers import run_for_tenants
     from apps.tenant_service.models import DatabaseRouter
 
     current_date = datetime.today().date()
-    filter_params = {
-        "is_retired": False,
-        "retirement_date__lt": current_date,
-    }
     set_db_for_router()
-    for router in DatabaseRouter.objects.filter(setup_status=BaseUploadStatusChoices.completed):
-        print(f"\n** Getting Retirement Objects for {router.database_name}. **")
-        router.add_db_connection()
-        set_db_for_router(router.database_name)
-        Course.objects.filter(**filter_params).update(is_retired=True, is_active=False)
-        LearningPath.objects.filter(**filter_params).update(is_retired=True, is_active=False)
-        AdvancedLearningPath.objects.filter(**filter_params).update(is_retired=True, is_active=False)
-        SkillTraveller.objects.filter(**filter_params).update(is_retired=True, is_active=False)
-        Assignment.objects.filter(**filter_params).update(is_retired=True, is_active=False)
-        AssignmentGroup.objects.filter(**filter_params).update(is_retired=True, is_active=False)
-        set_db_for_router()
+    results = run_for_tenants(
+        DatabaseRouter.objects.filter(setup_status=BaseUploadStatusChoices.completed),
+        lambda tracker: retire_tenant_learnings(tracker.database_name, current_date, notify_learners),
+        concurrency=concurrency,
+    )
+    for tracker, retired_counts, error in results:
+        if error:
+            print(f"\n** Learning retirement failed for {tracker.database_name}: {error} **")
+        elif retired_counts:
+            print(f"\n** Retired learnings for {tracker.database_name}: {retired_counts} **")
     return True
@@ -84,3 +84,34 @@ class AnnouncementTypeChoices(DjangoChoices):
     user_level = ChoiceItem("user_level", "User Level")
     user_group_level = ChoiceItem("user_group_level", "User Group Level")
     tenant_level = ChoiceItem("tenant_level", "Tenant Level")
+
+
+class FeedActivityTypeChoices(DjangoChoices):
+    """Choices for the user feed activity types."""
+
+    enrolled = ChoiceItem("enrolled", "Enrolled")
+    completed = ChoiceItem("completed", "Completed")
+    post_liked = ChoiceItem("post_liked", "Post Liked")
+
+
+# Actors with a bigger audience(followers & friends) are not fanned out on write, their activities
+# are read from the source tables while building the feed instead(fan-out on read).
+USER_FEED_FAN_OUT_LIMIT = 1000
+USER_FEED_PAGE_SIZE = 10
+# Recent activities of the actor, per activity type, pushed to the feed of a new follower or friend.
+USER_FEED_BACKFILL_LIMIT = 50
+
+# `UserDetail` fields allowed in the `AutoAssignmentRule.user_detail_filter`, as {field: [values]}.
+AUTO_ASSIGNMENT_USER_DETAIL_FIELDS = [
+    "user_grade",
+    "business_unit_name",
+    "organization_unit_id",
+    "is_onsite_user",
+    "employment_status",
+    "job_description",
+    "current_country",
+    "current_state",
+    "current_city",
+]
+# Matched users of an auto assignment rule are assigned in batches of this size.
+AUTO_ASSIGNMENT_BATCH_SIZE = 1000
@@ -1,5 +1,7 @@
+from asgiref.sync import sync_to_async
 from django.utils import timezone
 
+from apps.common.async_communicator import async_get_request
 from apps.common.communicator import get_request
 from apps.common.helpers import process_request_headers
 from apps.leaderboard.config import BadgeCategoryChoices, MilestoneChoices
@@ -221,6 +223,18 @@ def get_ccms_list_details(request, learning_type, params):
     )
 
 
+async def async_get_ccms_list_details(request, learning_type, params):
+    """Async variant of `get_ccms_list_details`, used by the async gateway views."""
+
+    headers = await sync_to_async(process_request_headers)(request)
+    return await async_get_request(
+        service="CCMS",
+        url_path=f"api/v1/{CCMS_URL_RELATED_KEYS.get(learning_type)}/list/",
+        params=params,
+        headers=headers,
+    )
+
+
 def get_ccms_tracker_details(user, learning_type, ccms_id):
     """Returns the ccms tracker details."""
 
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.3 on 2026-10-19 10:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("forum", "0005_alter_forumimagemodel_image_and_more"),
+        ("my_learning", "0034_enrollmentreminder"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserFeedActivity",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("uuid", models.UUIDField(blank=True, default=uuid.uuid4, null=True, unique=True)),
+                ("ss_id", models.IntegerField(blank=True, default=None, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("modified_at", models.DateTimeField(auto_now=True)),
+                (
+                    "activity_type",
+                    models.CharField(
+                        choices=[("enrolled", "Enrolled"), ("completed", "Completed"), ("post_liked", "Post Liked")],
+                        max_length=512,
+                    ),
+                ),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_actor_feed_activities",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "enrollment",
+                    models.ForeignKey(
+                        blank=True,
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="my_learning.enrollment",
+                    ),
+                ),
+                (
+                    "post_like",
+                    models.ForeignKey(
+                        blank=True,
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="forum.postlike",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at", "-id"],
+                "abstract": False,
+                "default_related_name": "related_user_feed_activities",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "activity_type", "-created_at", "-id"], name="user_feed_cursor_idx"
+                    )
+                ],
+            },
+        ),
+    ]
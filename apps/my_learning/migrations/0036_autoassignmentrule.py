@@ -0,0 +1,101 @@
+# Generated by Django 4.2.3 on 2026-10-19 14:20
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, migrations, models
+import django.db.models.deletion
+import uuid
+
+# catalogues & courses which were hardcoded in the `AutoAssignLearningTask` for the Prolifics tenant
+PROLIFICS_TENANT_IDP_ID = 482
+PROLIFICS_CATALOGUE_IDS = [8868, 8870]
+PROLIFICS_COURSE_IDS = [14079, 15635, 15636, 15663, 15664]
+
+
+def create_prolifics_rule(apps, schema_editor):
+    """Moves the hardcoded auto assignment of the Prolifics tenant to a rule, only on the tenant's database."""
+
+    DatabaseRouter = apps.get_model("tenant_service", "DatabaseRouter")
+    if not DatabaseRouter.objects.using(DEFAULT_DB_ALIAS).filter(
+        database_name=schema_editor.connection.settings_dict["NAME"], tenant__idp_id=PROLIFICS_TENANT_IDP_ID
+    ).exists():
+        return
+
+    db_alias = schema_editor.connection.alias
+    AutoAssignmentRule = apps.get_model("my_learning", "AutoAssignmentRule")
+    Catalogue = apps.get_model("learning", "Catalogue")
+    Course = apps.get_model("learning", "Course")
+    rule = AutoAssignmentRule.objects.using(db_alias).create(name="Prolifics", is_for_all_users=True)
+    rule.catalogue.set(Catalogue.objects.using(db_alias).filter(id__in=PROLIFICS_CATALOGUE_IDS))
+    rule.course.set(
+        Course.objects.using(db_alias).filter(
+            id__in=PROLIFICS_COURSE_IDS, is_archive=False, is_active=True, is_deleted=False
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("access_control", "0004_alter_policy_uuid_alter_policycategory_uuid_and_more"),
+        ("learning", "0048_remove_assignment_author_assignment_author"),
+        ("meta", "0014_alter_city_name_alter_country_name_alter_state_name"),
+        ("tenant_service", "0004_tenantmigrationrun_tenantmigrationlog"),
+        ("my_learning", "0035_userfeedactivity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AutoAssignmentRule",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("uuid", models.UUIDField(blank=True, default=uuid.uuid4, null=True, unique=True)),
+                ("ss_id", models.IntegerField(blank=True, default=None, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("modified_at", models.DateTimeField(auto_now=True)),
+                ("name", models.CharField(max_length=512)),
+                ("description", models.TextField(blank=True, default=None, null=True)),
+                ("is_for_all_users", models.BooleanField(default=False)),
+                ("user_detail_filter", models.JSONField(default=dict)),
+                ("end_date", models.DateTimeField(blank=True, default=None, null=True)),
+                ("is_active", models.BooleanField(default=True)),
+                ("last_evaluated_at", models.DateTimeField(blank=True, default=None, null=True)),
+                ("last_evaluation", models.JSONField(default=dict)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_DEFAULT,
+                        related_name="created_by_%(class)s",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "modified_by",
+                    models.ForeignKey(
+                        blank=True,
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_DEFAULT,
+                        related_name="modified_by_%(class)s",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("user_group", models.ManyToManyField(blank=True, to="access_control.usergroup")),
+                ("job_title", models.ManyToManyField(blank=True, to="meta.jobtitle")),
+                ("department_code", models.ManyToManyField(blank=True, to="meta.departmentcode")),
+                ("department_title", models.ManyToManyField(blank=True, to="meta.departmenttitle")),
+                ("catalogue", models.ManyToManyField(blank=True, to="learning.catalogue")),
+                ("course", models.ManyToManyField(blank=True, to="learning.course")),
+                ("learning_path", models.ManyToManyField(blank=True, to="learning.learningpath")),
+                ("advanced_learning_path", models.ManyToManyField(blank=True, to="learning.advancedlearningpath")),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "abstract": False,
+                "default_related_name": "related_auto_assignment_rules",
+            },
+        ),
+        migrations.RunPython(create_prolifics_rule, migrations.RunPython.noop),
+    ]
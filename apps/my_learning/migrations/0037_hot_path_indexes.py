@@ -0,0 +1,58 @@
+# Generated by Django 4.2.3 on 2026-10-19 12:30
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # indexes are built `CONCURRENTLY`, which can not run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("my_learning", "0036_autoassignmentrule"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="enrollment",
+            index=models.Index(fields=["user", "learning_type", "is_enrolled"], name="enrollment_user_type_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="enrollment",
+            index=models.Index(
+                condition=models.Q(("user_group__isnull", False)),
+                fields=["user_group", "learning_type"],
+                name="enrollment_group_type_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="usercoursetracker",
+            index=models.Index(fields=["user", "course"], name="course_tracker_user_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="usercoursetracker",
+            index=models.Index(
+                condition=models.Q(("ccms_id__isnull", False)), fields=["ccms_id"], name="course_tracker_ccms_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="userlearningpathtracker",
+            index=models.Index(fields=["user", "learning_path"], name="lp_tracker_user_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="userlearningpathtracker",
+            index=models.Index(
+                condition=models.Q(("ccms_id__isnull", False)), fields=["ccms_id"], name="lp_tracker_ccms_idx"
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="useralptracker",
+            index=models.Index(fields=["user", "advanced_learning_path"], name="alp_tracker_user_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="useralptracker",
+            index=models.Index(
+                condition=models.Q(("ccms_id__isnull", False)), fields=["ccms_id"], name="alp_tracker_ccms_idx"
+            ),
+        ),
+    ]
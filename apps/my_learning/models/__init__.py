@@ -40,3 +40,5 @@ from .feedback import FeedbackResponse
 from .report import Report
 from .announcement import Announcement, AnnouncementImageModel
 from .tracker.skill_ontology import UserSkillOntologyTracker
+from .user_feed import UserFeedActivity
+from .auto_assignment import AutoAssignmentRule
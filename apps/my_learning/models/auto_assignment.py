@@ -0,0 +1,96 @@
+from django.db import models
+from django.db.models import Q
+
+from apps.common.models import COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG, CreationAndModificationModel, NameModel
+from apps.my_learning.config import EnrollmentTypeChoices
+
+
+class AutoAssignmentRule(CreationAndModificationModel, NameModel):
+    """
+    Declarative rule to auto assign catalogues & learnings to the users. A user matches the rule when all the
+    given conditions are satisfied, where a condition is satisfied by any of its values. The rules are evaluated
+    set-wise by the `AutoAssignLearningTask` on user creation, bulk user upload & rule changes.
+
+    Model Fields -
+        PK          - id,
+        FK          - created_by, modified_by
+        M2M         - user_group, job_title, department_code, department_title, catalogue, course,
+                      learning_path, advanced_learning_path
+        Fields      - uuid, name, description, user_detail_filter, last_evaluation
+        Datetime    - created_at, modified_at, end_date, last_evaluated_at
+        Bool        - is_active, is_for_all_users
+    """
+
+    class Meta(NameModel.Meta):
+        default_related_name = "related_auto_assignment_rules"
+
+    learning_types = [
+        EnrollmentTypeChoices.course,
+        EnrollmentTypeChoices.learning_path,
+        EnrollmentTypeChoices.advanced_learning_path,
+    ]
+    prefetch_fields = [
+        "user_group",
+        "job_title",
+        "department_code",
+        "department_title",
+        "catalogue",
+        *learning_types,
+    ]
+
+    description = models.TextField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+
+    # conditions
+    is_for_all_users = models.BooleanField(default=False)
+    user_group = models.ManyToManyField("access_control.UserGroup", blank=True)
+    job_title = models.ManyToManyField("meta.JobTitle", blank=True)
+    department_code = models.ManyToManyField("meta.DepartmentCode", blank=True)
+    department_title = models.ManyToManyField("meta.DepartmentTitle", blank=True)
+    user_detail_filter = models.JSONField(default=dict)
+
+    # assignments
+    catalogue = models.ManyToManyField("learning.Catalogue", blank=True)
+    course = models.ManyToManyField("learning.Course", blank=True)
+    learning_path = models.ManyToManyField("learning.LearningPath", blank=True)
+    advanced_learning_path = models.ManyToManyField("learning.AdvancedLearningPath", blank=True)
+    end_date = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+
+    is_active = models.BooleanField(default=True)
+    last_evaluated_at = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+    last_evaluation = models.JSONField(default=dict)
+
+    def get_conditions(self):
+        """
+        Returns the conditions of the rule as a single `Q` on the users. Returns None when the rule has no
+        conditions & is not for all the users. Expects the `prefetch_fields` to be prefetched.
+        """
+
+        from apps.access_control.models import UserGroup
+
+        conditions = []
+        if group_ids := [group.id for group in self.user_group.all()]:
+            members = UserGroup.members.through.objects.filter(usergroup_id__in=group_ids)
+            conditions.append(Q(id__in=members.values("user_id")))
+        for field in ["job_title", "department_code", "department_title"]:
+            if ids := [instance.id for instance in getattr(self, field).all()]:
+                conditions.append(Q(**{f"related_user_details__{field}_id__in": ids}))
+        for field, values in self.user_detail_filter.items():
+            conditions.append(Q(**{f"related_user_details__{field}__in": values}))
+
+        if not conditions:
+            return Q() if self.is_for_all_users else None
+        query = Q()
+        for condition in conditions:
+            query &= condition
+        return query
+
+    def get_users(self, user_ids=None):
+        """Returns the active users matching the rule, limited to the given users."""
+
+        from apps.access.models import User
+
+        users = User.objects.filter(is_active=True)
+        if user_ids is not None:
+            users = users.filter(id__in=user_ids)
+        conditions = self.get_conditions()
+        return users.none() if conditions is None else users.filter(conditions)
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.template import Context, Template
 from django.utils.html import strip_tags
 
@@ -19,6 +19,7 @@ from apps.my_learning.config import (
     AllBaseLearningTypeChoices,
     ApprovalTypeChoices,
     EnrollmentTypeChoices,
+    FeedActivityTypeChoices,
     LearningStatusChoices,
 )
 from apps.my_learning.models import BaseLearningFKModel
@@ -30,6 +31,14 @@ class Enrollment(CreationAndModificationModel, BaseLearningFKModel):
 
     class Meta(CreationAndModificationModel.Meta):
         default_related_name = "related_enrollments"
+        indexes = [
+            models.Index(fields=["user", "learning_type", "is_enrolled"], name="enrollment_user_type_idx"),
+            models.Index(
+                fields=["user_group", "learning_type"],
+                condition=models.Q(user_group__isnull=False),
+                name="enrollment_group_type_idx",
+            ),
+        ]
 
     # FK fields
     user_group = models.ForeignKey(
@@ -70,6 +79,45 @@ class Enrollment(CreationAndModificationModel, BaseLearningFKModel):
     start_date = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
     end_date = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Overridden to keep the loaded state, used to detect the feed activities on save."""
+
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_state = {
+            field: getattr(instance, field) for field in ["is_enrolled", "learning_status"] if field in field_names
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        """Overridden to push the enrolled & completed activities to the user feed."""
+
+        super().save(*args, **kwargs)
+        if not self.user_id:
+            return
+        loaded_state = getattr(self, "_loaded_state", {})
+        activity_types = []
+        if self.is_enrolled and not loaded_state.get("is_enrolled"):
+            activity_types.append(FeedActivityTypeChoices.enrolled)
+        if (
+            self.learning_status == LearningStatusChoices.completed
+            and loaded_state.get("learning_status") != LearningStatusChoices.completed
+        ):
+            activity_types.append(FeedActivityTypeChoices.completed)
+        self._loaded_state = {"is_enrolled": self.is_enrolled, "learning_status": self.learning_status}
+        if activity_types:
+            from apps.my_learning.tasks import UserFeedFanOutTask
+
+            activities = [
+                {"actor_id": self.user_id, "activity_type": activity_type, "enrollment_id": self.id}
+                for activity_type in activity_types
+            ]
+            db_name = get_current_db_name()
+            # dispatched once committed, the worker reads the enrollment
+            transaction.on_commit(
+                lambda: UserFeedFanOutTask().run_task(activities=activities, db_name=db_name), using=self._state.db
+            )
+
     def call_leaderboard_tasks(self, is_assigned=None, request_headers=None):
         """Call leaderboard tasks based on course enrollment."""
 
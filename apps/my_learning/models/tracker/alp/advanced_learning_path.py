@@ -13,6 +13,12 @@ class UserALPTracker(BaseUserTrackingModel):
 
     class Meta(BaseUserTrackingModel.Meta):
         default_related_name = "related_user_alp_trackers"
+        indexes = [
+            models.Index(fields=["user", "advanced_learning_path"], name="alp_tracker_user_idx"),
+            models.Index(
+                fields=["ccms_id"], condition=models.Q(ccms_id__isnull=False), name="alp_tracker_ccms_idx"
+            ),
+        ]
 
     advanced_learning_path = models.ForeignKey(
         to="learning.AdvancedLearningPath", on_delete=models.CASCADE, **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG
@@ -27,6 +27,12 @@ class UserCourseTracker(BaseUserTrackingModel):
 
     class Meta(BaseUserTrackingModel.Meta):
         default_related_name = "related_user_course_trackers"
+        indexes = [
+            models.Index(fields=["user", "course"], name="course_tracker_user_idx"),
+            models.Index(
+                fields=["ccms_id"], condition=models.Q(ccms_id__isnull=False), name="course_tracker_ccms_idx"
+            ),
+        ]
 
     course = models.ForeignKey(
         to="learning.Course", on_delete=models.SET_NULL, **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG
@@ -16,6 +16,12 @@ class UserLearningPathTracker(BaseUserTrackingModel):
 
     class Meta(BaseUserTrackingModel.Meta):
         default_related_name = "related_user_learning_path_trackers"
+        indexes = [
+            models.Index(fields=["user", "learning_path"], name="lp_tracker_user_idx"),
+            models.Index(
+                fields=["ccms_id"], condition=models.Q(ccms_id__isnull=False), name="lp_tracker_ccms_idx"
+            ),
+        ]
 
     learning_path = models.ForeignKey(
         to="learning.LearningPath", on_delete=models.CASCADE, **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG
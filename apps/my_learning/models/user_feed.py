@@ -0,0 +1,81 @@
+from django.db import models
+from django.db.models import Count
+
+from apps.common.models import COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG, COMMON_CHAR_FIELD_MAX_LENGTH, BaseModel
+from apps.my_learning.config import USER_FEED_FAN_OUT_LIMIT, FeedActivityTypeChoices
+
+
+class UserFeedActivity(BaseModel):
+    """
+    Materialized feed of the user. Activities of the followed users & friends are pushed to the feed
+    of the user when they happen(fan-out on write).
+
+    Model Fields -
+        PK          - id,
+        FK          - user, actor, enrollment, post_like
+        Fields      - uuid, ss_id
+        Choices     - activity_type
+        Datetime    - created_at, modified_at
+
+    App QuerySet Manager Methods -
+        get_or_none
+    """
+
+    class Meta(BaseModel.Meta):
+        default_related_name = "related_user_feed_activities"
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["user", "activity_type", "-created_at", "-id"], name="user_feed_cursor_idx"),
+        ]
+
+    # FK fields
+    user = models.ForeignKey("access.User", on_delete=models.CASCADE)
+    actor = models.ForeignKey("access.User", on_delete=models.CASCADE, related_name="related_actor_feed_activities")
+    enrollment = models.ForeignKey(
+        "my_learning.Enrollment", on_delete=models.CASCADE, **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG
+    )
+    post_like = models.ForeignKey("forum.PostLike", on_delete=models.CASCADE, **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+
+    # Choices
+    activity_type = models.CharField(choices=FeedActivityTypeChoices.choices, max_length=COMMON_CHAR_FIELD_MAX_LENGTH)
+
+    @staticmethod
+    def get_actor_audiences(actor_ids):
+        """
+        Returns the `actor_id -> user ids` map of the users whose feed shows the actor's activities, that is
+        the followers of the actor & the users who have the actor as friend.
+        """
+
+        from apps.access.models import UserConnection
+
+        audiences = {actor_id: set() for actor_id in actor_ids}
+        followers = UserConnection.followers.through.objects.filter(userconnection__user_id__in=actor_ids)
+        for actor_id, user_id in followers.values_list("userconnection__user_id", "user_id"):
+            audiences[actor_id].add(user_id)
+        friends = UserConnection.friends.through.objects.filter(user_id__in=actor_ids)
+        for actor_id, user_id in friends.values_list("user_id", "userconnection__user_id"):
+            audiences[actor_id].add(user_id)
+        return audiences
+
+    @staticmethod
+    def get_heavy_actor_ids(actor_ids):
+        """Returns the ids of the given actors whose audience is too big to be fanned out on write."""
+
+        from apps.access.models import UserConnection
+
+        audience_counts = dict.fromkeys(actor_ids, 0)
+        for actor_id, count in (
+            UserConnection.objects.filter(user_id__in=actor_ids)
+            .values("user_id")
+            .annotate(count=Count("followers"))
+            .values_list("user_id", "count")
+        ):
+            audience_counts[actor_id] += count
+        for actor_id, count in (
+            UserConnection.friends.through.objects.filter(user_id__in=actor_ids)
+            .values("user_id")
+            .annotate(count=Count("id"))
+            .values_list("user_id", "count")
+        ):
+            audience_counts[actor_id] += count
+        return {actor_id for actor_id, count in audience_counts.items() if count > USER_FEED_FAN_OUT_LIMIT}
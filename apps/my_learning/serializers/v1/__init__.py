@@ -152,3 +152,4 @@ from .one_profile import (
     OneProfileLPAssessmentSerializer,
 )
 from .announcement import AnnouncementCUDModelSerializer, AnnouncementListModelSerializer
+from .auto_assignment import AutoAssignmentRuleCUDModelSerializer, AutoAssignmentRuleListModelSerializer
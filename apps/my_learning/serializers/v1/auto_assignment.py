@@ -0,0 +1,109 @@
+from rest_framework import serializers
+
+from apps.access_control.models import UserGroup
+from apps.common.serializers import AppReadOnlyModelSerializer, AppWriteOnlyModelSerializer, BaseIDNameSerializer
+from apps.learning.models import AdvancedLearningPath, Catalogue, Course, LearningPath
+from apps.meta.models import DepartmentCode, DepartmentTitle, JobTitle
+from apps.my_learning.config import AUTO_ASSIGNMENT_USER_DETAIL_FIELDS
+from apps.my_learning.models import AutoAssignmentRule
+
+CONDITION_FIELDS = ["user_group", "job_title", "department_code", "department_title"]
+ASSIGNMENT_FIELDS = ["catalogue", *AutoAssignmentRule.learning_types]
+
+
+class AutoAssignmentRuleCUDModelSerializer(AppWriteOnlyModelSerializer):
+    """CUD Serializer for `AutoAssignmentRule` model."""
+
+    class Meta(AppWriteOnlyModelSerializer.Meta):
+        model = AutoAssignmentRule
+        fields = [
+            "name",
+            "description",
+            "is_for_all_users",
+            *CONDITION_FIELDS,
+            "user_detail_filter",
+            *ASSIGNMENT_FIELDS,
+            "end_date",
+            "is_active",
+        ]
+
+    def validate_user_detail_filter(self, user_detail_filter):
+        """Validates the filter is of {field: [values]} & only the allowed fields are used."""
+
+        if not isinstance(user_detail_filter, dict):
+            raise serializers.ValidationError("Expected a dictionary of field & list of values.")
+        for field, values in user_detail_filter.items():
+            if field not in AUTO_ASSIGNMENT_USER_DETAIL_FIELDS:
+                raise serializers.ValidationError(f"{field} is not allowed.")
+            if not isinstance(values, list) or not values:
+                raise serializers.ValidationError(f"Expected a list of values for {field}.")
+        return user_detail_filter
+
+    def get_attr(self, attrs, field):
+        """Returns the value of the field, falls back to the instance's value on a partial update."""
+
+        if field in attrs or not (self.partial and self.instance):
+            return attrs.get(field)
+        value = getattr(self.instance, field)
+        # many to many fields
+        if hasattr(value, "exists"):
+            return value.exists()
+        return value
+
+    def validate(self, attrs):
+        """Overridden to validate the rule has a condition & an assignment."""
+
+        if not self.get_attr(attrs, "is_for_all_users") and not self.get_attr(attrs, "user_detail_filter"):
+            if not any(self.get_attr(attrs, field) for field in CONDITION_FIELDS):
+                raise serializers.ValidationError({"is_for_all_users": "Either select a condition or all users."})
+        if not any(self.get_attr(attrs, field) for field in ASSIGNMENT_FIELDS):
+            raise serializers.ValidationError({"catalogue": "Select a catalogue or a learning to assign."})
+        return attrs
+
+    def get_meta(self) -> dict:
+        """get meta data."""
+
+        return {
+            "user_group": self.serialize_for_meta(UserGroup.objects.alive(), fields=["id", "name"]),
+            "job_title": self.serialize_for_meta(JobTitle.objects.all(), fields=["id", "name"]),
+            "department_code": self.serialize_for_meta(DepartmentCode.objects.all(), fields=["id", "name"]),
+            "department_title": self.serialize_for_meta(DepartmentTitle.objects.all(), fields=["id", "name"]),
+            "user_detail_filter": self.serialize_choices(AUTO_ASSIGNMENT_USER_DETAIL_FIELDS),
+            "catalogue": self.serialize_for_meta(Catalogue.objects.alive(), fields=["id", "name"]),
+            "course": self.serialize_for_meta(Course.objects.unarchived(), fields=["id", "name"]),
+            "learning_path": self.serialize_for_meta(LearningPath.objects.unarchived(), fields=["id", "name"]),
+            "advanced_learning_path": self.serialize_for_meta(
+                AdvancedLearningPath.objects.unarchived(), fields=["id", "name"]
+            ),
+        }
+
+
+class AutoAssignmentRuleListModelSerializer(AppReadOnlyModelSerializer):
+    """List Serializer for `AutoAssignmentRule` model."""
+
+    user_group = BaseIDNameSerializer(many=True, read_only=True)
+    job_title = BaseIDNameSerializer(many=True, read_only=True)
+    department_code = BaseIDNameSerializer(many=True, read_only=True)
+    department_title = BaseIDNameSerializer(many=True, read_only=True)
+    catalogue = BaseIDNameSerializer(many=True, read_only=True)
+    course = BaseIDNameSerializer(many=True, read_only=True)
+    learning_path = BaseIDNameSerializer(many=True, read_only=True)
+    advanced_learning_path = BaseIDNameSerializer(many=True, read_only=True)
+
+    class Meta(AppReadOnlyModelSerializer.Meta):
+        model = AutoAssignmentRule
+        fields = [
+            "id",
+            "name",
+            "description",
+            "is_for_all_users",
+            *CONDITION_FIELDS,
+            "user_detail_filter",
+            *ASSIGNMENT_FIELDS,
+            "end_date",
+            "is_active",
+            "last_evaluated_at",
+            "last_evaluation",
+            "created_at",
+            "modified_at",
+        ]
@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import serializers
 
 from apps.common.serializers import AppCreateModelSerializer, AppReadOnlyModelSerializer
@@ -63,7 +64,12 @@ class UserPlaygroundGroupTrackerCreateSerializer(AppCreateModelSerializer):
         instance = super().create(validated_data)
         instance.enrollment.learning_status = LearningStatusChoices.started
         instance.enrollment.save()
-        PlaygroundGroupEnrollmentTask().run_task(tracker_id=instance.id, db_name=get_current_db_name())
+        # enrolls the playgrounds of the group, once the tracker is committed
+        tracker_ids, db_name = [instance.id], get_current_db_name()
+        transaction.on_commit(
+            lambda: PlaygroundGroupEnrollmentTask().run_task(tracker_ids=tracker_ids, db_name=db_name),
+            using=UserPlaygroundGroupTracker.objects.db,
+        )
         return instance
 
 
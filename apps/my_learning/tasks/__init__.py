@@ -5,7 +5,7 @@ from .playground import PlaygroundTrackingTask
 from .playground_group import PlaygroundGroupEnrollmentTask, PlaygroundGroupTrackingTask
 from .user_enrollment import UserBulkEnrollTask
 from .activity import CalendarActivityCreationTask
-from .bulk_enrollment import EnrollmentBulkUploadTask, BulkUnenrollmentTask
+from .bulk_enrollment import EnrollmentBulkUploadTask, EnrollmentSideEffectTask, BulkUnenrollmentTask
 from .report import (
     FileSubmissionReportGenerationTask,
     ReportGenerationTask,
@@ -17,3 +17,4 @@ from apps.my_learning.tasks.progress.learning_path import LPProgressUpdateTask
 from .skill_ontology import SkillOntologyProgressUpdateTask
 from apps.my_learning.tasks.progress.advanced_learning_path import ALPProgressUpdateTask
 from .enrollment_reminder import handle_enrollment_reminder_mail
+from .user_feed import UserFeedConnectionTask, UserFeedFanOutTask
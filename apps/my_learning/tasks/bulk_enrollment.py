@@ -1,83 +1,181 @@
 import os
+import time
 from datetime import datetime
 
 import openpyxl
+from django.db import transaction
 
+from apps.common.helpers import save_xlsx_to_storage
 from apps.common.tasks import BaseAppTask
 
+# FK fields of the `Enrollment` learnings, used to select the related learning along with the enrollment.
+LEARNING_INSTANCE_FIELDS = [
+    "course",
+    "learning_path",
+    "advanced_learning_path",
+    "skill_traveller",
+    "playground",
+    "playground_group",
+    "assignment",
+    "assignment_group",
+]
+
 
 class EnrollmentBulkUploadTask(BaseAppTask):
-    """Task to Bulk Enroll Users"""
+    """
+    Task to Bulk Enroll Users.
 
-    request_headers = None
+    The sheet is streamed in read-only mode & processed in chunks. For each chunk the users & learnings are
+    resolved in bulk, the enrollments are upserted in bulk & the side effects (notifications, calendar entries,
+    leaderboard & emails) are emitted as one `EnrollmentSideEffectTask` per chunk.
+    """
 
-    def read_excel_file(self, file_path):
-        """function to read excel file"""
+    chunk_size = 500
+    error_report_header = ["Row", "UserEmail", "Type", "Code", "Error"]
+    request_headers = None
 
-        sheet = openpyxl.load_workbook(file_path).active
-        # Creating a list header with Column values of active sheet [1st row]
-        header = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True))
-        # Creating a List with dictionary values [{ header : row }]
-        list_of_enrollments = [dict(zip(header, row)) for row in sheet.iter_rows(min_row=2, values_only=True)]
-        return list_of_enrollments
+    def __init__(self, *args, **kwargs):
+        """Overridden to set up the per-run state."""
 
-    def run(self, file_path, db_name, authenticated_user, **kwargs):
-        """Run handler."""
+        super().__init__(*args, **kwargs)
+        self.errors = []
 
-        from django.utils import timezone
+    def add_error(self, row_number, enrollments_data, message):
+        """Track the error of the given row, used to create the error sheet."""
 
-        from apps.access.models import User
-        from apps.learning.helpers import LEARNING_INSTANCE_MODELS
-        from apps.my_learning.config import (
-            ActionChoices,
-            ApprovalTypeChoices,
-            BaseLearningTypeChoices,
-            LearningStatusChoices,
+        self.errors.append(
+            [
+                row_number,
+                enrollments_data.get("UserEmail"),
+                enrollments_data.get("Type"),
+                enrollments_data.get("Code"),
+                message,
+            ]
         )
-        from apps.my_learning.helpers import get_tracker_instance
-        from apps.my_learning.models import Enrollment
-        from apps.my_learning.tasks import CalendarActivityCreationTask, UserEnrollmentEmailTask
-        from apps.tenant_service.middlewares import get_current_db_name
 
-        BASE_LEARNING_TYPES = [
-            BaseLearningTypeChoices.course,
-            BaseLearningTypeChoices.learning_path,
-            BaseLearningTypeChoices.advanced_learning_path,
-        ]
+    @staticmethod
+    def read_excel_file(file_path):
+        """Streams the rows of the sheet as dictionaries, along with the row number."""
 
-        self.switch_db(db_name)
-        self.logger.info("Executing EnrollmentBulkUploadTask.")
-        list_of_enrollments = self.read_excel_file(file_path=file_path)
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None) or []
+        for row_number, row in enumerate(rows, start=2):
+            if any(row):
+                yield row_number, dict(zip(header, row))
+        workbook.close()
 
-        self.request_headers = kwargs.get("request", None)
+    def iter_chunks(self, rows):
+        """Yields the streamed rows as chunks of `chunk_size`."""
 
-        authenticated_user = User.objects.filter(pk=authenticated_user).first()
-        for enrollments_data in list_of_enrollments:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def get_valid_rows(self, chunk):
+        """Validates & normalizes the rows of the chunk. Invalid rows are tracked as errors."""
+
+        from apps.learning.helpers import LEARNING_INSTANCE_MODELS
+
+        valid_rows = []
+        for row_number, enrollments_data in chunk:
             if (
-                not enrollments_data["UserEmail"]
-                or not enrollments_data["Type"]
-                or not enrollments_data["Code"]
-                or not enrollments_data["EndDate"]
-                or not LEARNING_INSTANCE_MODELS.get(enrollments_data["Type"].strip())
+                not enrollments_data.get("UserEmail")
+                or not enrollments_data.get("Type")
+                or not enrollments_data.get("Code")
+                or not enrollments_data.get("EndDate")
             ):
+                self.add_error(row_number, enrollments_data, "Missing required values: UserEmail/Type/Code/EndDate")
                 continue
-            try:
-                user = User.objects.filter(email=enrollments_data["UserEmail"]).first()
-                learning_type = enrollments_data["Type"].strip()
-                if "playground" in learning_type:
-                    learning_type = learning_type.replace("playground", "assignment")
-                learning_instance = (
-                    LEARNING_INSTANCE_MODELS[learning_type].objects.filter(code=enrollments_data["Code"]).first()
-                )
-                if not learning_instance:
+            learning_type = str(enrollments_data["Type"]).strip()
+            if "playground" in learning_type:
+                learning_type = learning_type.replace("playground", "assignment")
+            if not LEARNING_INSTANCE_MODELS.get(learning_type):
+                self.add_error(row_number, enrollments_data, f"Unsupported learning type {learning_type}.")
+                continue
+            end_date = enrollments_data["EndDate"]
+            if not isinstance(end_date, datetime):
+                try:
+                    end_date = datetime.strptime(str(end_date).strip(), "%m/%d/%Y")
+                except ValueError:
+                    self.add_error(row_number, enrollments_data, "Invalid EndDate, expected format is mm/dd/yyyy.")
                     continue
-                if not isinstance(enrollments_data["EndDate"], datetime):
-                    enrollments_data["EndDate"] = datetime.strptime(enrollments_data["EndDate"], "%m/%d/%Y")
+            valid_rows.append(
+                {
+                    "row_number": row_number,
+                    "data": enrollments_data,
+                    "email": str(enrollments_data["UserEmail"]).strip(),
+                    "code": str(enrollments_data["Code"]).strip(),
+                    "learning_type": learning_type,
+                    "end_date": end_date,
+                }
+            )
+        return valid_rows
+
+    def process_chunk(self, chunk, authenticated_user):
+        """
+        Resolves the users & learnings of the chunk in bulk & upserts the enrollments. Returns the ids
+        of the newly created enrollments, used to emit the side effects.
+        """
+
+        from django.utils import timezone
+
+        from apps.access.models import User
+        from apps.learning.helpers import LEARNING_INSTANCE_MODELS
+        from apps.my_learning.config import ActionChoices, ApprovalTypeChoices, LearningStatusChoices
+        from apps.my_learning.models import Enrollment
+        from apps.my_learning.serializers.v1 import LEARNING_RELATED_FIELDS, tracker_related_fields
+
+        rows = self.get_valid_rows(chunk)
+        users = {user.email: user for user in User.objects.filter(email__in={row["email"] for row in rows})}
+        learnings = {}
+        for learning_type in {row["learning_type"] for row in rows}:
+            codes = {row["code"] for row in rows if row["learning_type"] == learning_type}
+            for learning in LEARNING_INSTANCE_MODELS[learning_type].objects.filter(code__in=codes).order_by("id"):
+                learnings[(learning_type, learning.code)] = learning
+
+        # rows grouped by learning type, the last row wins for the same user & learning
+        grouped_rows = {}
+        for row in rows:
+            user = users.get(row["email"])
+            learning = learnings.get((row["learning_type"], row["code"]))
+            if not user or not learning:
+                message = "Learning not found." if user else "User not found."
+                self.add_error(row["row_number"], row["data"], message)
+                continue
+            grouped_rows.setdefault(row["learning_type"], {})[(user.id, learning.id)] = (row, learning)
+
+        action_date = timezone.now().date()
+        created_ids, enrollments_to_update, enrollments_to_create = [], [], []
+        for learning_type, pairs in grouped_rows.items():
+            learning_field = LEARNING_RELATED_FIELDS[learning_type]
+            existing = {}
+            for enrollment in Enrollment.objects.filter(
+                user_id__in={user_id for user_id, _ in pairs},
+                **{f"{learning_type}_id__in": {learning_id for _, learning_id in pairs}},
+            ):
+                existing.setdefault((enrollment.user_id, getattr(enrollment, f"{learning_type}_id")), enrollment)
+            tracked_pairs = set(
+                User.objects.filter(
+                    id__in={user_id for user_id, _ in pairs},
+                    **{
+                        f"{tracker_related_fields[learning_type]}__{learning_field}_id__in": {
+                            learning_id for _, learning_id in pairs
+                        }
+                    },
+                ).values_list("id", f"{tracker_related_fields[learning_type]}__{learning_field}_id")
+            )
+            for (user_id, learning_id), (row, learning) in pairs.items():
                 data = {
                     "learning_type": learning_type,
-                    "start_date": learning_instance.start_date,
-                    "end_date": enrollments_data["EndDate"],
-                    "action_date": timezone.now().date(),
+                    "start_date": learning.start_date,
+                    "end_date": row["end_date"],
+                    "action_date": action_date,
                     "is_enrolled": True,
                     "approval_type": ApprovalTypeChoices.tenant_admin,
                     "action": ActionChoices.approved,
@@ -85,32 +183,163 @@ class EnrollmentBulkUploadTask(BaseAppTask):
                     "created_by": authenticated_user,
                     "actionee_id": authenticated_user.id if authenticated_user else None,
                 }
-                instance, created = Enrollment.objects.update_or_create(
-                    **{"user": user, learning_type: learning_instance}, defaults=data
-                )
-                if created:
-                    instance.notify_user()
-                    instance.call_leaderboard_tasks(is_assigned=True, request_headers=self.request_headers)
-                    if instance.learning_type in BASE_LEARNING_TYPES:
-                        CalendarActivityCreationTask().run_task(
-                            event_type=instance.learning_type,
-                            event_instance_id=learning_instance.id,
-                            user_ids=user.id,
-                            db_name=get_current_db_name(),
-                        )
-                    UserEnrollmentEmailTask().run_task(
-                        user_id=user.id, enrollment_id=instance.id, db_name=get_current_db_name()
-                    )
-                tracker_instance = get_tracker_instance(user=user, enrollment_instance=instance)
-                if tracker_instance:
-                    instance.learning_status = LearningStatusChoices.started
-                    instance.save()
+                if (user_id, learning_id) in tracked_pairs:
+                    data["learning_status"] = LearningStatusChoices.started
+                if enrollment := existing.get((user_id, learning_id)):
+                    for field, value in data.items():
+                        setattr(enrollment, field, value)
+                    enrollments_to_update.append(enrollment)
+                else:
+                    enrollments_to_create.append(Enrollment(user_id=user_id, **{learning_type: learning}, **data))
+
+        with transaction.atomic(using=Enrollment.objects.db):
+            for enrollment in enrollments_to_update:
+                enrollment.modified_at = timezone.now()
+            Enrollment.objects.bulk_update(
+                enrollments_to_update,
+                [
+                    "start_date",
+                    "end_date",
+                    "action_date",
+                    "is_enrolled",
+                    "approval_type",
+                    "action",
+                    "reason",
+                    "created_by",
+                    "actionee",
+                    "learning_status",
+                    "modified_at",
+                ],
+            )
+            created_ids = [enrollment.id for enrollment in Enrollment.objects.bulk_create(enrollments_to_create)]
+        return len(enrollments_to_update) + len(created_ids), created_ids
+
+    def run(self, file_path, db_name, authenticated_user, **kwargs):
+        """Run handler."""
+
+        from apps.access.models import User
+        from apps.tenant_service.middlewares import get_current_db_name
+
+        self.switch_db(db_name)
+        self.logger.info("Executing EnrollmentBulkUploadTask.")
+        self.errors, started_at, processed_count, rows_count = [], time.perf_counter(), 0, 0
+        self.request_headers = kwargs.get("request", None)
+
+        authenticated_user = User.objects.filter(pk=authenticated_user).first()
+        for chunk in self.iter_chunks(self.read_excel_file(file_path=file_path)):
+            rows_count += len(chunk)
+            try:
+                count, created_ids = self.process_chunk(chunk, authenticated_user)
             except Exception as e:
-                self.logger.info(f"Error while processing {enrollments_data['UserEmail']}: {e}")
+                self.logger.info(f"Error while processing the chunk: {e}")
+                for row_number, enrollments_data in chunk:
+                    self.add_error(row_number, enrollments_data, str(e))
+                continue
+            processed_count += count
+            if created_ids:
+                EnrollmentSideEffectTask().run_task(
+                    enrollment_ids=created_ids, db_name=get_current_db_name(), request_headers=self.request_headers
+                )
+
+        error_sheet_url = None
+        if self.errors:
+            file_name = f"errors_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx"
+            error_sheet_url = save_xlsx_to_storage(
+                file_name=f"files/{db_name}/enrollment_bulk_upload/{file_name}",
+                header=self.error_report_header,
+                rows=sorted(self.errors, key=lambda _: _[0]),
+            )
         try:
             os.remove(file_path)
         except FileNotFoundError:
             pass
+        duration = time.perf_counter() - started_at
+        self.logger.info(
+            f"EnrollmentBulkUploadTask completed. Rows: {rows_count}, Processed: {processed_count}, "
+            f"Errors: {len(self.errors)}, Rows/Sec: {rows_count / duration if duration else rows_count:.2f}, "
+            f"Error Sheet: {error_sheet_url}"
+        )
+        return {
+            "total": rows_count,
+            "processed": processed_count,
+            "failed": len(self.errors),
+            "rows_per_second": round(rows_count / duration, 2) if duration else rows_count,
+            "error_sheet_url": error_sheet_url,
+        }
+
+
+class EnrollmentSideEffectTask(BaseAppTask):
+    """
+    Task to emit the side effects of a batch of newly created user enrollments. The notifications are created
+    with a single insert & the calendar entries are created once per learning for all the enrolled users.
+    """
+
+    def run(self, enrollment_ids, db_name, request_headers=None, **kwargs):
+        """Run handler."""
+
+        from apps.leaderboard.tasks import CommonLeaderboardTask
+        from apps.my_learning.config import BaseLearningTypeChoices, FeedActivityTypeChoices
+        from apps.my_learning.models import Enrollment
+        from apps.my_learning.tasks import CalendarActivityCreationTask, UserEnrollmentEmailTask, UserFeedFanOutTask
+        from apps.notification.models import Notification
+
+        self.switch_db(db_name)
+        self.logger.info(f"Executing EnrollmentSideEffectTask for {len(enrollment_ids)} enrollments on {db_name}.")
+
+        base_learning_types = [
+            BaseLearningTypeChoices.course,
+            BaseLearningTypeChoices.learning_path,
+            BaseLearningTypeChoices.advanced_learning_path,
+        ]
+        enrollments = Enrollment.objects.filter(id__in=enrollment_ids, user__isnull=False).select_related(
+            "user", *LEARNING_INSTANCE_FIELDS
+        )
+        notifications, calendar_users = [], {}
+        for enrollment in enrollments:
+            learning = getattr(enrollment, enrollment.learning_type)
+            if actions := enrollment.get_actions(is_notification=True):
+                message, data = Notification.notify_details(
+                    actions["assigned_action"],
+                    **{f"{enrollment.learning_type}_id": learning.id, "obj_name": learning.name},
+                )
+                notifications.append(Notification(user=enrollment.user, message=message, data=data))
+            if enrollment.learning_type in base_learning_types:
+                calendar_users.setdefault((enrollment.learning_type, learning.id), []).append(enrollment.user_id)
+        Notification.objects.bulk_create(notifications)
+        UserFeedFanOutTask().run(
+            activities=[
+                {
+                    "actor_id": enrollment.user_id,
+                    "activity_type": FeedActivityTypeChoices.enrolled,
+                    "enrollment_id": enrollment.id,
+                }
+                for enrollment in enrollments
+                if enrollment.is_enrolled
+            ],
+            db_name=db_name,
+        )
+
+        calendar_task = CalendarActivityCreationTask()
+        for (learning_type, learning_id), user_ids in calendar_users.items():
+            calendar_task.run(
+                event_type=learning_type, event_instance_id=learning_id, user_ids=user_ids, db_name=db_name
+            )
+
+        leaderboard_task, email_task = CommonLeaderboardTask(), UserEnrollmentEmailTask()
+        for enrollment in enrollments:
+            try:
+                if actions := enrollment.get_actions():
+                    leaderboard_task.run(
+                        milestone_names=[actions["first_enroll_milestone"], actions["assigned_enrollment_milestone"]],
+                        user_id=enrollment.user_id,
+                        db_name=db_name,
+                        request=request_headers,
+                        learning_type=enrollment.learning_type,
+                        **{f"{enrollment.learning_type}_id": getattr(enrollment, f"{enrollment.learning_type}_id")},
+                    )
+                email_task.run(user_id=enrollment.user_id, enrollment_id=enrollment.id, db_name=db_name)
+            except Exception as e:
+                self.logger.info(f"Error while processing the side effects of enrollment {enrollment.id}: {e}")
         return True
 
 
@@ -7,8 +7,8 @@ from apps.my_learning.config import ApprovalTypeChoices, EnrollmentTypeChoices
 class UserEnrollmentEmailTask(BaseEmailTask):
     """Task to send email based on enrollment."""
 
-    def run(self, enrollment_id, db_name, user_id=None, user_group_id=None, **kwargs):
-        """Run handler."""
+    def run(self, enrollment_id, db_name, user_id=None, user_group_id=None, user_ids=None, **kwargs):
+        """Run handler. `user_ids` sends the mail of the enrollment's learning to all the given users at once."""
 
         from apps.my_learning.models import Enrollment
         from apps.tenant_service.middlewares import get_current_sender_email
@@ -25,7 +25,13 @@ class UserEnrollmentEmailTask(BaseEmailTask):
             return False, f"Not supported learning type {enrollment.learning_type} for sending email."
         url = get_tenant_website_url(db_name)
         self.send_enrollment_mail(
-            item_name, mail_template_type, url, user_id=user_id, group_id=user_group_id, sender_email=sender_email
+            item_name,
+            mail_template_type,
+            url,
+            user_id=user_id,
+            group_id=user_group_id,
+            user_ids=user_ids,
+            sender_email=sender_email,
         )
         return True
 
@@ -56,7 +62,9 @@ class UserEnrollmentEmailTask(BaseEmailTask):
                 item_name, mail_template_type = None, None
         return item_name, mail_template_type
 
-    def send_enrollment_mail(self, item_name, mail_template_type, url, sender_email, user_id=None, group_id=None):
+    def send_enrollment_mail(
+        self, item_name, mail_template_type, url, sender_email, user_id=None, group_id=None, user_ids=None
+    ):
         """Send Learning Path enrollment email."""
 
         from apps.access.models import User
@@ -68,7 +76,10 @@ class UserEnrollmentEmailTask(BaseEmailTask):
             TemplateFieldChoices.website_url: url,
             TemplateFieldChoices.artifact_name: item_name,
         }
-        if group_id:
+        if user_ids:
+            for user in User.objects.filter(id__in=user_ids):
+                self.send_mail_to_user(email_context, user, mail_template, sender_email)
+        elif group_id:
             group = UserGroup.objects.get(id=group_id)
             for user in group.members.all():
                 self.send_mail_to_user(email_context, user, mail_template, sender_email)
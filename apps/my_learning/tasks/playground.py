@@ -24,9 +24,10 @@ class PlaygroundTrackingTask(BaseAppTask):
         tracker.enrollment.save()
         tracker.save()
         # update the playground_group progress based on playground progress.
-        if group_trackers := tracker.user.related_user_playground_group_trackers.filter(
-            playground_group__related_playground_relations__playground=tracker.playground
+        if group_tracker_ids := list(
+            tracker.user.related_user_playground_group_trackers.filter(
+                playground_group__related_playground_relations__playground=tracker.playground
+            ).values_list("id", flat=True)
         ):
-            for group_tracker in group_trackers:
-                PlaygroundGroupTrackingTask().run_task(tracker_id=group_tracker.id, db_name=db_name)
+            PlaygroundGroupTrackingTask().run_task(tracker_ids=group_tracker_ids, db_name=db_name)
         return True
@@ -1,3 +1,4 @@
+from django.db.models import Avg
 from django.utils import timezone
 
 from apps.common.tasks import BaseAppTask
@@ -5,60 +6,99 @@ from apps.my_learning.config import LearningStatusChoices
 
 
 class PlaygroundGroupEnrollmentTask(BaseAppTask):
-    """Task to Enroll User to Playground Group and associated playgrounds."""
+    """
+    Task to Enroll User to Playground Group and associated playgrounds.
 
-    def run(self, tracker_id, db_name, **kwargs):
-        """Run handler."""
+    Works set-wise for many playground group trackers, the missing `UserPlaygroundTracker` of all the
+    users × playgrounds are created with a single `bulk_create`.
+    """
 
+    def run(self, db_name, tracker_id=None, tracker_ids=None, **kwargs):
+        """Run handler. `tracker_id` is kept for the tasks queued before the bulk variant."""
+
+        from apps.learning.models import PlaygroundRelationModel
         from apps.my_learning.models.tracker.playground import UserPlaygroundTracker
         from apps.my_learning.models.tracker.playground_group import UserPlaygroundGroupTracker
 
         self.switch_db(db_name)
         self.logger.info("Executing PlaygroundGroupEnrollmentTask")
 
-        tracker: UserPlaygroundGroupTracker = UserPlaygroundGroupTracker.objects.get(id=tracker_id)
-        playground_relations = tracker.playground_group.related_playground_relations.all().order_by("sequence")
-        for playground_relation in playground_relations:
-            try:
-                UserPlaygroundTracker.objects.get(playground=playground_relation.playground, user=tracker.user)
-            except UserPlaygroundTracker.DoesNotExist:
-                UserPlaygroundTracker.objects.create(
-                    playground=playground_relation.playground,
-                    user=tracker.user,
-                )
+        tracker_ids = tracker_ids or [tracker_id]
+        group_users = set(
+            UserPlaygroundGroupTracker.objects.filter(id__in=tracker_ids).values_list("playground_group_id", "user_id")
+        )
+        group_playgrounds = {}
+        for playground_group_id, playground_id in (
+            PlaygroundRelationModel.objects.filter(playground_group_id__in={group_id for group_id, _ in group_users})
+            .order_by("sequence")
+            .values_list("playground_group_id", "playground_id")
+        ):
+            group_playgrounds.setdefault(playground_group_id, []).append(playground_id)
+
+        user_playgrounds = {
+            (user_id, playground_id)
+            for playground_group_id, user_id in group_users
+            for playground_id in group_playgrounds.get(playground_group_id, [])
+        }
+        existing = set(
+            UserPlaygroundTracker.objects.filter(
+                user_id__in={user_id for user_id, _ in user_playgrounds},
+                playground_id__in={playground_id for _, playground_id in user_playgrounds},
+            ).values_list("user_id", "playground_id")
+        )
+        created = UserPlaygroundTracker.objects.bulk_create(
+            [
+                UserPlaygroundTracker(user_id=user_id, playground_id=playground_id)
+                for user_id, playground_id in user_playgrounds - existing
+            ],
+            ignore_conflicts=True,
+        )
+        self.logger.info(f"{len(created)} playground trackers created for {len(group_users)} playground groups.")
         return True
 
 
 class PlaygroundGroupTrackingTask(BaseAppTask):
-    """Update the playground group progress based on the playground progress."""
+    """
+    Update the playground group progress based on the playground progress.
 
-    def run(self, tracker_id, db_name, **kwargs):
-        """Run handler."""
+    Works set-wise for many playground group trackers, the progress of every affected tracker is computed
+    with a single `AVG` aggregate grouped by user & playground group.
+    """
 
+    def run(self, db_name, tracker_id=None, tracker_ids=None, **kwargs):
+        """Run handler. `tracker_id` is kept for the tasks queued before the bulk variant."""
+
+        from apps.my_learning.models.tracker.playground import UserPlaygroundTracker
         from apps.my_learning.models.tracker.playground_group import UserPlaygroundGroupTracker
 
         self.switch_db(db_name)
         self.logger.info("Executing PlaygroundGroupTrackingTask")
 
-        tracker: UserPlaygroundGroupTracker = UserPlaygroundGroupTracker.objects.get(id=tracker_id)
-
-        try:
-            user_playground_trackers = tracker.user.related_user_playground_trackers.filter(
-                playground__related_playground_relations__playground_group=tracker.playground_group
+        trackers = list(
+            UserPlaygroundGroupTracker.objects.filter(id__in=tracker_ids or [tracker_id]).select_related("enrollment")
+        )
+        group_lookup = "playground__related_playground_relations__playground_group_id"
+        progress = {
+            (playground_tracker["user_id"], playground_tracker[group_lookup]): playground_tracker["progress_avg"]
+            for playground_tracker in UserPlaygroundTracker.objects.filter(
+                user_id__in={tracker.user_id for tracker in trackers},
+                **{f"{group_lookup}__in": {tracker.playground_group_id for tracker in trackers}},
             )
-        except Exception:
-            user_playground_trackers = 0
-        if not user_playground_trackers.exists():
-            tracker.progress = 0
-            tracker.save()
-            return True
-        total_playground_progress = list(user_playground_trackers.values_list("progress", flat=True))
-        playground_group_progress = round(sum(total_playground_progress) / len(total_playground_progress))
-        tracker.progress = playground_group_progress
-        if playground_group_progress == 100:
-            tracker.is_completed = True
-            tracker.enrollment.learning_status = LearningStatusChoices.completed
-            tracker.completion_date = timezone.now()
-            tracker.enrollment.save()
-        tracker.last_accessed_on = timezone.now()
-        tracker.save()
+            .values("user_id", group_lookup)
+            .annotate(progress_avg=Avg("progress"))
+            .order_by()
+        }
+
+        now = timezone.now()
+        for tracker in trackers:
+            tracker.progress = round(progress.get((tracker.user_id, tracker.playground_group_id)) or 0)
+            if tracker.progress == 100 and not tracker.is_completed:
+                tracker.is_completed = True
+                tracker.enrollment.learning_status = LearningStatusChoices.completed
+                tracker.completion_date = now
+                tracker.enrollment.save()
+            tracker.last_accessed_on = tracker.modified_at = now
+        UserPlaygroundGroupTracker.objects.bulk_update(
+            trackers, ["progress", "is_completed", "completion_date", "last_accessed_on", "modified_at"]
+        )
+        return True
@@ -6,6 +6,7 @@ from django.core.files.storage import default_storage
 from django.db.models import Q, Sum, Value
 from django.db.models.functions import ExtractMonth, ExtractYear, TruncDate
 
+from apps.common.fan_out import fan_out
 from apps.common.tasks.base import BaseAppTask
 from apps.event.config import TimePeriodChoices
 from apps.learning.config import (
@@ -16,7 +17,7 @@ from apps.learning.config import (
 )
 from apps.meta.config import FeedBackTypeChoices
 from apps.my_learning.config import AllBaseLearningTypeChoices, ApprovalTypeChoices, EnrollmentTypeChoices
-from apps.tenant_service.middlewares import get_current_tenant_name
+from apps.tenant_service.middlewares import get_current_tenant_name, using_replica
 
 default_string = "-"
 
@@ -626,11 +627,31 @@ class ReportGenerationTask(BaseAppTask):
         elif learning_type in core_function_mapping and kwargs.get("learning_obj"):
             core_function_mapping[learning_type](**kwargs)
 
-    def populate_excel_sheet(self, sheet, enrolled_objs, user_ids, is_user_report):
-        """Function to populate the report sheet with the given courses."""
+    def get_ccms_learning_details(self, enrolled_objs):
+        """
+        Fetches the CCMS details of the learnings of the ccms enrollments concurrently, once per learning.
+        Returns a `FanOutResult` per `(learning_type, ccms_id)`.
+        """
 
         from apps.learning.helpers import get_ccms_retrieve_details
 
+        learnings = {
+            (f"core_{enrollment.learning_type}", enrollment.ccms_id)
+            for enrollment in enrolled_objs
+            if enrollment.is_ccms_obj
+        }
+        results = fan_out(
+            lambda learning: get_ccms_retrieve_details(
+                learning_type=learning[0], instance_id=learning[1], request=self.request_headers
+            ),
+            learnings,
+        )
+        return {result.item: result for result in results}
+
+    def populate_excel_sheet(self, sheet, enrolled_objs, user_ids, is_user_report):
+        """Function to populate the report sheet with the given courses."""
+
+        ccms_learning_details = self.get_ccms_learning_details(enrolled_objs)
         for enrollment in enrolled_objs:
             if enrollment.user:
                 users = [enrollment.user]
@@ -647,11 +668,11 @@ class ReportGenerationTask(BaseAppTask):
                 "learning_type": enrollment.learning_type,
             }
             if enrollment.is_ccms_obj:
-                success, learning_data = get_ccms_retrieve_details(
-                    learning_type=f"core_{enrollment.learning_type}",
-                    instance_id=enrollment.ccms_id,
-                    request=self.request_headers,
-                )
+                details = ccms_learning_details[(f"core_{enrollment.learning_type}", enrollment.ccms_id)]
+                if details.error:
+                    self.logger.error(f"Report Generation Task failed: {details.error}")
+                    continue
+                success, learning_data = details.result
                 if not success:
                     self.logger.error(f"Report Generation Task failed: {learning_data}")
                     continue
@@ -706,7 +727,8 @@ class ReportGenerationTask(BaseAppTask):
             workbook = openpyxl.Workbook()
             sheet = workbook.active
             self.setup_excel_header(sheet)
-            self.populate_excel_sheet(sheet, enrolled_objs, report_instance.data["user"], is_user_report)
+            with using_replica():
+                self.populate_excel_sheet(sheet, enrolled_objs, report_instance.data["user"], is_user_report)
             excel_file = io.BytesIO()
             workbook.save(excel_file)
             uploaded_file = default_storage.save(f"files/{db_name}/report/{report_instance.name}.xlsx", excel_file)
@@ -835,7 +857,8 @@ class FileSubmissionReportGenerationTask(BaseAppTask):
             workbook = openpyxl.Workbook()
             sheet = workbook.active
             self.setup_excel_header(sheet, report_instance)
-            self.populate_excel_sheet(sheet, report_instance, sub_module_trackers)
+            with using_replica():
+                self.populate_excel_sheet(sheet, report_instance, sub_module_trackers)
             excel_file = io.BytesIO()
             workbook.save(excel_file)
             uploaded_file = default_storage.save(f"files/{db_name}/report/{report_instance.name}.xlsx", excel_file)
@@ -946,7 +969,8 @@ class FeedbackReportGenerationTask(BaseAppTask):
             workbook = openpyxl.Workbook()
             sheet = workbook.active
             self.setup_excel_header(sheet)
-            self.populate_excel_sheet(sheet, feedback_objs)
+            with using_replica():
+                self.populate_excel_sheet(sheet, feedback_objs)
             excel_file = io.BytesIO()
             workbook.save(excel_file)
             uploaded_file = default_storage.save(f"files/{db_name}/report/{report_instance.name}.xlsx", excel_file)
@@ -1030,7 +1054,8 @@ class LeaderboardReportGenerationTask(BaseAppTask):
             workbook = openpyxl.Workbook()
             sheet = workbook.active
             self.setup_excel_header(sheet)
-            self.populate_excel_sheet(sheet, users)
+            with using_replica():
+                self.populate_excel_sheet(sheet, users)
             excel_file = io.BytesIO()
             workbook.save(excel_file)
             uploaded_file = default_storage.save(f"files/{db_name}/report/{report_instance.name}.xlsx", excel_file)
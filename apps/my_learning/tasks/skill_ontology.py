@@ -1,84 +1,136 @@
-from django.db.models import Sum
+from django.db import transaction
+from django.db.models import Count, Sum
 from django.utils import timezone
 
 from apps.common.tasks import BaseAppTask
 from apps.my_learning.config import AllBaseLearningTypeChoices, LearningStatusChoices
 from apps.notification.config import NotifyActionChoices
 
+# learning types of the skill ontology whose tracker progress contributes to the ontology progress.
+SKILL_ONTOLOGY_LEARNING_TYPES = [
+    AllBaseLearningTypeChoices.course,
+    AllBaseLearningTypeChoices.learning_path,
+    AllBaseLearningTypeChoices.advanced_learning_path,
+    AllBaseLearningTypeChoices.skill_traveller,
+    AllBaseLearningTypeChoices.assignment,
+    AllBaseLearningTypeChoices.assignment_group,
+]
+
 
 class SkillOntologyProgressUpdateTask(BaseAppTask):
-    """Task to update the progress for skill ontology trackers."""
+    """
+    Task to update the progress for skill ontology trackers.
 
-    def calculate_overall_progress(self, user, **kwargs):
-        """Function to calculate the overall progress."""
+    The progress of all the given trackers is computed set-wise. The learning counts of the ontologies are
+    precomputed once & the tracker progress is summed with one grouped query per learning type, keyed by
+    `(user_id, skill_ontology_id)`. The changed trackers are written with `bulk_update`, the failures are
+    recorded per tracker.
+    """
 
-        from apps.my_learning.serializers.v1 import tracker_related_fields
+    @staticmethod
+    def get_learnings_count(skill_ontology_ids):
+        """Returns the count of the learnings of the given skill ontologies, keyed by the skill ontology id."""
+
+        from apps.learning.models import SkillOntology
 
-        overall_progress = 0
-        learnings_count = 0
-        for learning_type, learning_objs in kwargs.items():
-            filter_params = {f"{learning_type}__in": learning_objs}
-            overall_progress += (
-                getattr(user, tracker_related_fields[learning_type])
-                .filter(**filter_params)
-                .aggregate(Sum("progress"))["progress__sum"]
-                or 0
+        learnings_count = {}
+        for learning_type in SKILL_ONTOLOGY_LEARNING_TYPES:
+            memberships = (
+                getattr(SkillOntology, learning_type)
+                .through.objects.filter(skillontology_id__in=skill_ontology_ids)
+                .values("skillontology_id")
+                .annotate(count=Count("id"))
+                .order_by()
             )
-            learnings_count += learning_objs.count()
-        skill_ontology_progress = (
-            round(overall_progress / learnings_count) if learnings_count > 0 and overall_progress > 0 else 0
-        )
-        return skill_ontology_progress
+            for membership in memberships:
+                skill_ontology_id = membership["skillontology_id"]
+                learnings_count[skill_ontology_id] = learnings_count.get(skill_ontology_id, 0) + membership["count"]
+        return learnings_count
 
-    def skill_ontology_progress_update(self, tracker):
-        """Update the skill ontology progress based on the all the related learnings progress."""
+    @staticmethod
+    def get_progress_sum(user_ids, skill_ontology_ids):
+        """
+        Returns the sum of the progress of the user's learning trackers related to the skill ontology,
+        keyed by `(user_id, skill_ontology_id)`.
+        """
 
-        from apps.my_learning.models.tracker.tracker_helpers import get_actual_progress
-        from apps.notification.models import Notification
+        from apps.access.models import User
+        from apps.my_learning.serializers.v1 import tracker_related_fields
 
-        if not tracker.is_completed:
-            user = tracker.user
-            skill_ontology = tracker.skill_ontology
-            overall_progress = self.calculate_overall_progress(
-                user,
-                **{
-                    AllBaseLearningTypeChoices.course: skill_ontology.course.all(),
-                    AllBaseLearningTypeChoices.learning_path: skill_ontology.learning_path.all(),
-                    AllBaseLearningTypeChoices.advanced_learning_path: skill_ontology.advanced_learning_path.all(),
-                    AllBaseLearningTypeChoices.skill_traveller: skill_ontology.skill_traveller.all(),
-                    AllBaseLearningTypeChoices.assignment: skill_ontology.assignment.all(),
-                    AllBaseLearningTypeChoices.assignment_group: skill_ontology.assignment_group.all(),
-                },
-            )
-            tracker.progress = get_actual_progress(tracker.progress, overall_progress)
-            if overall_progress == 100:
-                tracker.is_completed = True
-                tracker.enrollment.learning_status = LearningStatusChoices.completed
-                tracker.completion_date = timezone.now()
-                tracker.enrollment.save()
-                Notification.notify_user(
-                    tracker.user,
-                    NotifyActionChoices.skill_ontology_complete,
-                    obj_name=tracker.skill_ontology.name,
-                    skill_ontology_id=tracker.skill_ontology.id,
+        progress_sum = {}
+        for learning_type in SKILL_ONTOLOGY_LEARNING_TYPES:
+            tracker_model = User._meta.get_field(tracker_related_fields[learning_type]).related_model
+            skill_ontology_lookup = f"{learning_type}__related_skill_ontologies"
+            trackers = (
+                tracker_model.objects.filter(
+                    user_id__in=user_ids, **{f"{skill_ontology_lookup}__id__in": skill_ontology_ids}
                 )
-        tracker.last_accessed_on = timezone.now()
-        tracker.save()
+                .values("user_id", skill_ontology_lookup)
+                .annotate(progress_sum=Sum("progress"))
+                .order_by()
+            )
+            for tracker in trackers:
+                key = (tracker["user_id"], tracker[skill_ontology_lookup])
+                progress_sum[key] = progress_sum.get(key, 0) + (tracker["progress_sum"] or 0)
+        return progress_sum
+
+    @staticmethod
+    def mark_as_completed(tracker):
+        """Completes the enrollment of the tracker & notifies the user."""
 
+        from apps.notification.models import Notification
+
+        tracker.is_completed = True
+        tracker.completion_date = timezone.now()
+        tracker.enrollment.learning_status = LearningStatusChoices.completed
+        tracker.enrollment.save()
+        Notification.notify_user(
+            tracker.user,
+            NotifyActionChoices.skill_ontology_complete,
+            obj_name=tracker.skill_ontology.name,
+            skill_ontology_id=tracker.skill_ontology.id,
+        )
         return tracker
 
     def run(self, db_name, tracker_ids, **kwargs):
-        """Run handler."""
+        """Run handler. Returns the count of the updated trackers along with the failures per tracker."""
 
         from apps.my_learning.models import UserSkillOntologyTracker
+        from apps.my_learning.models.tracker.tracker_helpers import get_actual_progress
 
         self.switch_db(db_name=db_name)
         self.logger.info("*** Updating progress for skill ontology related learnings.***")
 
-        trackers = UserSkillOntologyTracker.objects.filter(id__in=tracker_ids)
+        trackers = list(
+            UserSkillOntologyTracker.objects.filter(id__in=tracker_ids).select_related(
+                "user", "skill_ontology", "enrollment"
+            )
+        )
+        pending_trackers = [tracker for tracker in trackers if not tracker.is_completed]
+        learnings_count = self.get_learnings_count({tracker.skill_ontology_id for tracker in pending_trackers})
+        progress_sum = self.get_progress_sum(
+            {tracker.user_id for tracker in pending_trackers},
+            {tracker.skill_ontology_id for tracker in pending_trackers},
+        )
+
+        now, failures, updated_trackers = timezone.now(), {}, []
         for tracker in trackers:
             try:
-                self.skill_ontology_progress_update(tracker)
-            except Exception:
-                pass
-        return True
+                if not tracker.is_completed:
+                    overall_progress = progress_sum.get((tracker.user_id, tracker.skill_ontology_id), 0)
+                    count = learnings_count.get(tracker.skill_ontology_id, 0)
+                    overall_progress = round(overall_progress / count) if count > 0 and overall_progress > 0 else 0
+                    tracker.progress = get_actual_progress(tracker.progress, overall_progress)
+                    if overall_progress == 100:
+                        with transaction.atomic(using=UserSkillOntologyTracker.objects.db):
+                            self.mark_as_completed(tracker)
+                tracker.last_accessed_on = tracker.modified_at = now
+                updated_trackers.append(tracker)
+            except Exception as error:
+                failures[tracker.id] = str(error)
+                self.logger.exception(f"Skill ontology tracker {tracker.id} progress update failed.")
+
+        UserSkillOntologyTracker.objects.bulk_update(
+            updated_trackers, ["progress", "is_completed", "completion_date", "last_accessed_on", "modified_at"]
+        )
+        return {"updated": len(updated_trackers), "failures": failures}
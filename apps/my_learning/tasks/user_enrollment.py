@@ -1,163 +1,209 @@
-from django.db.models import Q
+from django.db import transaction
 from django.utils import timezone
 
 from apps.common.tasks import BaseAppTask
+from apps.event.config import CalendarEventTypeChoices
 from apps.my_learning.config import ApprovalTypeChoices, EnrollmentTypeChoices, LearningStatusChoices
 from apps.my_learning.tasks import UserEnrollmentEmailTask
 
+# validated data key of the learnings along with its learning type, in the order of enrollment.
+BULK_ENROLL_LEARNING_TYPES = {
+    "course": EnrollmentTypeChoices.course,
+    "learning_path": EnrollmentTypeChoices.learning_path,
+    "alp": EnrollmentTypeChoices.advanced_learning_path,
+    "skill_traveller": EnrollmentTypeChoices.skill_traveller,
+    "playground": EnrollmentTypeChoices.playground,
+    "playground_group": EnrollmentTypeChoices.playground_group,
+    "assignment": EnrollmentTypeChoices.assignment,
+    "assignment_group": EnrollmentTypeChoices.assignment_group,
+}
+CALENDAR_LEARNING_TYPES = [
+    CalendarEventTypeChoices.course,
+    CalendarEventTypeChoices.learning_path,
+    CalendarEventTypeChoices.advanced_learning_path,
+]
+
 
 class UserBulkEnrollTask(BaseAppTask):
-    """Task to enroll the users to course, lp, alp...."""
+    """
+    Task to enroll the users & user groups to course, lp, alp....
+
+    The enrollments are created set-wise per learning type. The existing enrollments of the groups & the users
+    (directly or via their groups) are read with one query, the missing ones are inserted with `bulk_create`.
+    The side effects (notifications, chat registration, calendar entries & emails) are emitted once per learning
+    for all the newly enrolled users, only the leaderboard milestones remain per user.
+    """
 
     db_name = None
     token = None
     request_headers = None
+    tenant_details = None
 
-    def register_users_in_chat_learnings(self, is_user, user_or_group, learning_instance):
-        """Register users in chat service."""
+    def register_users_in_chat(self, user_ids, course):
+        """Registers all the given users to the course in the chat service with a single request."""
 
+        from apps.access.models import User
         from apps.common.helpers import process_request_headers
-        from apps.tenant_service.middlewares import get_current_tenant_details
 
-        tenant_details = get_current_tenant_details()
-        if tenant_details["is_keycloak"]:
-            if is_user:
-                user_id = [user_or_group.uuid]
-            else:
-                user_id = list(user_or_group.members.all().values_list("uuid", flat=True))
-        else:
-            if is_user:
-                user_id = [user_or_group.idp_id]
-            else:
-                user_id = list(user_or_group.members.all().values_list("idp_id", flat=True))
-        chat_request_headers = process_request_headers(self.request_headers)
-        learning_instance.register_user_to_course_in_chat(user_id=user_id, request_headers=chat_request_headers)
+        chat_user_field = "uuid" if self.tenant_details["is_keycloak"] else "idp_id"
+        course.register_user_to_course_in_chat(
+            user_id=list(User.objects.filter(id__in=user_ids).values_list(chat_user_field, flat=True)),
+            request_headers=process_request_headers(self.request_headers),
+        )
         return True
 
-    def create_enrollments(self, user_or_group, items, learning_type, default_enrollment_args):
-        """Performs enrollment creation for given inputs."""
+    @staticmethod
+    def create_group_enrollments(groups, learning_type, learnings, default_enrollment_args):
+        """Creates the missing enrollments of the groups to the learnings. Returns the created enrollments."""
+
+        from apps.my_learning.models import Enrollment
+
+        lookup = f"{learning_type}_id"
+        existing = set(
+            Enrollment.objects.filter(
+                user_group__in=groups, **{f"{lookup}__in": [learning.id for learning in learnings]}
+            ).values_list("user_group_id", lookup)
+        )
+        return Enrollment.objects.bulk_create(
+            [
+                Enrollment(
+                    user_group=group,
+                    learning_type=learning_type,
+                    **{learning_type: learning},
+                    **default_enrollment_args,
+                )
+                for group in groups
+                for learning in learnings
+                if (group.id, learning.id) not in existing
+            ]
+        )
+
+    @staticmethod
+    def create_user_enrollments(users, learning_type, learnings, default_enrollment_args):
+        """
+        Creates the missing enrollments of the users to the learnings, skips the learnings enrolled by the user
+        or by one of the user's groups. Users already tracking the learning are marked as started.
+        Returns the created enrollments.
+        """
 
         from apps.access.models import User
-        from apps.event.config import CalendarEventTypeChoices
         from apps.my_learning.models import Enrollment
         from apps.my_learning.serializers.v1 import tracker_related_fields
-        from apps.my_learning.tasks import CalendarActivityCreationTask
-
-        is_user = isinstance(user_or_group, User)
-        for item in items:
-            default_enrollment_args["learning_type"] = learning_type
-            try:
-                if is_user:
-                    user_groups = user_or_group.related_user_groups.all()
-                    if Enrollment.objects.filter(
-                        Q(user_group__in=user_groups) | Q(user=user_or_group), **{learning_type: item}
-                    ):
-                        continue
-                enrollment, created = user_or_group.related_enrollments.get_or_create(
-                    **{learning_type: item}, defaults=default_enrollment_args
-                )
-                learning_instance = getattr(enrollment, enrollment.learning_type)
-                if created:
-                    enrollment.notify_user()
-                    if enrollment.learning_type in [EnrollmentTypeChoices.course]:
-                        self.register_users_in_chat_learnings(
-                            is_user=is_user,
-                            user_or_group=user_or_group,
-                            learning_instance=learning_instance,
-                        )
-                if enrollment.learning_type in [
-                    CalendarEventTypeChoices.course,
-                    CalendarEventTypeChoices.learning_path,
-                    CalendarEventTypeChoices.advanced_learning_path,
-                ]:
-                    CalendarActivityCreationTask().run_task(
-                        event_type=enrollment.learning_type,
-                        event_instance_id=learning_instance.id,
-                        user_ids=user_or_group.id
-                        if is_user
-                        else list(user_or_group.members.all().values_list("id", flat=True)),
-                        db_name=self.db_name,
-                    )
-                if is_user:
-                    tracker_instance = (
-                        getattr(user_or_group, tracker_related_fields[enrollment.learning_type])
-                        .filter(**{enrollment.learning_type: learning_instance.id if learning_instance else None})
-                        .first()
-                    )
-                    if tracker_instance:
-                        enrollment.learning_status = LearningStatusChoices.started
-                        enrollment.save()
-                self.logger.info(f"**{learning_type} {item.name} enrolled successfully for {user_or_group}.")
-            except Exception:  # noqa
-                enrollment = None
-                self.logger.info(f"**{learning_type} {item.name} enrollment failed for {user_or_group}.")
-            if enrollment and is_user:
-                UserEnrollmentEmailTask().run_task(
-                    user_id=user_or_group.id, enrollment_id=enrollment.id, db_name=self.db_name
+
+        lookup = f"{learning_type}_id"
+        user_ids, learning_ids = [user.id for user in users], [learning.id for learning in learnings]
+        enrollments = Enrollment.objects.filter(**{f"{lookup}__in": learning_ids})
+        existing = set(enrollments.filter(user_id__in=user_ids).values_list("user_id", lookup))
+        existing.update(
+            enrollments.filter(user_group__members__id__in=user_ids).values_list("user_group__members__id", lookup)
+        )
+        tracker_lookup = f"{tracker_related_fields[learning_type]}__{lookup}"
+        tracked = set(
+            User.objects.filter(id__in=user_ids, **{f"{tracker_lookup}__in": learning_ids}).values_list(
+                "id", tracker_lookup
+            )
+        )
+        return Enrollment.objects.bulk_create(
+            [
+                Enrollment(
+                    user=user,
+                    learning_type=learning_type,
+                    **{learning_type: learning},
+                    **default_enrollment_args,
+                    **(
+                        {"learning_status": LearningStatusChoices.started}
+                        if (user.id, learning.id) in tracked
+                        else {}
+                    ),
                 )
+                for user in users
+                for learning in learnings
+                if (user.id, learning.id) not in existing
+            ]
+        )
+
+    def emit_side_effects(self, learning_type, learning, enrollments):
+        """
+        Emits the side effects of the newly created enrollments of the learning, once for all the enrolled
+        users. The users of the group enrollments are resolved from the group members.
+        """
+
+        from apps.access_control.models import UserGroup
+        from apps.my_learning.config import FeedActivityTypeChoices
+        from apps.my_learning.tasks import CalendarActivityCreationTask, UserFeedFanOutTask
+        from apps.notification.models import Notification
+
+        user_ids = {enrollment.user_id for enrollment in enrollments if enrollment.user_id}
+        if group_ids := {enrollment.user_group_id for enrollment in enrollments if enrollment.user_group_id}:
+            user_ids.update(
+                UserGroup.members.through.objects.filter(usergroup_id__in=group_ids).values_list("user_id", flat=True)
+            )
+        if not user_ids:
+            return False
+        user_ids = list(user_ids)
+
+        if actions := enrollments[0].get_actions(is_notification=True):
+            message, data = Notification.notify_details(
+                actions["assigned_action"], **{f"{learning_type}_id": learning.id, "obj_name": learning.name}
+            )
+            Notification.objects.bulk_create(
+                [Notification(user_id=user_id, message=message, data=data) for user_id in user_ids]
+            )
+        if activities := [
+            {
+                "actor_id": enrollment.user_id,
+                "activity_type": FeedActivityTypeChoices.enrolled,
+                "enrollment_id": enrollment.id,
+            }
+            for enrollment in enrollments
+            if enrollment.user_id
+        ]:
+            UserFeedFanOutTask().run_task(activities=activities, db_name=self.db_name)
+        if learning_type == EnrollmentTypeChoices.course:
+            self.register_users_in_chat(user_ids, learning)
+        if learning_type in CALENDAR_LEARNING_TYPES:
+            CalendarActivityCreationTask().run_task(
+                event_type=learning_type, event_instance_id=learning.id, user_ids=user_ids, db_name=self.db_name
+            )
+        UserEnrollmentEmailTask().run_task(enrollment_id=enrollments[0].id, user_ids=user_ids, db_name=self.db_name)
+        for enrollment in enrollments:
+            if enrollment.user_id:
                 enrollment.call_leaderboard_tasks(is_assigned=True, request_headers=self.request_headers)
-            elif enrollment and not is_user:
-                UserEnrollmentEmailTask().run_task(
-                    user_group_id=user_or_group.id, enrollment_id=enrollment.id, db_name=self.db_name
-                )
         return True
 
-    def process_enrollments(self, groups_or_users, items, default_enrollment_args):
-        """Process the given data for enrollment."""
+    def process_enrollments(self, groups, users, validated_data, default_enrollment_args):
+        """Creates the enrollments of the groups & users set-wise per learning type & emits the side effects."""
 
-        from apps.access.models import User
+        from apps.access_control.models import UserGroup
+        from apps.my_learning.models import Enrollment
         from apps.tenant_service.middlewares import get_current_db_name
         from apps.virtutor.tasks import SessionParticipantUpdateTask
 
-        user_ids = []
-        learning_type_and_ids = {
-            EnrollmentTypeChoices.course: [],
-            EnrollmentTypeChoices.learning_path: [],
-            EnrollmentTypeChoices.advanced_learning_path: [],
-        }
-        for group_or_user in groups_or_users:
-            if isinstance(group_or_user, User):
-                user_ids.append(group_or_user.id)
-            else:
-                user_ids += list(group_or_user.members.values_list("id", flat=True))
-            for course in items["course"]:
-                learning_type = EnrollmentTypeChoices.course
-                self.create_enrollments(group_or_user, [course], learning_type, default_enrollment_args)
-                learning_type_and_ids[learning_type].append(course.id)
-            for learning_path in items["learning_path"]:
-                learning_type = EnrollmentTypeChoices.learning_path
-                self.create_enrollments(group_or_user, [learning_path], learning_type, default_enrollment_args)
-                learning_type_and_ids[learning_type].append(learning_path.id)
-            for alp in items["alp"]:
-                learning_type = EnrollmentTypeChoices.advanced_learning_path
-                self.create_enrollments(group_or_user, [alp], learning_type, default_enrollment_args)
-                learning_type_and_ids[learning_type].append(alp.id)
-            for st in items["skill_traveller"]:
-                self.create_enrollments(
-                    group_or_user, [st], EnrollmentTypeChoices.skill_traveller, default_enrollment_args
-                )
-            for playground in items["playground"]:
-                self.create_enrollments(
-                    group_or_user, [playground], EnrollmentTypeChoices.playground, default_enrollment_args
-                )
-            for pg in items["playground_group"]:
-                self.create_enrollments(
-                    group_or_user, [pg], EnrollmentTypeChoices.playground_group, default_enrollment_args
-                )
-            for assignment in items["assignment"]:
-                self.create_enrollments(
-                    group_or_user, [assignment], EnrollmentTypeChoices.assignment, default_enrollment_args
-                )
-            for assignment_group in items["assignment_group"]:
-                self.create_enrollments(
-                    group_or_user, [assignment_group], EnrollmentTypeChoices.assignment_group, default_enrollment_args
-                )
-        for learning_type, learning_ids in learning_type_and_ids.items():
-            if learning_ids:
+        user_ids = {user.id for user in users}
+        user_ids.update(
+            UserGroup.members.through.objects.filter(usergroup_id__in=[group.id for group in groups]).values_list(
+                "user_id", flat=True
+            )
+        )
+        for key, learning_type in BULK_ENROLL_LEARNING_TYPES.items():
+            if not (learnings := validated_data[key]):
+                continue
+            with transaction.atomic(using=Enrollment.objects.db):
+                # groups first, so that the members of the newly enrolled groups are not enrolled again
+                enrollments = self.create_group_enrollments(groups, learning_type, learnings, default_enrollment_args)
+                enrollments += self.create_user_enrollments(users, learning_type, learnings, default_enrollment_args)
+            learning_enrollments = {}
+            for enrollment in enrollments:
+                learning_enrollments.setdefault(getattr(enrollment, f"{learning_type}_id"), []).append(enrollment)
+            for learning in learnings:
+                if created := learning_enrollments.get(learning.id):
+                    self.emit_side_effects(learning_type, learning, created)
+                self.logger.info(f"**{learning_type} {learning.name} enrolled for {len(created or [])} users/groups.")
+            if learning_type in CALENDAR_LEARNING_TYPES and user_ids:
                 SessionParticipantUpdateTask().run_task(
                     learning_type=learning_type,
-                    learning_instance_id=learning_ids,
-                    user_id=user_ids,
+                    learning_instance_id=[learning.id for learning in learnings],
+                    user_id=list(user_ids),
                     idp_token=self.token,
                     db_name=get_current_db_name(),
                 )
@@ -168,11 +214,13 @@ class UserBulkEnrollTask(BaseAppTask):
 
         from apps.access.models import User
         from apps.my_learning.serializers.v1 import UserBulkEnrollSerializer
+        from apps.tenant_service.middlewares import get_current_tenant_details
 
         self.switch_db(db_name)
         self.db_name = db_name
         self.token = kwargs.get("token")
         self.request_headers = kwargs.get("request", None)
+        self.tenant_details = get_current_tenant_details()
         serializer = UserBulkEnrollSerializer(data=data)
         serializer.is_valid()
         validated_data = serializer.validated_data
@@ -187,6 +235,7 @@ class UserBulkEnrollTask(BaseAppTask):
             "is_enrolled": True,
             "end_date": validated_data["end_date"],
         }
-        self.process_enrollments(validated_data["user_group"], validated_data, default_enrollment_args)
-        self.process_enrollments(validated_data["users"], validated_data, default_enrollment_args)
+        self.process_enrollments(
+            validated_data["user_group"], validated_data["users"], validated_data, default_enrollment_args
+        )
         return True
@@ -0,0 +1,131 @@
+from apps.common.tasks import BaseAppTask
+
+
+class UserFeedFanOutTask(BaseAppTask):
+    """
+    Task to push the activities of the actors to the materialized feed of their followers & friends. The
+    audience of all the actors is resolved in two queries & the feed rows are written with a single insert.
+    Actors with a bigger audience than `USER_FEED_FAN_OUT_LIMIT` are skipped, their activities are read on
+    demand while building the feed.
+    """
+
+    batch_size = 1000
+
+    def run(self, activities, db_name, **kwargs):
+        """
+        Run handler. The `activities` is a list of dicts with the keys `actor_id`, `activity_type` &
+        `enrollment_id` or `post_like_id`.
+        """
+
+        from apps.my_learning.models import UserFeedActivity
+
+        self.switch_db(db_name)
+        self.logger.info(f"Executing UserFeedFanOutTask for {len(activities)} activities on {db_name}.")
+
+        actor_ids = {activity["actor_id"] for activity in activities}
+        heavy_actor_ids = UserFeedActivity.get_heavy_actor_ids(actor_ids)
+        audiences = UserFeedActivity.get_actor_audiences(actor_ids - heavy_actor_ids)
+        feed_activities = [
+            UserFeedActivity(
+                user_id=user_id,
+                actor_id=activity["actor_id"],
+                activity_type=activity["activity_type"],
+                enrollment_id=activity.get("enrollment_id"),
+                post_like_id=activity.get("post_like_id"),
+            )
+            for activity in activities
+            for user_id in audiences.get(activity["actor_id"], [])
+        ]
+        UserFeedActivity.objects.bulk_create(feed_activities, batch_size=self.batch_size)
+        return len(feed_activities)
+
+
+class UserFeedConnectionTask(BaseAppTask):
+    """
+    Task to sync the materialized feed of the user with the connections of the user. On follow or friend
+    accept the recent activities of the actor are backfilled, on unfollow the activities of the actor are
+    removed unless the actor is still in the audience of the user(friend).
+    """
+
+    def run(self, user_id, actor_id, is_connected, db_name, **kwargs):
+        """Run handler."""
+
+        from apps.my_learning.models import UserFeedActivity
+
+        self.switch_db(db_name)
+        self.logger.info(f"Executing UserFeedConnectionTask for user {user_id} & actor {actor_id} on {db_name}.")
+
+        is_audience = user_id in UserFeedActivity.get_actor_audiences([actor_id])[actor_id]
+        if not is_connected:
+            if is_audience:
+                return 0
+            return UserFeedActivity.objects.filter(user_id=user_id, actor_id=actor_id).delete()[0]
+        # heavy actors are read on demand while building the feed
+        if not is_audience or UserFeedActivity.get_heavy_actor_ids([actor_id]):
+            return 0
+        return self.backfill_actor_activities(user_id, actor_id)
+
+    @staticmethod
+    def backfill_actor_activities(user_id, actor_id):
+        """Pushes the recent activities of the actor, which are not in the feed already, to the feed of the user."""
+
+        from django.db.models import OuterRef, Subquery
+
+        from apps.forum.models import PostLike
+        from apps.my_learning.config import USER_FEED_BACKFILL_LIMIT, FeedActivityTypeChoices, LearningStatusChoices
+        from apps.my_learning.models import Enrollment, UserFeedActivity
+
+        existing = set(
+            UserFeedActivity.objects.filter(user_id=user_id, actor_id=actor_id).values_list(
+                "activity_type", "enrollment_id", "post_like_id"
+            )
+        )
+        enrollments = Enrollment.objects.filter(user_id=actor_id, is_enrolled=True)
+        sources = [
+            (
+                FeedActivityTypeChoices.enrolled,
+                "enrollment_id",
+                enrollments.order_by("-created_at").values_list("id", flat=True),
+            ),
+            (
+                FeedActivityTypeChoices.completed,
+                "enrollment_id",
+                enrollments.filter(learning_status=LearningStatusChoices.completed)
+                .order_by("-modified_at")
+                .values_list("id", flat=True),
+            ),
+            (
+                FeedActivityTypeChoices.post_liked,
+                "post_like_id",
+                PostLike.objects.filter(created_by_id=actor_id, is_liked=True)
+                .order_by("-created_at")
+                .values_list("id", flat=True),
+            ),
+        ]
+        feed_activities = []
+        for activity_type, field, queryset in sources:
+            for source_id in queryset[:USER_FEED_BACKFILL_LIMIT]:
+                key = (
+                    activity_type,
+                    source_id if field == "enrollment_id" else None,
+                    source_id if field == "post_like_id" else None,
+                )
+                if key not in existing:
+                    feed_activities.append(
+                        UserFeedActivity(
+                            user_id=user_id, actor_id=actor_id, activity_type=activity_type, **{field: source_id}
+                        )
+                    )
+        feed_activities = UserFeedActivity.objects.bulk_create(feed_activities)
+
+        # keep the original datetime of the activities, used to order & paginate the feed
+        feed_activity_ids = [feed_activity.id for feed_activity in feed_activities]
+        for activity_type, model, field, datetime_field in [
+            (FeedActivityTypeChoices.enrolled, Enrollment, "enrollment_id", "created_at"),
+            (FeedActivityTypeChoices.completed, Enrollment, "enrollment_id", "modified_at"),
+            (FeedActivityTypeChoices.post_liked, PostLike, "post_like_id", "created_at"),
+        ]:
+            UserFeedActivity.objects.filter(id__in=feed_activity_ids, activity_type=activity_type).update(
+                created_at=Subquery(model.objects.filter(id=OuterRef(field)).values(datetime_field)[:1])
+            )
+        return len(feed_activities)
@@ -18,6 +18,7 @@ from apps.my_learning.urls.v1.announcement import urlpatterns as announcement_ur
 from apps.my_learning.urls.v1.user_notification import urlpatterns as user_notification_urls
 from apps.my_learning.urls.v1.assignment_group import urlpatterns as assignment_group_urls
 from apps.my_learning.urls.v1.recommendation import urlpatterns as recommendation_urls
+from apps.my_learning.urls.v1.auto_assignment import urlpatterns as auto_assignment_urls
 
 urlpatterns = (
     course_urls
@@ -40,4 +41,5 @@ urlpatterns = (
     + assignment_group_urls
     + skill_ontology_urls
     + recommendation_urls
+    + auto_assignment_urls
 )
@@ -0,0 +1,12 @@
+from apps.common.routers import AppSimpleRouter
+from apps.my_learning.views.api.v1 import AutoAssignmentRuleCUDApiViewSet, AutoAssignmentRuleListApiViewSet
+
+app_name = "auto_assignment"
+API_URL_PREFIX = "api/v1/my-learning/auto-assignment-rule"
+
+router = AppSimpleRouter()
+
+router.register(f"{API_URL_PREFIX}/cud", AutoAssignmentRuleCUDApiViewSet)
+router.register(f"{API_URL_PREFIX}/list", AutoAssignmentRuleListApiViewSet)
+
+urlpatterns = [] + router.urls
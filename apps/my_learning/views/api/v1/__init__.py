@@ -144,3 +144,4 @@ from .one_profile import OneProfileUserInfoAPIView, OneProfileAssessmentInfoAPIV
 from .announcement import AnnouncementCUDApiViewSet, AnnouncementListApiViewSet, AnnouncementImageUploadAPIView
 from .user_notification import UserNotificationAPIView
 from .recommendation import LearningRecommendationAPIView
+from .auto_assignment import AutoAssignmentRuleCUDApiViewSet, AutoAssignmentRuleListApiViewSet
@@ -0,0 +1,47 @@
+from django.db import transaction
+
+from apps.access.tasks import AutoAssignLearningTask
+from apps.access_control.fixtures import PolicyChoices
+from apps.common.views.api import AppModelCUDAPIViewSet, AppModelListAPIViewSet
+from apps.my_learning.models import AutoAssignmentRule
+from apps.my_learning.serializers.v1 import AutoAssignmentRuleCUDModelSerializer, AutoAssignmentRuleListModelSerializer
+from apps.tenant_service.middlewares import get_current_db_name
+
+
+class AutoAssignmentRuleCUDApiViewSet(AppModelCUDAPIViewSet):
+    """ViewSet for create, update & destroy AutoAssignmentRule. The rule is evaluated for all users on save."""
+
+    serializer_class = AutoAssignmentRuleCUDModelSerializer
+    queryset = AutoAssignmentRule.objects.all()
+    policy_slug = PolicyChoices.enrollment_management
+
+    @staticmethod
+    def evaluate_rule(instance):
+        """Evaluates the rule once the changes are committed."""
+
+        if instance.is_active:
+            db_name = get_current_db_name()
+            transaction.on_commit(
+                lambda: AutoAssignLearningTask().run_task(rule_ids=[instance.id], db_name=db_name),
+                using=AutoAssignmentRule.objects.db,
+            )
+
+    def perform_create(self, serializer):
+        """Overridden to evaluate the new rule."""
+
+        self.evaluate_rule(serializer.save())
+
+    def perform_update(self, serializer):
+        """Overridden to evaluate the updated rule."""
+
+        self.evaluate_rule(serializer.save())
+
+
+class AutoAssignmentRuleListApiViewSet(AppModelListAPIViewSet):
+    """ViewSet to list AutoAssignmentRules."""
+
+    serializer_class = AutoAssignmentRuleListModelSerializer
+    queryset = AutoAssignmentRule.objects.prefetch_related(*AutoAssignmentRule.prefetch_fields)
+    policy_slug = PolicyChoices.enrollment_management
+    search_fields = ["name", "description"]
+    filterset_fields = ["is_active", "is_for_all_users"]
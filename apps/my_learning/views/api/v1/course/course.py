@@ -2,11 +2,11 @@ from django.db.models import Q
 from rest_framework.generics import get_object_or_404
 
 from apps.common.mml_communicator import mml_vm_creation
-from apps.common.views.api import AppAPIView, AppModelCUDAPIViewSet, AppModelRetrieveAPIViewSet
+from apps.common.views.api import AppAPIView, AppModelCUDAPIViewSet, AppModelRetrieveAPIViewSet, AsyncAppAPIView
 from apps.learning.config import AssessmentTypeChoices, CommonLearningAssignmentTypeChoices
 from apps.learning.models import Course
 from apps.my_learning.config import EnrollmentTypeChoices
-from apps.my_learning.helpers import get_ccms_list_details, get_ccms_tracker_details
+from apps.my_learning.helpers import async_get_ccms_list_details, get_ccms_list_details, get_ccms_tracker_details
 from apps.my_learning.models import Enrollment, FeedbackResponse, UserCourseTracker
 from apps.my_learning.serializers.v1 import (
     BaseEnrollmentListModelSerializer,
@@ -143,53 +143,80 @@ class UserCourseFinalEvaluationListApiView(AppAPIView):
                 return self.send_error_response("Something went wrong. Contact us.")
 
 
-class UserCCMSCourseListApiView(AppAPIView):
-    """Course list from ccms."""
+class UserCCMSCourseEnrollmentMixin:
+    """Adds the enrollment & tracker details of the user to the CCMS courses, hits the database."""
 
-    def get(self, request, *args, **kwargs):
+    def get_enrollment_details(self, result):
+        """Adds the user's enrollment & tracker details to the given CCMS course. Returns the course."""
+
+        course_uuid = result["uuid"]
+        user = self.get_user()
+        user_groups = user.related_user_groups.all().values_list("id", flat=True)
+        enrollment_instance = Enrollment.objects.filter(
+            Q(user_group__in=user_groups) | Q(user=user),
+            learning_type=EnrollmentTypeChoices.course,
+            ccms_id=course_uuid,
+        ).first()
+        result["enrolled_details"] = (
+            BaseEnrollmentListModelSerializer(enrollment_instance, context=self.get_serializer_context()).data
+            if enrollment_instance
+            else None
+        )
+        result["tracker_detail"] = get_ccms_tracker_details(
+            user=user, learning_type=EnrollmentTypeChoices.course, ccms_id=course_uuid
+        )
+        return result
+
+
+class UserCCMSCourseListApiView(UserCCMSCourseEnrollmentMixin, AsyncAppAPIView):
+    """Course list from ccms. Async, waits on the CCMS."""
+
+    def get_results(self, results):
+        """Adds the enrollment details to the CCMS courses."""
+
+        for result in results:
+            self.get_enrollment_details(result)
+        return results
+
+    async def get(self, request, *args, **kwargs):
         """Returns the CCMS courses with enrollment details."""
 
         request_params = request.query_params.dict()
         request_headers = {"headers": dict(request.headers)}
-        success, data = get_ccms_list_details(
+        success, data = await async_get_ccms_list_details(
             request=request_headers, learning_type=EnrollmentTypeChoices.course, params=request_params
         )
         if success:
-            results = data["data"]["results"]
-            for result in results:
-                course_uuid = result["uuid"]
-                user = self.get_user()
-                user_groups = user.related_user_groups.all().values_list("id", flat=True)
-                enrollment_instance = Enrollment.objects.filter(
-                    Q(user_group__in=user_groups) | Q(user=user),
-                    learning_type=EnrollmentTypeChoices.course,
-                    ccms_id=course_uuid,
-                ).first()
-                result["enrolled_details"] = (
-                    BaseEnrollmentListModelSerializer(enrollment_instance, context=self.get_serializer_context()).data
-                    if enrollment_instance
-                    else None
-                )
-                result["tracker_detail"] = get_ccms_tracker_details(
-                    user=user, learning_type=EnrollmentTypeChoices.course, ccms_id=course_uuid
-                )
+            await self.run_sync(self.get_results, data["data"]["results"])
             return self.send_response(data["data"])
         else:
             return self.send_error_response(data["data"])
 
 
-class UserCCMSCourseRetrieveApiView(AppAPIView):
-    """Course retrieve from ccms."""
+class UserCCMSCourseRetrieveApiView(UserCCMSCourseEnrollmentMixin, AsyncAppAPIView):
+    """Course retrieve from ccms. Async, waits on the CCMS."""
 
-    def get(self, request, *args, **kwargs):
+    def get_result(self, result):
+        """Adds the enrollment & feedback details to the CCMS course."""
+
+        self.get_enrollment_details(result)
+        result["is_feedback_given"] = FeedbackResponse.objects.filter(
+            learning_type=EnrollmentTypeChoices.course,
+            learning_type_id=result["uuid"],
+            template_ccms_id__in=result["feedback_template_uuids"],
+            user=self.get_user(),
+        ).exists()
+        return result
+
+    async def get(self, request, *args, **kwargs):
         """Returns the CCMS course with enrollment details."""
 
-        from apps.learning.helpers import get_ccms_retrieve_details
+        from apps.learning.helpers import async_get_ccms_retrieve_details
 
         request_params = request.query_params.dict()
         request_headers = {"headers": dict(request.headers)}
         course_id = kwargs.get("uuid")
-        success, data = get_ccms_retrieve_details(
+        success, data = await async_get_ccms_retrieve_details(
             learning_type=EnrollmentTypeChoices.course,
             instance_id=course_id,
             request=request_headers,
@@ -198,28 +225,7 @@ class UserCCMSCourseRetrieveApiView(AppAPIView):
         if success:
             result = data["data"]
             if result:
-                course_uuid = result["uuid"]
-                user = self.get_user()
-                user_groups = user.related_user_groups.all().values_list("id", flat=True)
-                enrollment_instance = Enrollment.objects.filter(
-                    Q(user_group__in=user_groups) | Q(user=user),
-                    learning_type=EnrollmentTypeChoices.course,
-                    ccms_id=course_uuid,
-                ).first()
-                result["enrolled_details"] = (
-                    BaseEnrollmentListModelSerializer(enrollment_instance, context=self.get_serializer_context()).data
-                    if enrollment_instance
-                    else None
-                )
-                result["tracker_detail"] = get_ccms_tracker_details(
-                    user=user, learning_type=EnrollmentTypeChoices.course, ccms_id=course_uuid
-                )
-                result["is_feedback_given"] = FeedbackResponse.objects.filter(
-                    learning_type=EnrollmentTypeChoices.course,
-                    learning_type_id=course_uuid,
-                    template_ccms_id__in=result["feedback_template_uuids"],
-                    user=user,
-                ).exists()
+                await self.run_sync(self.get_result, result)
             return self.send_response(result)
         else:
             return self.send_error_response(data["data"])
@@ -11,6 +11,7 @@ from apps.access_control.config import RoleTypeChoices
 from apps.access_control.fixtures import PolicyChoices
 from apps.access_control.models import UserGroup
 from apps.common.helpers import get_sorting_meta
+from apps.common.pagination import EstimatedCountPagination
 from apps.common.views.api import (
     AppAPIView,
     AppModelCreateAPIViewSet,
@@ -69,6 +70,7 @@ class EnrollmentListApiViewSet(SortingMixin, AppModelListAPIViewSet):
 
     serializer_class = EnrollmentListModelSerializer
     queryset = Enrollment.objects.all()
+    pagination_class = EstimatedCountPagination
     filterset_fields = [
         "learning_type",
         "course",
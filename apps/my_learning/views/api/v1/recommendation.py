@@ -1,7 +1,7 @@
 from django.db.models import Q
 
-from apps.common.communicator import get_request
-from apps.common.views.api.base import AppAPIView
+from apps.common.async_communicator import async_get_request
+from apps.common.views.api.base import AsyncAppAPIView
 from apps.learning.models import Course
 from apps.learning.serializers.v1 import CourseListModelSerializer
 from apps.tenant_service.middlewares import get_current_tenant_details
@@ -16,22 +16,12 @@ RESOURCE_SERIALIZERS = {
 }
 
 
-class LearningRecommendationAPIView(AppAPIView):
-    """Api view to get learning recommendations."""
+class LearningRecommendationAPIView(AsyncAppAPIView):
+    """Api view to get learning recommendations. Async, waits on the recommendation service."""
 
-    def get(self, *args, **kwargs):
-        """Handle on get."""
+    def get_recommended_learnings(self, user, tenant_id, data):
+        """Returns the serialized learnings of the recommendations, hits the database."""
 
-        user = self.get_user()
-        tenant_id = get_current_tenant_details()["id"]
-        success, data = get_request(
-            service=None,
-            host=DEVONE_CONFIG["host"],
-            url_path=DEVONE_CONFIG["recommendation_url"],
-            params={"tenant": tenant_id, "user": user.id},
-        )
-        if not success:
-            return self.send_error_response(data=data)
         response = {"course": []}
         if tenant_id == 861:
             # TODO: Hardcoded this for demoiiht tenant as per dakshans context. Need to remove this.
@@ -51,4 +41,19 @@ class LearningRecommendationAPIView(AppAPIView):
                 if data["ModelOutput"]:
                     if obj := RESOURCE_MODELS[resource_type].objects.alive().filter(id=data["ResourceId"]).first():
                         response[resource_type].append(RESOURCE_SERIALIZERS[resource_type](obj).data)
-        return self.send_response(response)
+        return response
+
+    async def get(self, *args, **kwargs):
+        """Handle on get."""
+
+        user = self.get_user()
+        tenant_id = (await self.run_sync(get_current_tenant_details))["id"]
+        success, data = await async_get_request(
+            service=None,
+            host=DEVONE_CONFIG["host"],
+            url_path=DEVONE_CONFIG["recommendation_url"],
+            params={"tenant": tenant_id, "user": user.id},
+        )
+        if not success:
+            return self.send_error_response(data=data)
+        return self.send_response(await self.run_sync(self.get_recommended_learnings, user, tenant_id, data))
@@ -1,15 +1,25 @@
+from django.db.models import Q
+
 from apps.access.models import User, UserConnection
 from apps.access.serializers.v1.base import SimpleUserReadOnlyModelSerializer
+from apps.common.pagination import decode_composite_cursor, encode_composite_cursor
 from apps.common.serializers import AppReadOnlyModelSerializer, BaseIDNameSerializer
 from apps.common.views.api import AppAPIView
 from apps.forum.models import PostLike
-from apps.my_learning.config import LearningStatusChoices
-from apps.my_learning.models import Enrollment
+from apps.my_learning.config import USER_FEED_PAGE_SIZE, FeedActivityTypeChoices, LearningStatusChoices
+from apps.my_learning.models import Enrollment, UserFeedActivity
 from apps.my_learning.serializers.v1 import EnrollmentListModelSerializer
 
 
 class UserFeedPageApiView(AppAPIView):
-    """Api view for user feed page to retrieve the activities of user's friends and following."""
+    """
+    Api view for user feed page to retrieve the activities of user's friends and following.
+
+    The activities are read from the materialized `UserFeedActivity` & paginated with a `(created_at, id)` cursor.
+    Activities of the actors with a bigger audience are not fanned out on write, those are read from the source
+    tables & merged in. The cursor of a section keeps a position per source, as the ids of the tables are not
+    comparable. Pass `activity_type` & `cursor` to paginate a single section of the feed.
+    """
 
     class LikedPostSerializer(AppReadOnlyModelSerializer):
         created_by = SimpleUserReadOnlyModelSerializer(read_only=True)
@@ -22,28 +32,104 @@ class UserFeedPageApiView(AppAPIView):
                 "created_by",
             ]
 
+    sections = {
+        FeedActivityTypeChoices.enrolled: "enrolled_learnings",
+        FeedActivityTypeChoices.completed: "completed_learnings",
+        FeedActivityTypeChoices.post_liked: "liked_posts",
+    }
+
+    def get_following_user_ids(self, user):
+        """Returns the ids of the users followed by & the friends of the user."""
+
+        user_ids = set(User.objects.filter(related_user_connections__followers=user).values_list("id", flat=True))
+        friends = UserConnection.friends.through.objects.filter(userconnection__user=user)
+        user_ids.update(friends.values_list("user_id", flat=True))
+        return user_ids
+
+    @staticmethod
+    def get_source_queryset(activity_type, actor_ids):
+        """Returns the source objects of the activity type, ordered by the activity datetime."""
+
+        if activity_type == FeedActivityTypeChoices.post_liked:
+            return PostLike.objects.filter(created_by_id__in=actor_ids, is_liked=True)
+        enrollments = Enrollment.objects.filter(user_id__in=actor_ids, is_enrolled=True)
+        if activity_type == FeedActivityTypeChoices.completed:
+            return enrollments.filter(learning_status=LearningStatusChoices.completed)
+        return enrollments.exclude(learning_status=LearningStatusChoices.completed)
+
+    def get_section(self, user, activity_type, following_user_ids, heavy_actor_ids, cursor=None):
+        """Returns the page of the activity type along with the cursor of the next page."""
+
+        page_size = USER_FEED_PAGE_SIZE
+        positions = decode_composite_cursor(cursor)
+        source_field = "post_like" if activity_type == FeedActivityTypeChoices.post_liked else "enrollment"
+
+        feed_activities = UserFeedActivity.objects.filter(
+            user=user,
+            activity_type=activity_type,
+            actor_id__in=following_user_ids - heavy_actor_ids,
+        )
+        if activity_type == FeedActivityTypeChoices.enrolled:
+            feed_activities = feed_activities.filter(enrollment__is_enrolled=True).exclude(
+                enrollment__learning_status=LearningStatusChoices.completed
+            )
+        elif activity_type == FeedActivityTypeChoices.completed:
+            feed_activities = feed_activities.filter(enrollment__is_enrolled=True)
+        if position := positions.get("feed"):
+            feed_activities = feed_activities.filter(
+                Q(created_at__lt=position[0]) | Q(created_at=position[0], id__lt=position[1])
+            )
+        feed_activities = feed_activities.select_related(source_field).order_by("-created_at", "-id")
+        items = [
+            (activity.created_at, "feed", activity.id, getattr(activity, source_field))
+            for activity in feed_activities[: page_size + 1]
+        ]
+
+        if heavy_actor_ids := heavy_actor_ids & following_user_ids:
+            # fan-out on read for the actors with a bigger audience
+            datetime_field = "modified_at" if activity_type == FeedActivityTypeChoices.completed else "created_at"
+            source_objects = self.get_source_queryset(activity_type, heavy_actor_ids)
+            if position := positions.get("source"):
+                source_objects = source_objects.filter(
+                    Q(**{f"{datetime_field}__lt": position[0]})
+                    | Q(**{datetime_field: position[0], "id__lt": position[1]})
+                )
+            items += [
+                (getattr(instance, datetime_field), "source", instance.id, instance)
+                for instance in source_objects.order_by(f"-{datetime_field}", "-id")[: page_size + 1]
+            ]
+
+        items.sort(key=lambda item: item[:3], reverse=True)
+        next_cursor = None
+        if len(items) > page_size:
+            # the last returned item of every source, the sources without returned items keep their position
+            for created_at, source, instance_id, _ in items[:page_size]:
+                positions[source] = (created_at, instance_id)
+            next_cursor = encode_composite_cursor(positions)
+        instances = [instance for _, _, _, instance in items[:page_size]]
+        if activity_type == FeedActivityTypeChoices.post_liked:
+            data = self.LikedPostSerializer(instances, many=True).data
+        else:
+            data = EnrollmentListModelSerializer(instances, many=True, context=self.get_serializer_context()).data
+        return data, next_cursor
+
     def get(self, request, *args, **kwargs):
         """Handle in get."""
 
         user = self.get_user()
-        user_ids = list(User.objects.filter(related_user_connections__followers=user).values_list("id", flat=True))
-        if connection_instance := UserConnection.objects.filter(user=user).first():
-            user_ids += list(connection_instance.friends.all().values_list("id", flat=True))
-        user_enrollments = Enrollment.objects.filter(user_id__in=user_ids, is_enrolled=True).order_by("-created_at")
-        return self.send_response(
-            {
-                "enrolled_learnings": EnrollmentListModelSerializer(
-                    user_enrollments.exclude(learning_status=LearningStatusChoices.completed)[:10],
-                    many=True,
-                    context=self.get_serializer_context(),
-                ).data,
-                "completed_learnings": EnrollmentListModelSerializer(
-                    user_enrollments.filter(learning_status=LearningStatusChoices.completed)[:10],
-                    many=True,
-                    context=self.get_serializer_context(),
-                ).data,
-                "liked_posts": self.LikedPostSerializer(
-                    PostLike.objects.filter(created_by_id__in=user_ids).order_by("-created_at")[:10], many=True
-                ).data,
-            }
-        )
+        following_user_ids = self.get_following_user_ids(user)
+        heavy_actor_ids = UserFeedActivity.get_heavy_actor_ids(following_user_ids)
+        activity_type = request.query_params.get("activity_type")
+        if activity_type in self.sections:
+            data, next_cursor = self.get_section(
+                user, activity_type, following_user_ids, heavy_actor_ids, request.query_params.get("cursor")
+            )
+            return self.send_response({"results": data, "next_cursor": next_cursor})
+
+        response, next_cursors = {}, {}
+        for activity_type, section in self.sections.items():
+            response[section], next_cursors[activity_type] = self.get_section(
+                user, activity_type, following_user_ids, heavy_actor_ids
+            )
+        response["next_cursors"] = next_cursors
+        return self.send_response(response)
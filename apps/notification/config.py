@@ -19,3 +19,5 @@ class NotifyActionChoices(DjangoChoices):
     # Skill Ontology
     skill_ontology_enroll = ChoiceItem("skill_ontology_enroll", "Skill Ontology Enrollment")
     skill_ontology_complete = ChoiceItem("skill_ontology_complete", "Skill Ontology Completion")
+    # Learning Retirement
+    learning_retired = ChoiceItem("learning_retired", "Learning Retired")
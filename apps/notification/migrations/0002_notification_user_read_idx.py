@@ -0,0 +1,20 @@
+# Generated by Django 4.2.3 on 2026-10-19 12:30
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # indexes are built `CONCURRENTLY`, which can not run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("notification", "0001_initial"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="notification",
+            index=models.Index(fields=["user", "is_read", "-created_at"], name="notification_user_read_idx"),
+        ),
+    ]
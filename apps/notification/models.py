@@ -22,6 +22,7 @@ class Notification(BaseModel):
 
     class Meta(BaseModel.Meta):
         default_related_name = "related_notifications"
+        indexes = [models.Index(fields=["user", "is_read", "-created_at"], name="notification_user_read_idx")]
 
     # QS Manager
     objects = NotificationObjectManagerQueryset.as_manager()
@@ -90,6 +91,9 @@ class Notification(BaseModel):
             case NotifyActionChoices.skill_ontology_complete:
                 data["skill_ontology_id"] = kwargs.get("skill_ontology_id", None)
                 message = f"You have successfully completed the skill ontology {obj_name}."
+            # Learning Retirement
+            case NotifyActionChoices.learning_retired:
+                message = f"{obj_name} has been retired and is no longer available."
             case _:
                 raise ValueError("Invalid Notification Type")
         return message, data
@@ -10,7 +10,7 @@ class T1TenantSetupTask(BaseAppTask):
     def run(self, tenant_id):
         """Run handler."""
 
-        from apps.access_control.models import PolicyCategory, UserRole
+        from apps.access_control.models import UserRole
         from apps.tenant.models import Tenant
 
         self.switch_db()
@@ -26,8 +26,6 @@ class T1TenantSetupTask(BaseAppTask):
         if router.setup_status != BaseUploadStatusChoices.completed:
             return False
 
-        UserRole.populate_default_user_roles(db_name=tenant.db_name)
-        PolicyCategory.populate_policies(db_name=tenant.db_name)
         self.switch_db(router.database_name)
         self.setup_tenant_admin(data["tenantAdmin"], UserRole)
         return True
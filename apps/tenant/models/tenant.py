@@ -191,14 +191,15 @@ class Tenant(ArchivableModel, UniqueNameModel):
         return config
 
     def activate_db(self):
-        """Used in shell purpose only."""
-
-        from apps.tenant_service.models import set_db_as_env
+        """
+        Activates the tenant's database for the rest of the request or task, reset by the `TenantContextMiddleware`
+        & the `BaseAppTask`. Use `tenant_context(tenant.db_name)` for a scoped switch.
+        """
 
-        # TODO: Optimize this, there is 2 times we are hitting dbrouter tabler.
+        from apps.tenant_service.middlewares import tenant_context
 
         self.db_router.add_db_connection()
-        return set_db_as_env(self.db_name)
+        return tenant_context(self.db_name).activate()
 
     def deactivate_db(self):
         """Used in shell purpose only."""
@@ -10,7 +10,7 @@ from apps.access.models import User
 from apps.access.models.user import UserDetail
 from apps.access.serializers.v1 import TenantAdminUserCreateModelSerializer
 from apps.access_control.config import RoleTypeChoices
-from apps.access_control.models import PolicyCategory, UserRole
+from apps.access_control.models import UserRole
 from apps.common.idp_service import idp_admin_auth_token, idp_get_request, idp_post_request
 from apps.common.models import COMMON_CHAR_FIELD_MAX_LENGTH
 from apps.common.serializers import (
@@ -325,17 +325,15 @@ class TenantCreateModelSerializer(AppCreateModelSerializer):
 
     @staticmethod
     def tenant_and_user_idp_registration(tenant_admin_details, admin_extra_details, tenant, db_name):
-        """Create tenant and user and register on IDP."""
+        """Create tenant and user and register on IDP. Roles & policies are seeded on the database setup."""
 
         set_db_for_router(db_name)
-        UserRole.populate_default_user_roles(db_name)
         admin_role = UserRole.objects.filter(role_type=RoleTypeChoices.admin).first()
         tenant_admin = User.objects.create_superuser(**tenant_admin_details)
         tenant_admin.roles.add(admin_role)
         tenant_admin.password = make_password(settings.APP_SUPER_ADMIN["password"])
         tenant_admin.save()
         UserDetail.objects.create(**admin_extra_details, user=tenant_admin)
-        PolicyCategory.populate_policies(db_name=db_name)
         auth_token = idp_admin_auth_token(raise_drf_error=True, field="name")
         success, data = idp_post_request(
             url_path=IDP_CONFIG["tenant_create_url"],
@@ -42,7 +42,7 @@ class MasterReportTableTask(BaseAppTask):
         from apps.common.helpers import batch
         from apps.my_learning.models import Enrollment
         from apps.tenant.models import TenantMasterReport
-        from apps.tenant_service.middlewares import set_db_for_router
+        from apps.tenant_service.middlewares import set_db_for_router, using_replica
         from apps.tenant_service.models import DatabaseRouter
 
         set_db_for_router()
@@ -60,31 +60,33 @@ class MasterReportTableTask(BaseAppTask):
 
         self.ReportModel = TenantMasterReport
         self.ReportModel.objects.all().hard_delete()  # pre-processing: hard-delete everything
-        for enrollment in batch(
-            Enrollment.objects.filter(
-                user__isnull=False,
-                user_group__isnull=True,
-                is_enrolled=True,
-            )
-        ):
-            self.reset_init_values()
-            self.enrollment = enrollment
-            self.user = enrollment.user
-            self.learning_type = enrollment.learning_type
-            self.populate_enrollment_details()
-        print("** User Enrollments Finished. **\n", flush=True)
-        for enrollment in Enrollment.objects.filter(
-            user_group__isnull=False,
-            user__isnull=True,
-            is_enrolled=True,
-        ):
-            for user in batch(enrollment.user_group.members.all()):
+        # the learner data is read from the replica, the report rows are written to the primary
+        with using_replica():
+            for enrollment in batch(
+                Enrollment.objects.filter(
+                    user__isnull=False,
+                    user_group__isnull=True,
+                    is_enrolled=True,
+                )
+            ):
                 self.reset_init_values()
                 self.enrollment = enrollment
-                self.user = user
+                self.user = enrollment.user
                 self.learning_type = enrollment.learning_type
-                self.is_group = True
                 self.populate_enrollment_details()
+            print("** User Enrollments Finished. **\n", flush=True)
+            for enrollment in Enrollment.objects.filter(
+                user_group__isnull=False,
+                user__isnull=True,
+                is_enrolled=True,
+            ):
+                for user in batch(enrollment.user_group.members.all()):
+                    self.reset_init_values()
+                    self.enrollment = enrollment
+                    self.user = user
+                    self.learning_type = enrollment.learning_type
+                    self.is_group = True
+                    self.populate_enrollment_details()
         print("** User Group Enrollments Finished. **\n", flush=True)
         print("** Finished Populating Master Report Table. **\n", flush=True)
         return True
@@ -34,15 +34,15 @@ class BaseMultiTenantBackend:
 
         raise NotImplementedError
 
-    def create_database(self, db_name: str) -> None:
+    def create_database(self, db_name: str, template: str = None) -> None:
         """
-        Creates the given database. Should be called post `self.is_database_created`.
-        Or else this might throw errors, which should be handled by the caller.
+        Creates the given database, as a copy of the `template` database if given. Should be called post
+        `self.is_database_created`. Or else this might throw errors, which should be handled by the caller.
         """
 
         raise NotImplementedError
 
-    def check_and_create_database(self, db_name: str) -> bool:
+    def check_and_create_database(self, db_name: str, template: str = None) -> bool:
         """
         Checks if the database is created or not, if not created, creates it.
         Returns boolean indicating if the database is newly created.
@@ -52,7 +52,7 @@ class BaseMultiTenantBackend:
         """
 
         if not self.is_database_created(db_name=db_name):
-            self.create_database(db_name=db_name)
+            self.create_database(db_name=db_name, template=template)
             return True
         return False
 
@@ -60,14 +60,20 @@ class BaseMultiTenantBackend:
 class PostgresDatabaseMultiTenantBackend(BaseMultiTenantBackend):
     """The multi-tenant backend to handle postgres based databases."""
 
-    def create_database(self, db_name: str) -> None:
-        """Create database."""
+    def create_database(self, db_name: str, template: str = None) -> None:
+        """
+        Create database. With a `template`, the database is a file level copy of the template, which is a lot
+        faster than migrating an empty database. The copy fails if any other session is connected to the template.
+        """
 
         connection = self.get_database_connection()
         connection.autocommit = True  # needed for write
         cursor = connection.cursor()
 
-        cursor.execute(f"CREATE database {db_name};")
+        if template:
+            cursor.execute(f"CREATE database {db_name} TEMPLATE {template};")
+        else:
+            cursor.execute(f"CREATE database {db_name};")
         connection.close()
 
     def is_database_created(self, db_name: str) -> bool:
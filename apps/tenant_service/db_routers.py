@@ -1,6 +1,53 @@
-from django.db import DEFAULT_DB_ALIAS
+import logging
+import time
 
-from apps.tenant_service.middlewares import get_current_db_name
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apps.tenant_service.middlewares import (
+    REPLICA_DB_SUFFIX,
+    get_current_db_name,
+    get_replica_db_name,
+    is_replica_read,
+    track_write,
+)
+from apps.tenant_service.registry import TENANT_CONNECTIONS
+
+logger = logging.getLogger(__name__)
+
+# lag of the replica in seconds, 0 when the replica has replayed all the received wal.
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+# last lag check of the replicas in the process, `{alias: (checked_at, is_healthy)}`.
+REPLICA_HEALTH = {}
+
+
+def is_replica_healthy(alias):
+    """
+    Returns if the given replica is reachable & its lag is within `REPLICA_CONFIG["max_lag_seconds"]`. The
+    result is cached for `REPLICA_CONFIG["lag_check_interval"]` seconds per process.
+    """
+
+    checked_at, is_healthy = REPLICA_HEALTH.get(alias, (None, False))
+    if checked_at is not None and time.monotonic() - checked_at < settings.REPLICA_CONFIG["lag_check_interval"]:
+        return is_healthy
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            lag = cursor.fetchone()[0] or 0
+        is_healthy = lag <= settings.REPLICA_CONFIG["max_lag_seconds"]
+        if not is_healthy:
+            logger.warning(f"Replica {alias} is lagging by {lag}s, reads fall back to the primary.")
+    except Exception as error:
+        logger.warning(f"Replica {alias} is not reachable, reads fall back to the primary: {error}")
+        connections[alias].close()
+        is_healthy = False
+    REPLICA_HEALTH[alias] = (time.monotonic(), is_healthy)
+    return is_healthy
 
 
 class AppDBRouter:
@@ -9,17 +56,27 @@ class AppDBRouter:
 
     Works based on two ways:
         1. The `use_db` value set on the local thread while login and request.
+        2. Within `using_replica()`, the reads go to the `<db>_replica` connection of the tenant when registered
+           & healthy, until the first write of the request or to the model in a task.
+
+    The tenant connections are registered on their first use & capped per thread by the `TENANT_CONNECTIONS`.
     """
 
     def db_for_read(self, model, **hints):
         """For read actions."""
 
-        return get_current_db_name() or DEFAULT_DB_ALIAS
+        db_name = TENANT_CONNECTIONS.use(get_current_db_name() or DEFAULT_DB_ALIAS)
+        if is_replica_read(model):
+            replica_db_name = get_replica_db_name(db_name)
+            if replica_db_name in settings.DATABASES and is_replica_healthy(replica_db_name):
+                return TENANT_CONNECTIONS.use(replica_db_name)
+        return db_name
 
     def db_for_write(self, model, **hints):
         """For write actions."""
 
-        return get_current_db_name() or DEFAULT_DB_ALIAS
+        track_write(model)
+        return TENANT_CONNECTIONS.use(get_current_db_name() or DEFAULT_DB_ALIAS)
 
     def allow_relation(self, *args, **kwargs):
         """Prevent unnecessary breakages."""
@@ -30,3 +87,8 @@ class AppDBRouter:
         """Prevent unnecessary breakages."""
 
         return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        """The replicas are migrated through their primary."""
+
+        return False if db.endswith(REPLICA_DB_SUFFIX) else None
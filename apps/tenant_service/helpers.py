@@ -1,4 +1,7 @@
-from django.conf import settings
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
 from django.db import DEFAULT_DB_ALIAS, connections
 from django.db.migrations.executor import MigrationExecutor
 
@@ -19,14 +22,73 @@ def is_default_database_synchronized():
         return False
 
 
-def add_all_db_connections_to_settings():
+def with_tenant_context(function):
     """
-    Called on the `config.urls`. When the app is started is called ONCE
-    to add all the database connections to the settings.DATABASES.
+    Returns the function bound to the caller's context, the tenant database & the replica routing of the
+    caller are active while the function runs in another thread. Every call runs in its own copy of it.
     """
 
-    if settings.MULTI_TENANT["APP_LOAD_ALL_DB_CONNECTION"]:
-        from apps.tenant_service.models import DatabaseRouter
+    context = copy_context()
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        """Runs the function in a copy of the caller's context."""
+
+        return context.copy().run(function, *args, **kwargs)
+
+    return wrapper
+
+
+def close_connections_after(function):
+    """Closes the calling thread's database connections after the function, used in the worker threads."""
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        """Runs the function & closes the connections."""
+
+        try:
+            return function(*args, **kwargs)
+        finally:
+            connections.close_all()
+
+    return wrapper
+
+
+class TenantThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    `ThreadPoolExecutor` propagating the submitter's context(tenant database) to the workers, the
+    context variables are otherwise empty in the worker threads. The database connections of the worker
+    threads are closed after every call.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        """Overridden to run the function in the submitter's context, `map` is run through it as well."""
+
+        return super().submit(with_tenant_context(close_connections_after(fn)), *args, **kwargs)
+
+
+def run_for_tenants(routers, function, concurrency=4):
+    """
+    Runs `function(router)` for every given `DatabaseRouter` in parallel, `concurrency` tenants at a time.
+    Every call runs in a worker thread with the tenant's database activated, the thread's connections are
+    closed afterwards. Returns `(router, result, error)` for every router, in the given order.
+    """
+
+    from apps.tenant_service.middlewares import tenant_context
+
+    routers = list(routers)
+    # `settings.DATABASES` is shared by the threads, so the connections are added upfront
+    for router in routers:
+        router.add_db_connection()
+
+    def run(router):
+        """Runs the function for a single tenant, in a worker thread."""
+
+        try:
+            with tenant_context(router.database_name):
+                return router, function(router), None
+        except Exception as error:
+            return router, None, error
 
-        for tracker in DatabaseRouter.objects.all():
-            tracker.add_db_connection()
+    with TenantThreadPoolExecutor(max_workers=max(concurrency, 1)) as executor:
+        return list(executor.map(run, routers))
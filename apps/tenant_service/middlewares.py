@@ -1,10 +1,20 @@
-import threading
+from contextlib import ContextDecorator, contextmanager
+from contextvars import ContextVar
 from copy import copy
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
 from django.db import DEFAULT_DB_ALIAS
 
-THREAD_LOCAL = threading.local()
+# database of the current tenant, `""` for the default database. A context variable, so that it is isolated per
+# asyncio task & is handed over to the thread pool workers by `TenantThreadPoolExecutor`.
+TENANT_DB = ContextVar("tenant_db", default="")
+# replica routing state | `using_replica()` block, tables written in the block & the writes of the request
+USE_REPLICA = ContextVar("use_replica", default=False)
+WRITTEN_TABLES = ContextVar("written_tables", default=frozenset())
+REQUEST_WRITES = ContextVar("request_writes", default=None)
+# suffix of the connection alias of a tenant database's read replica
+REPLICA_DB_SUFFIX = "_replica"
 
 
 def get_current_tenant_idp_id():
@@ -82,13 +92,10 @@ def get_current_tenant_details():
 
     db = get_current_db_name()
     if not db or db == settings.DATABASES[DEFAULT_DB_ALIAS]["NAME"]:
-        tenant = Tenant.objects.get(idp_id=settings.IDP_B2B_TENANT_ID)
-    else:
-        set_db_for_router()
+        return copy(Tenant.objects.get(idp_id=settings.IDP_B2B_TENANT_ID).tenant_details)
+    with tenant_context():
         tenant = DatabaseRouter.objects.using(DEFAULT_DB_ALIAS).filter(database_name=db).first().tenant
-    tenant_details = copy(tenant.tenant_details)
-    set_db_for_router(db)
-    return tenant_details
+        return copy(tenant.tenant_details)
 
 
 def get_current_sender_email():
@@ -104,16 +111,168 @@ def get_current_sender_email():
 
 
 def get_current_db_name():
-    """Gets which db for the user, from the thread."""
+    """Gets which db for the user, from the current context."""
 
-    return getattr(THREAD_LOCAL, "use_db", None)
+    return TENANT_DB.get()
 
 
 def set_db_for_router(db=None):
-    """Sets which db for user, to the thread."""
+    """
+    Sets which db for user, to the current context. Stays until changed, reset by the `TenantContextMiddleware`
+    & the `BaseAppTask` at the end of the request & task. Prefer the scoped `tenant_context`.
+    """
 
     # pre-processing | cookie convention
     if not db:
         db = ""
 
-    setattr(THREAD_LOCAL, "use_db", db)  # noqa
+    TENANT_DB.set(db)
+
+
+class tenant_context(ContextDecorator):  # noqa
+    """
+    Activates the given tenant database for the block & restores the previous one on exit, even on errors.
+    The database is registered on the `TENANT_CONNECTIONS` when needed. `None` activates the default database.
+
+    Usage -
+        with tenant_context(db_name):
+            ...
+
+        @tenant_context(db_name)
+        def function():
+            ...
+    """
+
+    def __init__(self, db_name=None):
+        self.db_name = db_name or ""
+        self.tokens = []
+
+    def _recreate_cm(self):
+        """A new instance per decorated call, the decorated function can be called concurrently."""
+
+        return type(self)(self.db_name)
+
+    def activate(self):
+        """Activates the database without a scope, for the shell & the callers reset by the middleware."""
+
+        from apps.tenant_service.registry import TENANT_CONNECTIONS
+
+        if self.db_name:
+            TENANT_CONNECTIONS.ensure(self.db_name)
+        return TENANT_DB.set(self.db_name)
+
+    def __enter__(self):
+        self.tokens.append(self.activate())
+        return self.db_name
+
+    def __exit__(self, *args):
+        TENANT_DB.reset(self.tokens.pop())
+        return False
+
+
+def get_replica_db_name(db_name):
+    """Returns the connection alias of the read replica of the given database."""
+
+    return f"{db_name}{REPLICA_DB_SUFFIX}"
+
+
+def is_replica_read(model):
+    """
+    Returns if the reads of the given model are routed to the replica. Not after a write in the current request
+    or a write to the model in the current `using_replica()` block.
+    """
+
+    request_writes = REQUEST_WRITES.get()
+    return (
+        USE_REPLICA.get()
+        and not (request_writes and request_writes["has_written"])
+        and model._meta.db_table not in WRITTEN_TABLES.get()
+    )
+
+
+def track_write(model):
+    """Tracks a write to the given model, the reads written after stick to the primary(read-your-writes)."""
+
+    # mutated in place, the writes of the worker threads & `sync_to_async` calls are seen by the request
+    if (request_writes := REQUEST_WRITES.get()) is not None:
+        request_writes["has_written"] = True
+    if USE_REPLICA.get():
+        WRITTEN_TABLES.get().add(model._meta.db_table)
+
+
+@contextmanager
+def using_replica():
+    """
+    Routes the reads of the block to the read replica of the current tenant database, when the tenant has one
+    & it is not lagging. The writes of the block always go to the primary & the reads stick to the primary
+    after any write in a request, or after a write to the same model outside a request(tasks).
+    """
+
+    use_replica_token = USE_REPLICA.set(True)
+    written_tables_token = WRITTEN_TABLES.set(set(WRITTEN_TABLES.get()))
+    try:
+        yield
+    finally:
+        WRITTEN_TABLES.reset(written_tables_token)
+        USE_REPLICA.reset(use_replica_token)
+
+
+class TenantContextMiddleware:
+    """
+    Runs every request in the default database's `tenant_context`, the database activated while handling the
+    request does not leak to the next request of the worker. Used in the MIDDLEWARES in the settings.py.
+    Sync & async capable, the async views are served without a thread switch.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with tenant_context():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        """Async variant of the `__call__`."""
+
+        with tenant_context():
+            return await self.get_response(request)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Scopes the read-your-writes stickiness of the replica reads to a request, after any write the remaining
+    reads of the request go to the primary. Used in the MIDDLEWARES in the settings.py. Sync & async capable.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = REQUEST_WRITES.set({"has_written": False})
+        try:
+            return self.get_response(request)
+        finally:
+            REQUEST_WRITES.reset(token)
+
+    async def __acall__(self, request):
+        """Async variant of the `__call__`."""
+
+        token = REQUEST_WRITES.set({"has_written": False})
+        try:
+            return await self.get_response(request)
+        finally:
+            REQUEST_WRITES.reset(token)
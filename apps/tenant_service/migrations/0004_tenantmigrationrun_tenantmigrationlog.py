@@ -0,0 +1,79 @@
+# Generated by Django 4.2.3 on 2024-07-22 10:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+STATUS_CHOICES = [
+    ("initiated", "Initiated"),
+    ("in_progress", "In Progress"),
+    ("completed", "Completed"),
+    ("failed", "Failed"),
+]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenant_service", "0003_alter_databaserouter_uuid"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TenantMigrationRun",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("uuid", models.UUIDField(blank=True, default=uuid.uuid4, null=True, unique=True)),
+                ("ss_id", models.IntegerField(blank=True, default=None, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("modified_at", models.DateTimeField(auto_now=True)),
+                ("app_label", models.CharField(blank=True, default=None, max_length=512, null=True)),
+                ("migration_name", models.CharField(blank=True, default=None, max_length=512, null=True)),
+                ("concurrency", models.PositiveIntegerField(default=1)),
+                ("canary_count", models.PositiveIntegerField(default=0)),
+                ("status", models.CharField(choices=STATUS_CHOICES, default="initiated", max_length=512)),
+                ("started_at", models.DateTimeField(blank=True, default=None, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, default=None, null=True)),
+                ("duration", models.FloatField(default=0)),
+                ("sequential_duration", models.FloatField(default=0)),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "abstract": False,
+                "default_related_name": "related_tenant_migration_runs",
+            },
+        ),
+        migrations.CreateModel(
+            name="TenantMigrationLog",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("uuid", models.UUIDField(blank=True, default=uuid.uuid4, null=True, unique=True)),
+                ("ss_id", models.IntegerField(blank=True, default=None, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("modified_at", models.DateTimeField(auto_now=True)),
+                ("database_name", models.CharField(max_length=512)),
+                ("status", models.CharField(choices=STATUS_CHOICES, default="initiated", max_length=512)),
+                ("started_at", models.DateTimeField(blank=True, default=None, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, default=None, null=True)),
+                ("duration", models.FloatField(default=0)),
+                ("error", models.TextField(blank=True, default=None, null=True)),
+                (
+                    "router",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="tenant_service.databaserouter"
+                    ),
+                ),
+                (
+                    "run",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="tenant_service.tenantmigrationrun"
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["id"],
+                "abstract": False,
+                "default_related_name": "related_tenant_migration_logs",
+            },
+        ),
+    ]
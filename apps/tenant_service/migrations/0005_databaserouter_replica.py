@@ -0,0 +1,22 @@
+# Generated by Django 4.2.3 on 2026-10-19 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenant_service", "0004_tenantmigrationrun_tenantmigrationlog"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="databaserouter",
+            name="replica_host",
+            field=models.CharField(blank=True, default=None, max_length=512, null=True),
+        ),
+        migrations.AddField(
+            model_name="databaserouter",
+            name="replica_port",
+            field=models.CharField(blank=True, default=None, max_length=512, null=True),
+        ),
+    ]
@@ -1,22 +1,25 @@
-import copy
+import logging
 
+import psycopg2
 from django.conf import settings
 from django.core.management import call_command
-from django.db import DEFAULT_DB_ALIAS, models
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, models
 
-from apps.common.models import COMMON_CHAR_FIELD_MAX_LENGTH, BaseModel
+from apps.common.models import COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG, COMMON_CHAR_FIELD_MAX_LENGTH, BaseModel
 from apps.learning.config import BaseUploadStatusChoices
 from apps.tenant_service.backends import PostgresDatabaseMultiTenantBackend
 
+logger = logging.getLogger(__name__)
+
 
 def set_db_as_env(use_db):
     """Sets the given db as env, used in shell."""
 
-    from apps.tenant_service.middlewares import set_db_for_router
+    from apps.tenant_service.middlewares import tenant_context
 
     router = DatabaseRouter.objects.get(database_name=use_db)
     router.add_db_connection()
-    set_db_for_router(use_db)
+    tenant_context(use_db).activate()
 
 
 class DatabaseRouter(BaseModel):
@@ -32,6 +35,9 @@ class DatabaseRouter(BaseModel):
 
     BACKEND = PostgresDatabaseMultiTenantBackend
 
+    # set on `setup_database`, the roles & policies are seeded on setup only when not copied from the template
+    is_from_template = False
+
     # to which tenant
     tenant = models.OneToOneField(to="tenant.Tenant", on_delete=models.CASCADE)
 
@@ -41,6 +47,9 @@ class DatabaseRouter(BaseModel):
     database_password = models.CharField(max_length=COMMON_CHAR_FIELD_MAX_LENGTH)
     database_host = models.CharField(max_length=COMMON_CHAR_FIELD_MAX_LENGTH)
     database_port = models.CharField(max_length=COMMON_CHAR_FIELD_MAX_LENGTH)
+    # optional read replica of the database, same name & credentials | registered as `<database_name>_replica`
+    replica_host = models.CharField(max_length=COMMON_CHAR_FIELD_MAX_LENGTH, **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+    replica_port = models.CharField(max_length=COMMON_CHAR_FIELD_MAX_LENGTH, **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
     setup_status = models.CharField(
         max_length=COMMON_CHAR_FIELD_MAX_LENGTH,
         choices=BaseUploadStatusChoices.choices,
@@ -54,20 +63,14 @@ class DatabaseRouter(BaseModel):
         return self.database_name
 
     def add_db_connection(self):
-        """Adds the current instance's database connection to the app's settings."""
-
-        db_settings_template = copy.deepcopy(settings.DATABASES[DEFAULT_DB_ALIAS])
-        db_settings_template.update(
-            {
-                "ENGINE": "django.db.backends.postgresql_psycopg2",
-                "NAME": self.database_name,
-                "USER": self.database_user,
-                "PASSWORD": self.database_password,
-                "HOST": self.database_host,
-                "PORT": self.database_port,
-            }
-        )
-        settings.DATABASES[f"{self.database_name}"] = db_settings_template
+        """
+        Adds the current instance's database connection to the app's settings, along with the connection of
+        its read replica when configured. Done once per process, through the `TENANT_CONNECTIONS` registry.
+        """
+
+        from apps.tenant_service.registry import TENANT_CONNECTIONS
+
+        return TENANT_CONNECTIONS.register(self)
 
     def setup_database(self):
         """
@@ -84,16 +87,17 @@ class DatabaseRouter(BaseModel):
         self.setup_status = BaseUploadStatusChoices.in_progress
         self.save()
 
-        # create the database
-        backend = self.BACKEND()
-        backend.check_and_create_database(db_name=db_name)
+        # create the database, copied from the template when available
+        self.is_from_template = self.create_database()
 
         # add the necessary connections
         self.add_db_connection()
 
-        # migrate the necessary tables
+        # migrate the necessary tables, only the delta after the template refresh when copied
         try:
             call_command("migrate", database=db_name)
+            if not self.is_from_template:
+                self.seed_database(db_name)
             self.setup_status = BaseUploadStatusChoices.completed
             self.save()
         except Exception:
@@ -129,8 +133,140 @@ class DatabaseRouter(BaseModel):
         self.setup_status = BaseUploadStatusChoices.completed
         self.save()
 
+    def create_database(self):
+        """
+        Creates the database as a copy of the pre-migrated & seeded tenant template. Falls back to an empty
+        database when the template is not available or is busy(being refreshed), seeded by `setup_database`
+        after the migrations. Returns if copied from template.
+        """
+
+        backend = self.BACKEND()
+        template_name = settings.MULTI_TENANT["APP_TENANT_TEMPLATE_DB_NAME"]
+        if backend.is_database_created(db_name=self.database_name):
+            return False
+        if template_name and backend.is_database_created(db_name=template_name):
+            try:
+                backend.create_database(db_name=self.database_name, template=template_name)
+                return True
+            except (psycopg2.Error, DatabaseError):
+                logger.exception(f"Copying {template_name} failed, creating an empty {self.database_name}.")
+        backend.create_database(db_name=self.database_name)
+        return False
+
+    @staticmethod
+    def seed_database(db_name):
+        """Seeds the migrated database with the default roles & policies, the rows already present are kept."""
+
+        from apps.access_control.models import PolicyCategory, UserRole
+        from apps.tenant_service.middlewares import tenant_context
+
+        with tenant_context(db_name):
+            UserRole.populate_default_user_roles(db_name=db_name)
+            PolicyCategory.populate_policies(db_name=db_name)
+
+    @classmethod
+    def get_template_router(cls):
+        """Returns an unsaved router of the tenant template database, present in the `default` db server."""
+
+        db_credentials = settings.DATABASES[DEFAULT_DB_ALIAS]
+        return cls(
+            database_name=settings.MULTI_TENANT["APP_TENANT_TEMPLATE_DB_NAME"],
+            database_user=db_credentials["USER"],
+            database_password=db_credentials["PASSWORD"],
+            database_host=db_credentials["HOST"],
+            database_port=db_credentials["PORT"],
+        )
+
+    @classmethod
+    def refresh_template_database(cls):
+        """
+        Creates or migrates the tenant template database & seeds it with the default roles & policies.
+        Called after the release migrations, so that the new tenants are copied from an up to date template.
+        """
+
+        template = cls.get_template_router()
+        if not template.database_name:
+            return None
+
+        cls.BACKEND().check_and_create_database(db_name=template.database_name)
+        template.add_db_connection()
+        call_command("migrate", database=template.database_name)
+        cls.seed_database(template.database_name)
+
+        # postgres does not copy a template while any session is connected to it
+        connections[template.database_name].close()
+        return template
+
     def is_database_valid(self):
         """Returns if the database is present or not. Just an adaptor."""
 
         backend = self.BACKEND()
         return backend.is_database_created(db_name=f"{self.database_name}")
+
+
+class TenantMigrationRun(BaseModel):
+    """
+    One execution of the `migrate_tenants` runner, present in the `default` database. Holds the wall time of
+    the run & the sum of the per tenant durations, which is the time the sequential loop would have taken.
+
+    Model Fields -
+        PK          - id,
+        Fields      - uuid, ss_id, app_label, migration_name, concurrency, canary_count, duration,
+                      sequential_duration
+        Choices     - status
+        Datetime    - created_at, modified_at, started_at, finished_at
+    """
+
+    class Meta(BaseModel.Meta):
+        default_related_name = "related_tenant_migration_runs"
+
+    # target migration, all the apps are migrated to the latest when not given
+    app_label = models.CharField(max_length=COMMON_CHAR_FIELD_MAX_LENGTH, **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+    migration_name = models.CharField(
+        max_length=COMMON_CHAR_FIELD_MAX_LENGTH,
+        **COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG,
+    )
+
+    concurrency = models.PositiveIntegerField(default=1)
+    canary_count = models.PositiveIntegerField(default=0)
+    status = models.CharField(
+        max_length=COMMON_CHAR_FIELD_MAX_LENGTH,
+        choices=BaseUploadStatusChoices.choices,
+        default=BaseUploadStatusChoices.initiated,
+    )
+    started_at = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+    finished_at = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+    duration = models.FloatField(default=0)
+    sequential_duration = models.FloatField(default=0)
+
+
+class TenantMigrationLog(BaseModel):
+    """
+    Migration state of a tenant database in a `TenantMigrationRun`. Used to resume the run from the failed
+    & pending tenants.
+
+    Model Fields -
+        PK          - id,
+        FK          - run, router
+        Fields      - uuid, ss_id, database_name, duration, error
+        Choices     - status
+        Datetime    - created_at, modified_at, started_at, finished_at
+    """
+
+    class Meta(BaseModel.Meta):
+        default_related_name = "related_tenant_migration_logs"
+        ordering = ["id"]
+
+    run = models.ForeignKey(TenantMigrationRun, on_delete=models.CASCADE)
+    router = models.ForeignKey(DatabaseRouter, on_delete=models.CASCADE)
+
+    database_name = models.CharField(max_length=COMMON_CHAR_FIELD_MAX_LENGTH)
+    status = models.CharField(
+        max_length=COMMON_CHAR_FIELD_MAX_LENGTH,
+        choices=BaseUploadStatusChoices.choices,
+        default=BaseUploadStatusChoices.initiated,
+    )
+    started_at = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+    finished_at = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+    duration = models.FloatField(default=0)
+    error = models.TextField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
@@ -0,0 +1,164 @@
+import copy
+import logging
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+
+class TenantConnectionRegistry:
+    """
+    Per process registry of the tenant database connections.
+
+    The tenant aliases are added to `settings.DATABASES` lazily, on the first use of the database by the router,
+    instead of for every tenant on startup. An alias is built once per credentials, the repeated registrations on
+    every request & task are no-ops.
+
+    The open tenant connections of a worker thread are capped to `MULTI_TENANT["APP_MAX_TENANT_CONNECTIONS"]`,
+    beyond it the least recently used idle ones are closed. Django re-opens them on their next use. The
+    connections in a transaction are never closed.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # the open aliases of the worker thread in the order of use, django's connections are per thread
+        self.local = threading.local()
+        # credentials the aliases are registered with, `{database_name: credentials}`
+        self.credentials = {}
+        self.lazy_registrations = 0
+        self.evictions = 0
+
+    @staticmethod
+    def get_credentials(router):
+        """Returns the connection credentials of the router, the alias is rebuilt when they change."""
+
+        return (
+            router.database_user,
+            router.database_password,
+            router.database_host,
+            router.database_port,
+            router.replica_host,
+            router.replica_port,
+        )
+
+    @staticmethod
+    def get_db_settings(router):
+        """
+        Returns the `settings.DATABASES` entries of the router's database, along with the entry of its read
+        replica when configured. Copied from the default database, the pooling settings are inherited.
+
+        Not in the `ATOMIC_REQUESTS`, django would open a transaction on every registered alias per request.
+        The views open the transaction of the request's tenant only(`AppViewMixin`).
+        """
+
+        from apps.tenant_service.middlewares import get_replica_db_name
+
+        db_settings = copy.deepcopy(settings.DATABASES[DEFAULT_DB_ALIAS])
+        db_settings.update(
+            {
+                "ENGINE": "django.db.backends.postgresql_psycopg2",
+                "NAME": router.database_name,
+                "USER": router.database_user,
+                "PASSWORD": router.database_password,
+                "HOST": router.database_host,
+                "PORT": router.database_port,
+                "ATOMIC_REQUESTS": False,
+            }
+        )
+        entries = {router.database_name: db_settings}
+        if router.replica_host:
+            replica_settings = copy.deepcopy(db_settings)
+            replica_settings.update(
+                {
+                    "HOST": router.replica_host,
+                    "PORT": router.replica_port or router.database_port,
+                    "TEST": {"MIRROR": router.database_name},
+                }
+            )
+            entries[get_replica_db_name(router.database_name)] = replica_settings
+        return entries
+
+    def register(self, router):
+        """Adds the router's database connection to the app's settings, when not already added."""
+
+        credentials = self.get_credentials(router)
+        if self.credentials.get(router.database_name) == credentials:
+            return False
+        with self.lock:
+            for alias, db_settings in self.get_db_settings(router).items():
+                settings.DATABASES[alias] = db_settings
+            self.credentials[router.database_name] = credentials
+        return True
+
+    def ensure(self, db_name):
+        """
+        Registers the given database on its first use, the `DatabaseRouter` is looked up from the default
+        database. Returns the database name.
+        """
+
+        from apps.tenant_service.models import DatabaseRouter
+
+        if db_name == DEFAULT_DB_ALIAS or db_name in settings.DATABASES:
+            return db_name
+        if router := DatabaseRouter.objects.using(DEFAULT_DB_ALIAS).filter(database_name=db_name).first():
+            self.register(router)
+            self.lazy_registrations += 1
+        return db_name
+
+    def get_open_aliases(self):
+        """Returns the tenant aliases used by the current thread, least recently used first."""
+
+        if not hasattr(self.local, "aliases"):
+            self.local.aliases = OrderedDict()
+        return self.local.aliases
+
+    def use(self, alias):
+        """
+        Marks the alias as used by the current thread, registering it on its first use. Closes the least recently
+        used idle connections beyond `MULTI_TENANT["APP_MAX_TENANT_CONNECTIONS"]`. Returns the alias.
+        """
+
+        if alias == DEFAULT_DB_ALIAS:
+            return alias
+        self.ensure(alias)
+        aliases = self.get_open_aliases()
+        aliases[alias] = True
+        aliases.move_to_end(alias)
+        if len(aliases) > settings.MULTI_TENANT["APP_MAX_TENANT_CONNECTIONS"]:
+            self.evict(aliases)
+        return alias
+
+    def evict(self, aliases):
+        """Closes the least recently used idle connections of the thread until within the limit."""
+
+        excess = len(aliases) - settings.MULTI_TENANT["APP_MAX_TENANT_CONNECTIONS"]
+        for alias in list(aliases)[:-1]:
+            if excess <= 0:
+                break
+            connection = connections[alias]
+            if connection.in_atomic_block:
+                continue
+            if connection.connection is not None:
+                connection.close()
+                self.evictions += 1
+                logger.debug(f"Closed the idle connection of {alias}.")
+            del aliases[alias]
+            excess -= 1
+
+    def get_stats(self):
+        """Returns the registered aliases & the open connections of the current thread, used for reporting."""
+
+        return {
+            "registered": len(settings.DATABASES) - 1,
+            "tenants": len(self.credentials),
+            "lazy_registrations": self.lazy_registrations,
+            "open": sum(connections[alias].connection is not None for alias in self.get_open_aliases()),
+            "evictions": self.evictions,
+            "max_open": settings.MULTI_TENANT["APP_MAX_TENANT_CONNECTIONS"],
+        }
+
+
+TENANT_CONNECTIONS = TenantConnectionRegistry()
@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 
 from django.conf import settings
 
+from apps.common.async_communicator import async_get_request
 from apps.common.communicator import get_request
 from apps.tenant_service.middlewares import get_current_tenant_idp_id
 
@@ -65,6 +66,20 @@ def get_virtutor_session_participant_list(auth_token, scheduled_id, session_code
     return success, data
 
 
+async def async_get_virtutor_session_participant_list(auth_token, scheduled_id, session_code):
+    """Async variant of `get_virtutor_session_participant_list`, used by the async gateway views."""
+
+    success, data = await async_get_request(
+        service="VIRTUTOR",
+        url_path=settings.VIRTUTOR_CONFIG["get_all_session_participants_url"],
+        params={"sessionScheduleId": scheduled_id, "sessionCode": session_code},
+        auth_token=auth_token,
+    )
+    if success and not data.get("result"):
+        return False, {"error": "Failed to fetch session participants list."}
+    return success, data
+
+
 def get_session_recordings_url(auth_token, scheduled_id, session_code):
     """Returns the recorded session urls."""
 
@@ -79,6 +94,20 @@ def get_session_recordings_url(auth_token, scheduled_id, session_code):
     return success, data
 
 
+async def async_get_session_recordings_url(auth_token, scheduled_id, session_code):
+    """Async variant of `get_session_recordings_url`, used by the async gateway views."""
+
+    success, data = await async_get_request(
+        service="VIRTUTOR",
+        url_path=settings.VIRTUTOR_CONFIG["get_session_recordings_url"],
+        params={"sessionScheduleId": scheduled_id, "sessionCode": session_code},
+        auth_token=auth_token,
+    )
+    if success and not data:
+        return False, {"error": "Failed to fetch recordings."}
+    return success, data
+
+
 def format_datetime(datetime):
     """Function to format the date and time."""
 
@@ -2,6 +2,7 @@ from datetime import datetime
 
 from django.conf import settings
 
+from apps.common.fan_out import fan_out
 from apps.common.tasks import BaseAppTask
 
 LEARNING_FILTER_PARAMS = {
@@ -56,12 +57,19 @@ class SessionParticipantUpdateTask(BaseAppTask):
                     "participantUserId": user.idp_id,
                 }
             )
-        for scheduled_id in scheduled_ids:
-            post_request(
+        results = fan_out(
+            lambda scheduled_id: post_request(
                 service="VIRTUTOR",
                 url_path=settings.VIRTUTOR_CONFIG["update_session_participant_url"],
                 params={"tenantId": tenant_id, "sessionId": scheduled_id},
                 data=payload,
                 auth_token=idp_token,
-            )
+            ),
+            scheduled_ids,
+        )
+        for scheduled_id, response, error in results:
+            if error or not response[0]:
+                self.logger.error(
+                    f"Error while updating the participants of session {scheduled_id}: {error or response[1]}"
+                )
         return True
@@ -12,19 +12,19 @@ from apps.access_control.config import RoleTypeChoices
 from apps.access_control.models import UserGroup
 from apps.common.communicator import post_request
 from apps.common.serializers import AppSerializer
-from apps.common.views.api import AppAPIView
+from apps.common.views.api import AppAPIView, AsyncAppAPIView
 from apps.event.config import CalendarEventTypeChoices
 from apps.my_learning.models import Enrollment
 from apps.my_learning.tasks import CalendarActivityCreationTask
 from apps.tenant_service.middlewares import get_current_db_name, get_current_tenant_idp_id
 from apps.virtutor.config import SessionJoinMechanismChoices
 from apps.virtutor.helpers import (
+    async_get_session_recordings_url,
+    async_get_virtutor_session_participant_list,
     convert_utc_to_ist,
     format_datetime,
-    get_session_recordings_url,
     get_virtutor_roles_by_tenant,
     get_virtutor_session_details,
-    get_virtutor_session_participant_list,
     get_virtutor_trainer_details,
 )
 from apps.virtutor.models import ScheduledSession, Trainer
@@ -310,17 +310,22 @@ class ScheduledSessionManagementApiView(AppAPIView):
         }
 
 
-class SessionPaticipantListApiView(AppAPIView):
-    """Api view to get list of scheduled session participants."""
+class SessionPaticipantListApiView(AsyncAppAPIView):
+    """Api view to get list of scheduled session participants. Async, waits on the virtutor."""
 
     serializer_class = SimpleUserReadOnlyModelSerializer
 
-    def get(self, request, *args, **kwargs):
+    def get_participants(self, user_idp_ids):
+        """Returns the serialized participants."""
+
+        return self.serializer_class(User.objects.filter(idp_id__in=user_idp_ids), many=True).data
+
+    async def get(self, request, *args, **kwargs):
         """Returns the list of scheduled session participants."""
 
-        session_instance = get_object_or_404(ScheduledSession, id=kwargs.get("session_id", None))
+        session_instance = await self.run_sync(get_object_or_404, ScheduledSession, id=kwargs.get("session_id", None))
         idp_token = request.headers.get("idp-token", None) or request.headers.get("sso-token")
-        success, data = get_virtutor_session_participant_list(
+        success, data = await async_get_virtutor_session_participant_list(
             scheduled_id=session_instance.scheduled_id,
             session_code=session_instance.session_code,
             auth_token=idp_token,
@@ -328,8 +333,7 @@ class SessionPaticipantListApiView(AppAPIView):
         if not success:
             return self.send_error_response(data)
         user_idp_ids = [result["platformUserId"] for result in data["result"] if result.get("platformUserId")]
-        response_data = self.serializer_class(User.objects.filter(idp_id__in=user_idp_ids), many=True).data
-        return self.send_response(response_data)
+        return self.send_response(await self.run_sync(self.get_participants, user_idp_ids))
 
 
 class SessionPaticipantUpdateApiView(AppAPIView):
@@ -377,18 +381,18 @@ class SessionPaticipantUpdateApiView(AppAPIView):
         return self.send_response(data) if success else self.send_error_response(data)
 
 
-class SessionRecordingsURLApiView(AppAPIView):
-    """Api view to provide ended session recordings urls."""
+class SessionRecordingsURLApiView(AsyncAppAPIView):
+    """Api view to provide ended session recordings urls. Async, waits on the virtutor."""
 
-    def get(self, request, *args, **kwargs):
+    async def get(self, request, *args, **kwargs):
         """Returns the virtutor session recordings urls."""
 
-        session = get_object_or_404(ScheduledSession, id=kwargs.get("pk"))
+        session = await self.run_sync(get_object_or_404, ScheduledSession, id=kwargs.get("pk"))
         current_date = timezone.now()
         if current_date < session.end_date:
             return self.send_error_response("Session is not expired")
         idp_token = request.headers.get("idp-token", None) or request.headers.get("sso-token")
-        success, recordings_data = get_session_recordings_url(
+        success, recordings_data = await async_get_session_recordings_url(
             auth_token=idp_token, scheduled_id=session.scheduled_id, session_code=session.session_code
         )
         if not success:
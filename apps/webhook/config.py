@@ -0,0 +1,22 @@
+from djchoices import ChoiceItem, DjangoChoices
+
+
+class WebhookSourceChoices(DjangoChoices):
+    """Holds the choices of the webhook sources."""
+
+    yaksha = ChoiceItem("yaksha", "Yaksha")
+    wecp = ChoiceItem("wecp", "Wecp")
+
+
+class WebhookInboxStatusChoices(DjangoChoices):
+    """Holds the choices of the webhook inbox processing status."""
+
+    pending = ChoiceItem("pending", "Pending")
+    processing = ChoiceItem("processing", "Processing")
+    processed = ChoiceItem("processed", "Processed")
+    failed = ChoiceItem("failed", "Failed")
+
+
+# Inbox entries claimed by a worker at once & the retries before the entry is left as failed.
+WEBHOOK_INBOX_BATCH_SIZE = 500
+WEBHOOK_INBOX_MAX_ATTEMPTS = 5
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.3 on 2026-10-19 11:48
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="WebhookInbox",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("uuid", models.UUIDField(blank=True, default=uuid.uuid4, null=True, unique=True)),
+                ("ss_id", models.IntegerField(blank=True, default=None, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("modified_at", models.DateTimeField(auto_now=True)),
+                ("source", models.CharField(choices=[("yaksha", "Yaksha"), ("wecp", "Wecp")], max_length=512)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("processed", "Processed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=512,
+                    ),
+                ),
+                ("dedup_key", models.CharField(max_length=512, unique=True)),
+                ("payload", models.JSONField(default=dict)),
+                ("error", models.TextField(blank=True, default=None, null=True)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("processed_at", models.DateTimeField(blank=True, default=None, null=True)),
+            ],
+            options={
+                "ordering": ["created_at"],
+                "abstract": False,
+                "default_related_name": "related_webhook_inboxes",
+                "indexes": [models.Index(fields=["status", "created_at"], name="webhook_inbox_status_idx")],
+            },
+        ),
+    ]
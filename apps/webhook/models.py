@@ -0,0 +1,82 @@
+from django.db import DEFAULT_DB_ALIAS, models, transaction
+from django.utils import timezone
+
+from apps.common.models import COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG, COMMON_CHAR_FIELD_MAX_LENGTH, BaseModel
+from apps.webhook.config import WebhookInboxStatusChoices, WebhookSourceChoices
+
+
+class WebhookInbox(BaseModel):
+    """
+    Durable inbox of the assessment webhooks. The raw payloads are stored by the webhook views & processed
+    asynchronously by `WebhookInboxProcessTask`. The entries are always stored in the `default` database.
+
+    Model Fields -
+        PK          - id,
+        Fields      - uuid, ss_id, payload, error, attempts
+        Unique      - dedup_key
+        Choices     - source, status
+        Datetime    - created_at, modified_at, processed_at
+
+    App QuerySet Manager Methods -
+        get_or_none
+    """
+
+    class Meta(BaseModel.Meta):
+        default_related_name = "related_webhook_inboxes"
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "created_at"], name="webhook_inbox_status_idx")]
+
+    # Choices
+    source = models.CharField(choices=WebhookSourceChoices.choices, max_length=COMMON_CHAR_FIELD_MAX_LENGTH)
+    status = models.CharField(
+        choices=WebhookInboxStatusChoices.choices,
+        max_length=COMMON_CHAR_FIELD_MAX_LENGTH,
+        default=WebhookInboxStatusChoices.pending,
+    )
+
+    # Fields
+    dedup_key = models.CharField(max_length=COMMON_CHAR_FIELD_MAX_LENGTH, unique=True)
+    payload = models.JSONField(default=dict)
+    error = models.TextField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+    attempts = models.PositiveIntegerField(default=0)
+    processed_at = models.DateTimeField(**COMMON_BLANK_AND_NULLABLE_FIELD_CONFIG)
+
+    @classmethod
+    def receive(cls, source, entries):
+        """
+        Stores the `(dedup_key, payload)` entries with a single insert. Already received entries are ignored,
+        so the retries of the webhook are never applied twice. Returns the count of the newly received entries.
+        """
+
+        from apps.webhook.tasks import WebhookInboxProcessTask
+
+        dedup_keys = [dedup_key for dedup_key, _ in entries]
+        existing_keys = set(
+            cls.objects.using(DEFAULT_DB_ALIAS).filter(dedup_key__in=dedup_keys).values_list("dedup_key", flat=True)
+        )
+        cls.objects.using(DEFAULT_DB_ALIAS).bulk_create(
+            [
+                cls(source=source, dedup_key=dedup_key, payload=payload)
+                for dedup_key, payload in entries
+                if dedup_key not in existing_keys
+            ],
+            ignore_conflicts=True,
+        )
+        received = len(set(dedup_keys) - existing_keys)
+        if received:
+            # dispatched once committed, the worker reads the stored entries
+            transaction.on_commit(lambda: WebhookInboxProcessTask().run_task(), using=DEFAULT_DB_ALIAS)
+        return received
+
+    @classmethod
+    def mark(cls, ids, status, error=None):
+        """Marks the status of the given entries with a single update."""
+
+        if not ids:
+            return 0
+        extra_kwargs = {"processed_at": timezone.now()} if status == WebhookInboxStatusChoices.processed else {}
+        return (
+            cls.objects.using(DEFAULT_DB_ALIAS)
+            .filter(id__in=ids)
+            .update(status=status, error=error, **extra_kwargs)
+        )
@@ -0,0 +1,332 @@
+from datetime import datetime, timedelta
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.common.tasks import BaseAppTask
+from apps.tenant_service.middlewares import tenant_context
+from apps.webhook.config import (
+    WEBHOOK_INBOX_BATCH_SIZE,
+    WEBHOOK_INBOX_MAX_ATTEMPTS,
+    WebhookInboxStatusChoices,
+    WebhookSourceChoices,
+)
+from config.celery_app import app as celery_app
+
+
+@celery_app.task
+def retry_webhook_inbox():
+    """Cron job to retry the failed & stuck webhook inbox entries."""
+
+    print("Webhook Inbox Retry Task - working", flush=True)
+    WebhookInboxProcessTask().run_task(retry_failed=True)
+    return True
+
+
+class WebhookInboxProcessTask(BaseAppTask):
+    """
+    Task to drain the `WebhookInbox`. The entries are claimed in batches with `SKIP LOCKED`, so the concurrent
+    workers never process the same entry. Every batch is grouped per tenant, the tenant database is switched
+    once per tenant & the results are applied in bulk with one progress update per assessment tracker.
+    """
+
+    stuck_after = timedelta(minutes=30)
+
+    def __init__(self, *args, **kwargs):
+        """Overridden to set up the per-run state."""
+
+        super().__init__(*args, **kwargs)
+        self.request_headers = None
+
+    def claim_entries(self, retry_failed=False):
+        """Claims the next batch of entries to be processed by this worker."""
+
+        from apps.webhook.models import WebhookInbox
+
+        claim_filter = Q(status=WebhookInboxStatusChoices.pending)
+        if retry_failed:
+            claim_filter |= Q(status=WebhookInboxStatusChoices.failed) | Q(
+                status=WebhookInboxStatusChoices.processing, modified_at__lt=timezone.now() - self.stuck_after
+            )
+        entries = WebhookInbox.objects.using(DEFAULT_DB_ALIAS)
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            ids = list(
+                entries.select_for_update(skip_locked=True)
+                .filter(claim_filter, attempts__lt=WEBHOOK_INBOX_MAX_ATTEMPTS)
+                .order_by("created_at")
+                .values_list("id", flat=True)[:WEBHOOK_INBOX_BATCH_SIZE]
+            )
+            entries.filter(id__in=ids).update(
+                status=WebhookInboxStatusChoices.processing, attempts=F("attempts") + 1, modified_at=timezone.now()
+            )
+        return list(entries.filter(id__in=ids))
+
+    def get_request_headers(self):
+        """Returns the IDP admin headers, the login is done once per run & only when needed."""
+
+        from apps.common.idp_service import idp_admin_auth_token
+
+        if self.request_headers is None:
+            self.request_headers = {"headers": {"Idp-Token": idp_admin_auth_token(raise_drf_error=False)}}
+        return self.request_headers
+
+    def process_by_tenant(self, entries, tenant_key, tenant_lookup, process_func):
+        """
+        Groups the entries per tenant, resolved from the tenant registry with a single query & processes the
+        entries of each tenant with the `process_func` on the tenant database.
+        """
+
+        from apps.tenant.models import Tenant
+        from apps.webhook.models import WebhookInbox
+
+        grouped_entries = {}
+        for entry in entries:
+            grouped_entries.setdefault(entry.payload.get(tenant_key), []).append(entry)
+        tenants = {
+            str(getattr(tenant, tenant_lookup)): tenant
+            for tenant in Tenant.objects.using(DEFAULT_DB_ALIAS)
+            .filter(**{f"{tenant_lookup}__in": [key for key in grouped_entries if key is not None]})
+            .select_related("related_db_router")
+        }
+        for key, tenant_entries in grouped_entries.items():
+            ids = [entry.id for entry in tenant_entries]
+            tenant = tenants.get(str(key))
+            if not tenant or not tenant.db_name:
+                WebhookInbox.mark(ids, WebhookInboxStatusChoices.failed, error="Tenant detail not found.")
+                continue
+            try:
+                tenant.related_db_router.add_db_connection()
+                with tenant_context(tenant.db_name):
+                    errors = process_func(tenant_entries) or {}
+            except Exception as e:
+                self.logger.info(f"Error while processing the webhook inbox for tenant {key}: {e}")
+                errors = {entry.id: str(e) for entry in tenant_entries}
+            WebhookInbox.mark([_id for _id in ids if _id not in errors], WebhookInboxStatusChoices.processed)
+            for error in set(errors.values()):
+                WebhookInbox.mark(
+                    [_id for _id, _error in errors.items() if _error == error],
+                    WebhookInboxStatusChoices.failed,
+                    error=error,
+                )
+
+    @staticmethod
+    def update_tracker_progress(schedules, result_field, learning_type, users, request_headers=None):
+        """Updates the progress of the trackers once per schedule, after all of its results are applied."""
+
+        from apps.my_learning.helpers import assessment_tracker_progress_update
+
+        for schedule in schedules:
+            if result_instance := getattr(schedule, result_field).order_by("attempt"):
+                user = users.get(schedule.user_email)
+                assessment_tracker_progress_update(
+                    tracker=schedule.tracker,
+                    result_instance=result_instance,
+                    learning_type=learning_type,
+                    request=request_headers,
+                    user_id=user.id if user else None,
+                )
+
+    def process_yaksha_entries(self, entries):
+        """Applies the yaksha attempts of a tenant. Returns the errors of the entries that could not be applied."""
+
+        from apps.access.models import User
+        from apps.learning.config import AssessmentTypeChoices
+        from apps.my_learning.config import AllBaseLearningTypeChoices
+        from apps.my_learning.models import CAYakshaResult, CAYakshaSchedule, LPAYakshaResult, LPAYakshaSchedule
+        from apps.virtutor.helpers import convert_utc_to_ist
+
+        yaksha_models = {
+            AllBaseLearningTypeChoices.course: (CAYakshaSchedule, CAYakshaResult, "related_ca_yaksha_results"),
+            AllBaseLearningTypeChoices.learning_path: (
+                LPAYakshaSchedule,
+                LPAYakshaResult,
+                "related_lpa_yaksha_results",
+            ),
+        }
+        errors, grouped_entries = {}, {}
+        for entry in entries:
+            payload = entry.payload
+            if payload["learning_type"] not in yaksha_models:
+                errors[entry.id] = "Learning type not supported."
+                continue
+            grouped_entries.setdefault((payload["learning_type"], payload["assessment_type"]), []).append(entry)
+
+        emails = {entry.payload["user_email"] for entry in entries}
+        users = {user.email: user for user in User.objects.filter(email__in=emails)}
+        for (learning_type, assessment_type), type_entries in grouped_entries.items():
+            schedule_model, result_model, result_field = yaksha_models[learning_type]
+            user_related_field = "tracker__user__email"
+            if learning_type == AllBaseLearningTypeChoices.course:
+                if assessment_type == AssessmentTypeChoices.final_assessment:
+                    user_related_field = "tracker__course_tracker__user__email"
+                elif assessment_type == AssessmentTypeChoices.dependent_assessment:
+                    user_related_field = "tracker__module_tracker__course_tracker__user__email"
+
+            # the latest schedule wins for the same schedule id & user, same as `.first()`
+            schedules = {}
+            for schedule in (
+                schedule_model.objects.filter(
+                    scheduled_id__in={entry.payload["schedule_id"] for entry in type_entries},
+                    **{f"{user_related_field}__in": {entry.payload["user_email"] for entry in type_entries}},
+                )
+                .annotate(user_email=F(user_related_field))
+                .select_related("tracker")
+            ):
+                schedules.setdefault((schedule.scheduled_id, schedule.user_email), schedule)
+            existing_results = {
+                (result.schedule_id, result.attempt): result
+                for result in result_model.objects.filter(schedule__in=schedules.values())
+            }
+
+            results_to_create, results_to_update, updated_schedules = {}, {}, {}
+            for entry in type_entries:
+                payload, attempt = entry.payload, entry.payload["attempt"]
+                if not (schedule := schedules.get((payload["schedule_id"], payload["user_email"]))):
+                    continue
+                result_config = {
+                    "duration": attempt["duration"] * 60,
+                    "total_questions": attempt["totalQuestions"],
+                    "answered": attempt["answeredQuestions"],
+                    "progress": attempt["scorePercentage"],
+                    "start_time": convert_utc_to_ist(attempt["actualStart"]),
+                    "end_time": convert_utc_to_ist(attempt["actualEnd"]),
+                    "is_pass": attempt["status"] == "Passed",
+                }
+                key = (schedule.id, attempt["attemptNumber"])
+                if result := existing_results.get(key):
+                    for field, value in result_config.items():
+                        setattr(result, field, value)
+                    results_to_update[key] = result
+                else:
+                    results_to_create[key] = result_model(
+                        schedule=schedule, attempt=attempt["attemptNumber"], **result_config
+                    )
+                updated_schedules[schedule.id] = schedule
+
+            with transaction.atomic(using=schedule_model.objects.db):
+                result_model.objects.bulk_create(results_to_create.values())
+                result_model.objects.bulk_update(
+                    results_to_update.values(),
+                    fields=[
+                        "duration",
+                        "total_questions",
+                        "answered",
+                        "progress",
+                        "start_time",
+                        "end_time",
+                        "is_pass",
+                    ],
+                )
+            if updated_schedules:
+                self.update_tracker_progress(
+                    updated_schedules.values(), result_field, learning_type, users, self.get_request_headers()
+                )
+        return errors
+
+    def get_wecp_assessment_details(self, assessment_id, wecp_key):
+        """Returns the total score & questions of the wecp assessment."""
+
+        from django.conf import settings
+
+        from apps.common.communicator import get_request
+
+        success, assessment_data = get_request(
+            service="WECP",
+            url_path=f"{settings.WECP_CONFIG['get_assessment_details']}{assessment_id}",
+            auth_token=wecp_key,
+        )
+        if success:
+            return assessment_data["maxScore"] or 0, assessment_data["questionCount"]
+        return 0, 0
+
+    def process_wecp_entries(self, entries):
+        """Applies the wecp results of a tenant. Returns the errors of the entries that could not be applied."""
+
+        from apps.access.models import User
+        from apps.leaderboard.config import BadgeLearningTypeChoices
+        from apps.my_learning.models import CAYakshaResult, CAYakshaSchedule, CourseAssessmentTracker
+
+        errors = {}
+        emails = {entry.payload["user_email"] for entry in entries}
+        users = {user.email: user for user in User.objects.filter(email__in=emails)}
+        trackers = {}
+        for tracker in CourseAssessmentTracker.objects.filter(
+            assessment_uuid__in={entry.payload["assessment_id"] for entry in entries},
+            course_tracker__user__in=users.values(),
+        ).annotate(user_email=F("course_tracker__user__email")):
+            trackers.setdefault((str(tracker.assessment_uuid), tracker.user_email), tracker)
+        schedules = {}
+        for schedule in CAYakshaSchedule.objects.filter(tracker__in=trackers.values()).select_related("tracker"):
+            schedules.setdefault(schedule.tracker_id, schedule)
+        existing_results = {}
+        for result in CAYakshaResult.objects.filter(schedule__in=schedules.values()):
+            existing_results.setdefault(result.schedule_id, []).append(result)
+
+        assessment_details, updated_schedules = {}, {}
+        for entry in entries:
+            payload = entry.payload
+            if payload["user_email"] not in users:
+                errors[entry.id] = "User not found."
+                continue
+            tracker = trackers.get((str(payload["assessment_id"]), payload["user_email"]))
+            if not tracker or not (schedule := schedules.get(tracker.id)):
+                errors[entry.id] = "Tracker not found."
+                continue
+            if payload["assessment_id"] not in assessment_details:
+                assessment_details[payload["assessment_id"]] = self.get_wecp_assessment_details(
+                    payload["assessment_id"], payload["wecp_key"]
+                )
+            total_score, total_questions = assessment_details[payload["assessment_id"]]
+            progress = round((int(payload["score"]) / int(total_score)) * 100) if total_score != 0 else 0
+            start_time, end_time, duration = payload["start_time"], payload["end_time"], 0
+            if start_time and end_time:
+                start_time = datetime.fromisoformat(start_time.rstrip("Z"))
+                end_time = datetime.fromisoformat(end_time.rstrip("Z"))
+                duration = (end_time - start_time).total_seconds()
+            results = existing_results.setdefault(schedule.id, [])
+            result_config = {
+                "attempt": len(results) + 1,
+                "progress": 100 if progress > 100 else progress,
+                "duration": duration,
+                "total_questions": total_questions,
+                "answered": 0,
+                "start_time": start_time,
+                "end_time": end_time,
+                "is_pass": progress >= 60,
+            }
+            # a wecp schedule holds a single result, updated on every attempt
+            if results:
+                CAYakshaResult.objects.filter(id=results[0].id).update(**result_config)
+            else:
+                results.append(CAYakshaResult.objects.create(schedule=schedule, **result_config))
+            schedule.user_email = payload["user_email"]
+            updated_schedules[schedule.id] = schedule
+        self.update_tracker_progress(
+            updated_schedules.values(), "related_ca_yaksha_results", BadgeLearningTypeChoices.course, users
+        )
+        return errors
+
+    def run(self, retry_failed=False, **kwargs):
+        """Run handler."""
+
+        self.switch_db()
+        processed = 0
+        while entries := self.claim_entries(retry_failed=retry_failed):
+            # the failed entries are retried once per run, the rest of the run drains the pending entries
+            retry_failed = False
+            self.logger.info(f"Executing WebhookInboxProcessTask for {len(entries)} entries.")
+            self.process_by_tenant(
+                [entry for entry in entries if entry.source == WebhookSourceChoices.yaksha],
+                tenant_key="tenant_id",
+                tenant_lookup="idp_id",
+                process_func=self.process_yaksha_entries,
+            )
+            self.process_by_tenant(
+                [entry for entry in entries if entry.source == WebhookSourceChoices.wecp],
+                tenant_key="tenant_id",
+                tenant_lookup="id",
+                process_func=self.process_wecp_entries,
+            )
+            processed += len(entries)
+        return processed
@@ -29,6 +29,21 @@ django_application = get_asgi_application()
 
 # Import websocket application here, so apps from django_application are loaded first
 from config.websocket import websocket_application  # noqa isort:skip
+from apps.common.async_communicator import close_async_http_clients, open_async_http_clients  # noqa isort:skip
+
+
+async def lifespan_application(scope, receive, send):
+    """Opens the pooled http clients of the async gateway views on startup & closes them on shutdown."""
+
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await open_async_http_clients()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await close_async_http_clients()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
 
 
 async def application(scope, receive, send):
@@ -36,5 +51,7 @@ async def application(scope, receive, send):
         await django_application(scope, receive, send)
     elif scope["type"] == "websocket":
         await websocket_application(scope, receive, send)
+    elif scope["type"] == "lifespan":
+        await lifespan_application(scope, receive, send)
     else:
         raise NotImplementedError(f"Unknown scope type {scope['type']}")
@@ -43,6 +43,8 @@ for _import_string in [
     "apps.access.tasks.UserBulkUploadTask",
     "apps.access.tasks.AutoAssignLearningTask",
     "apps.my_learning.tasks.EnrollmentBulkUploadTask",
+    "apps.my_learning.tasks.EnrollmentSideEffectTask",
+    "apps.my_learning.tasks.UserFeedFanOutTask",
     "apps.my_learning.tasks.BulkUnenrollmentTask",
     "apps.my_learning.tasks.ReportGenerationTask",
     "apps.my_learning.tasks.FileSubmissionReportGenerationTask",
@@ -53,7 +55,9 @@ for _import_string in [
     "apps.techademy_one.v1.tasks.T1BulkUserOnboardTask",
     "apps.leaderboard.tasks.badges.CommonBadgeTask",
     "apps.learning.tasks.LearningCloneTask",
+    "apps.learning.tasks.LearningRetiredTask",
     "apps.tenant.tasks.MasterReportTableTask",
+    "apps.webhook.tasks.WebhookInboxProcessTask",
 ]:
     app.register_task(import_string(_import_string)())
 
@@ -86,4 +90,8 @@ app.conf.beat_schedule = {
         if is_beat_debug()
         else crontab(minute="35", hour="5"),  # every day 12.05 am,
     },
+    "webhook_inbox_retry": {
+        "task": "apps.webhook.tasks.retry_webhook_inbox",
+        "schedule": crontab(minute="*/10"),  # every 10 minutes
+    },
 }
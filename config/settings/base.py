@@ -85,7 +85,14 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + CUSTOM_APPS
 
 # Multi-Tenant Config | Run Management Commands Without Breaking
 # ------------------------------------------------------------------------------
-MULTI_TENANT = {"APP_LOAD_ALL_DB_CONNECTION": env.bool("LOAD_ALL_DB_CONNECTION", default=True)}
+MULTI_TENANT = {
+    # open tenant connections per worker thread, the least recently used idle ones are closed beyond it
+    "APP_MAX_TENANT_CONNECTIONS": env.int("MAX_TENANT_CONNECTIONS", default=8),
+    # connected through pgbouncer in transaction pooling mode | no server side cursors across transactions
+    "APP_TRANSACTION_POOLING": env.bool("DB_TRANSACTION_POOLING", default=False),
+    # pre-migrated & seeded database, new tenant databases are copied from it | empty to disable
+    "APP_TENANT_TEMPLATE_DB_NAME": env.str("TENANT_TEMPLATE_DB_NAME", default="tenant_template"),
+}
 APP_DEFAULT_TENANT_NAME = env.str("DEFAULT_TENANT_NAME", "techademy")
 APP_DEFAULT_TENANT_DOMAIN = env.str("DEFAULT_TENANT_DOMAIN", "techademy")
 
@@ -170,6 +177,26 @@ DEVONE_CONFIG = {
     "recommendation_url": env.str("RECOMMENDATION_URL", default=""),
 }
 
+# Fan Out | parallel outbound calls of a request or task, `apps.common.fan_out`
+# ------------------------------------------------------------------------------
+FAN_OUT = {
+    # calls in-flight at a time per fan out
+    "concurrency": env.int("FAN_OUT_CONCURRENCY", default=8),
+    # timeout in seconds of the outbound http requests of a fan out call
+    "timeout": env.float("FAN_OUT_TIMEOUT", default=30),
+    # kept alive connections per host of the pooled http session, shared by the threads of a process
+    "pool_size": env.int("HTTP_POOL_SIZE", default=32),
+}
+
+# Async Gateway | pooled `httpx.AsyncClient` of the async proxy views, served through the `config.asgi`
+# ------------------------------------------------------------------------------
+ASYNC_GATEWAY = {
+    # in-flight outbound requests per worker, the waiting ones are queued
+    "max_connections": env.int("ASYNC_GATEWAY_MAX_CONNECTIONS", default=1000),
+    "max_keepalive_connections": env.int("ASYNC_GATEWAY_MAX_KEEPALIVE_CONNECTIONS", default=100),
+    "timeout": env.float("ASYNC_GATEWAY_TIMEOUT", default=60),
+}
+
 # DATABASES & ROUTER Settings for multi-tenant applications
 # ------------------------------------------------------------------------------
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -183,10 +210,21 @@ DATABASES = {
         "HOST": env.str("POSTGRES_HOST", default=""),
         "PORT": env.str("POSTGRES_PORT", default=""),
         "ATOMIC_REQUESTS": True,
+        # persistent connections, bounded per thread for the tenants | 0 closes them at the end of the request
+        "CONN_MAX_AGE": env.int("CONN_MAX_AGE", default=0),
+        "CONN_HEALTH_CHECKS": True,
+        "DISABLE_SERVER_SIDE_CURSORS": MULTI_TENANT["APP_TRANSACTION_POOLING"],
     },
 }
 # custom router to handle dynamic databases
 DATABASE_ROUTERS = ["apps.tenant_service.db_routers.AppDBRouter"]
+# tenant read replicas, used by the reports & the list endpoints
+REPLICA_CONFIG = {
+    # the reads fall back to the primary when the replica lags behind by more than the given seconds
+    "max_lag_seconds": env.float("REPLICA_MAX_LAG_SECONDS", default=5),
+    # seconds the lag check of a replica is cached for, per process
+    "lag_check_interval": env.float("REPLICA_LAG_CHECK_INTERVAL", default=10),
+}
 
 # ADMIN
 # ------------------------------------------------------------------------------
@@ -207,6 +245,7 @@ APP_SUPER_ADMIN = {
 # ------------------------------------------------------------------------------
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "apps.tenant_service.middlewares.TenantContextMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -214,8 +253,23 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django_user_agents.middleware.UserAgentMiddleware",
+    "apps.tenant_service.middlewares.ReplicaRoutingMiddleware",
 ]
 
+# Query Budget | Opt-in per request query count & N+1 detection
+# ------------------------------------------------------------------------------
+QUERY_BUDGET = {
+    "enabled": env.bool("QUERY_BUDGET_ENABLED", default=False),
+    # fraction of the requests inspected when the violations are only logged
+    "sample_rate": env.float("QUERY_BUDGET_SAMPLE_RATE", default=0.01),
+    # executions of the same normalized sql in a request flagged as a N+1
+    "n_plus_one_threshold": env.int("QUERY_BUDGET_N_PLUS_ONE_THRESHOLD", default=10),
+    # inspects every request & raises on the violations, used by the tests
+    "raise_on_violation": env.bool("QUERY_BUDGET_RAISE_ON_VIOLATION", default=False),
+}
+if QUERY_BUDGET["enabled"]:
+    MIDDLEWARE.append("apps.common.middlewares.QueryBudgetMiddleware")
+
 # URLS
 # ------------------------------------------------------------------------------
 ROOT_URLCONF = "config.urls"